@@ -0,0 +1,178 @@
+"""Benchmark: Sign In click to interactive workspace.
+
+Drives the real HomePage in an offscreen QApplication.  It fills in the
+credentials, clicks "Sign In" and times each stage until the workspace
+window is current and the event loop is idle again:
+
+    verified     credentials fetched and checked
+    preloaded    splash preloader finished
+    workspace    workspace window built and shown
+    interactive  first idle event-loop pass after that
+
+The old pipeline spent at least LEGACY_FIXED_DELAY_MS in fixed timers
+(800 ms before the query, 1000 ms after success, a 500 ms fade and
+2000 ms of splash) on top of the work itself.
+
+Runs against the SQLite stand-in by default, seeded with ``--patients``
+rows.  ``--latency-ms`` adds a simulated network delay to every statement.
+``--oracle`` uses the configured pool and needs ``--worker-id`` and
+``--password`` of an existing employee.  ``--cold`` skips the background
+module warm-up that sidebar.py starts once the login page is shown.
+
+    python benchmarks/login_pipeline.py --latency-ms 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtCore, QtWidgets  # noqa: E402
+
+from pages import database, startup  # noqa: E402
+from pages.home import HomePage, MainWindow  # noqa: E402
+from pages.query_executor import executor  # noqa: E402
+from sqlite_schema import create_schema, seed_patients  # noqa: E402
+
+LEGACY_FIXED_DELAY_MS = 800 + 1000 + 500 + 2000
+STAGES = ("verified", "preloaded", "workspace", "interactive")
+TIMEOUT_MS = 60000
+
+
+class LatencyCursor:
+    """Cursor proxy sleeping once per statement sent to the database."""
+    def __init__(self, cursor, latency):
+        self._cursor = cursor
+        self.latency = latency
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        if name in ("_cursor", "latency"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return self._cursor.executemany(*args, **kwargs)
+
+
+class LatencyConnection:
+    def __init__(self, connection, latency):
+        self._connection = connection
+        self.latency = latency
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self):
+        return LatencyCursor(self._connection.cursor(), self.latency)
+
+
+def add_latency(latency):
+    acquire = database.acquire
+    database.acquire = lambda: LatencyConnection(acquire(), latency)
+
+
+def sign_in(app, stacked, home, worker_id, password):
+    """Click Sign In and return {stage: ms since the click}."""
+    loop = QtCore.QEventLoop()
+    marks = {}
+
+    def current_changed(_):
+        if isinstance(stacked.currentWidget(), MainWindow) and "interactive" not in marks:
+            QtCore.QTimer.singleShot(0, interactive)
+
+    def interactive():
+        marks["interactive"] = time.perf_counter()
+        loop.quit()
+
+    stacked.currentChanged.connect(current_changed)
+    QtCore.QTimer.singleShot(TIMEOUT_MS, loop.quit)
+    home.username_input.setText(worker_id)
+    home.password_input.setText(password)
+    home.login_button.click()
+    loop.exec_()
+    stacked.currentChanged.disconnect(current_changed)
+    if "interactive" not in marks:
+        sys.exit(f"Sign in did not reach the workspace within {TIMEOUT_MS} ms: "
+                 f"{home.message_label.text()}")
+
+    timings = dict(home.login_timings, **marks)
+    click = timings["click"]
+    return {stage: (timings[stage] - click) * 1000 for stage in STAGES}
+
+
+def sign_out(stacked):
+    workspace = stacked.currentWidget()
+    workspace.logout()
+    QtWidgets.QApplication.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--oracle", action="store_true", help="use the configured Oracle pool")
+    parser.add_argument("--worker-id", default="bench")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--patients", type=int, default=2000, help="rows seeded into the stand-in")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated delay per statement")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cold", action="store_true", help="skip the background module warm-up")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # pages load resources/ relative to the working directory
+    app = QtWidgets.QApplication(sys.argv)
+
+    if not args.oracle:
+        database.use_sqlite()
+        with database.connection() as conn:
+            create_schema(conn)
+            seed_patients(conn, args.patients)
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO employees VALUES (:id, :pw, 'Bench Worker', 'Doctor', '0600000000')",
+                           {"id": args.worker_id, "pw": args.password})
+            cursor.close()
+            conn.commit()
+    if args.latency_ms:
+        add_latency(args.latency_ms / 1000)
+
+    stacked = QtWidgets.QStackedWidget()
+    stacked.resize(1200, 800)
+    home = HomePage(main_window=stacked)
+    stacked.addWidget(home)
+    stacked.show()
+    if not args.cold:
+        QtCore.QTimer.singleShot(0, startup.warm_up)
+    app.processEvents()
+
+    runs = []
+    for _ in range(args.repeat):
+        runs.append(sign_in(app, stacked, home, args.worker_id, args.password))
+        sign_out(stacked)
+
+    print(f"backend={database.backend()} latency={args.latency_ms}ms repeat={args.repeat} "
+          f"warm-up={'off' if args.cold else 'on'}")
+    print(f"{'stage':>12} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for stage in STAGES:
+        values = [run[stage] for run in runs]
+        print(f"{stage:>12} {statistics.median(values):>10.1f} {min(values):>8.1f} {max(values):>8.1f}")
+    print(f"fixed delays in the old pipeline alone: {LEGACY_FIXED_DELAY_MS} ms")
+    executor().shutdown()
+    database.close_pool()
+
+
+if __name__ == "__main__":
+    main()
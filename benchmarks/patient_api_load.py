@@ -0,0 +1,136 @@
+"""Load test: concurrent admissions against the patient write service.
+
+Starts pages/patient_api.py in-process on a SQLite stand-in file (or
+``--oracle`` for the configured pool) and fires ``--requests`` admissions
+from ``--concurrency`` client threads at once, each on its own
+keep-alive connection.  Reports throughput and p50/p99 latency, and
+checks that every admission was stored with all its symptoms.
+
+``--url`` targets an already running endpoint instead, e.g. the PHP
+script, to compare both under the same load (the row check is skipped).
+
+    python benchmarks/patient_api_load.py --requests 1000 --concurrency 200
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pages import database, patient_api  # noqa: E402
+from sqlite_schema import DISEASES, SEVERITIES, create_schema  # noqa: E402
+
+SYMPTOMS_PER_ADMISSION = 5
+
+
+def admission(n):
+    return {
+        "request_id": str(uuid.uuid4()),
+        "name": f"Load Test {n:05d}",
+        "disease_name": DISEASES[n % len(DISEASES)],
+        "birth_date": "1980-01-01",
+        "admission_date": "2024-06-01",
+        "status": "STABLE",
+        "notes": "",
+        "symptoms": [[f"Symptom {i}", SEVERITIES[i % len(SEVERITIES)]] for i in range(SYMPTOMS_PER_ADMISSION)],
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_load(url, total, concurrency):
+    """Send ``total`` admissions over ``concurrency`` threads; returns (latencies ms, failures, seconds)."""
+    target = urlsplit(url)
+    local = threading.local()
+    start_line = threading.Barrier(concurrency)
+
+    def post(n):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+            start_line.wait()  # every client connected before the first request
+        body = json.dumps(admission(n))
+        started = time.perf_counter()
+        try:
+            local.connection.request("POST", target.path, body, {"Content-Type": "application/json"})
+            response = local.connection.getresponse()
+            ok = response.status == 200 and json.loads(response.read()).get("success")
+        except (OSError, http.client.HTTPException, ValueError):
+            local.connection.close()
+            ok = False
+        return (time.perf_counter() - started) * 1000, ok
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(post, range(total)))
+    elapsed = time.perf_counter() - began
+    return [ms for ms, _ in results], sum(1 for _, ok in results if not ok), elapsed
+
+
+def stored_counts():
+    with database.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT COUNT(*) FROM patient WHERE name LIKE 'Load Test %'")
+            patients = cursor.fetchone()[0]
+            cursor.execute("""SELECT COUNT(*) FROM symptoms WHERE patient_id IN
+                (SELECT patient_id FROM patient WHERE name LIKE 'Load Test %')""")
+            symptoms = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+    return patients, symptoms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--oracle", action="store_true", help="use the configured Oracle pool")
+    parser.add_argument("--url", help="load an already running endpoint instead")
+    args = parser.parse_args()
+    args.concurrency = min(args.concurrency, args.requests)
+
+    server = None
+    if args.url:
+        url = args.url
+    else:
+        if not args.oracle:
+            # A file, not shared memory: concurrent writers wait on its lock instead of failing
+            path = os.path.join(tempfile.mkdtemp(), "patient_api_load.sqlite3")
+            database.use_sqlite(path)
+            with database.connection() as conn:
+                create_schema(conn)
+        database.get_pool()
+        server = patient_api.create_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}{patient_api.PATHS[0]}"
+
+    latencies, failures, elapsed = run_load(url, args.requests, args.concurrency)
+
+    print(f"target={url} requests={args.requests} concurrency={args.concurrency}")
+    print(f"throughput {args.requests / elapsed:.0f} admissions/s, {failures} failed")
+    print(f"latency ms  p50 {statistics.median(latencies):.1f}  p99 {percentile(latencies, 0.99):.1f}  "
+          f"max {max(latencies):.1f}")
+    if server is not None:
+        server.shutdown()
+        patients, symptoms = stored_counts()
+        expected = args.requests - failures
+        print(f"stored {patients} patients, {symptoms} symptoms "
+              f"(expected {expected}, {expected * SYMPTOMS_PER_ADMISSION})")
+        database.close_pool()
+
+
+if __name__ == "__main__":
+    main()
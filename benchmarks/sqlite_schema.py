@@ -0,0 +1,61 @@
+"""Tables and sample rows for running the benchmarks on the SQLite stand-in.
+
+Column names follow the Oracle schema the pages query; types are loose
+because SQLite does not enforce them.
+"""
+import random
+from datetime import date, timedelta
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS employees (
+        worker_id TEXT PRIMARY KEY, password TEXT, full_name TEXT, role TEXT, phone_number TEXT)""",
+    """CREATE TABLE IF NOT EXISTS patient (
+        patient_id INTEGER PRIMARY KEY, name TEXT, birth_date TEXT, status TEXT,
+        admission_date TEXT, notes TEXT, department TEXT, last_updated TEXT)""",
+    """CREATE TABLE IF NOT EXISTS disease (
+        patient_id INTEGER, disease_name TEXT, diagnosis_date TEXT)""",
+    """CREATE TABLE IF NOT EXISTS symptoms (
+        patient_id INTEGER, symptom_name TEXT, severity TEXT)""",
+)
+
+DEPARTMENTS = ("Cardiology", "Neurology", "Pediatrics", "Oncology", "Emergency")
+DISEASES = ("Influenza", "Diabetes", "Hypertension", "Asthma", "Migraine", "Pneumonia")
+SEVERITIES = ("Mild", "Moderate", "Severe", "Critical")
+
+
+def create_schema(connection):
+    cursor = connection.cursor()
+    try:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+    connection.commit()
+
+
+def seed_patients(connection, count, seed=1):
+    """Insert ``count`` patients with one disease and two symptoms each."""
+    rng = random.Random(seed)
+    today = date.today()
+    patients, diseases, symptoms = [], [], []
+    for pid in range(1, count + 1):
+        birth = today - timedelta(days=rng.randint(365, 90 * 365))
+        admitted = today - timedelta(days=rng.randint(0, 360))
+        patients.append({
+            "id": pid, "name": f"Patient {pid:05d}", "birth": birth.isoformat(),
+            "status": rng.choice(("Admitted", "Discharged", "Critical")),
+            "admitted": admitted.isoformat(), "dept": rng.choice(DEPARTMENTS),
+        })
+        diseases.append({"id": pid, "disease": rng.choice(DISEASES), "day": admitted.isoformat()})
+        for n in range(2):
+            symptoms.append({"id": pid, "symptom": f"Symptom {n}", "severity": rng.choice(SEVERITIES)})
+    cursor = connection.cursor()
+    try:
+        cursor.executemany("""INSERT INTO patient
+            (patient_id, name, birth_date, status, admission_date, notes, department)
+            VALUES (:id, :name, :birth, :status, :admitted, '', :dept)""", patients)
+        cursor.executemany("INSERT INTO disease VALUES (:id, :disease, :day)", diseases)
+        cursor.executemany("INSERT INTO symptoms VALUES (:id, :symptom, :severity)", symptoms)
+    finally:
+        cursor.close()
+    connection.commit()
@@ -0,0 +1,85 @@
+"""Benchmark: import cost of the startup path (``import sidebar``).
+
+Runs ``python -X importtime -c "import sidebar"`` in a fresh interpreter a
+few times, reports the median cumulative import time and the slowest
+modules, and exits non-zero when
+
+* the median exceeds the budget (``--budget-ms``), or
+* one of the deferred analytics modules (numpy, pyqtgraph, QtChart,
+  matplotlib, seaborn, pandas or a workspace page) was imported at startup.
+
+    python benchmarks/startup_importtime.py --budget-ms 400
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_MS = 400  # regression budget for the median cumulative import time
+TARGET = "sidebar"
+
+# Must only be loaded on demand or by pages.startup.warm_up
+DEFERRED = (
+    "numpy", "pandas", "pyqtgraph", "PyQt5.QtChart", "matplotlib", "seaborn",
+    "pages.patient", "pages.dashboard", "pages.workerTiming",
+)
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {TARGET} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeat)]
+    totals = [run[TARGET][1] / 1000 for run in runs]
+    median_ms = statistics.median(totals)
+    last = runs[-1]
+
+    print(f"import {TARGET}: median {median_ms:.1f} ms over {args.repeat} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}), budget {args.budget_ms:.0f} ms")
+    print(f"{'self ms':>8} {'cumul ms':>9}  module")
+    slowest = sorted(last.items(), key=lambda item: -item[1][0])[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}  {name}")
+
+    failures = []
+    eager = [name for name in DEFERRED if name in last]
+    if eager:
+        failures.append(f"deferred modules imported at startup: {', '.join(eager)}")
+    if median_ms > args.budget_ms:
+        failures.append(f"median {median_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
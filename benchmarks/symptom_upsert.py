@@ -0,0 +1,131 @@
+"""Benchmark: per-symptom check-then-write vs. one array-bound upsert.
+
+Compares the old AdjustPatientDialog.save_changes symptom loop (SELECT
+COUNT(*) then UPDATE or INSERT for every line) with
+patient_store.upsert_symptoms for 1, 10 and 100 symptoms.
+
+Runs against the SQLite stand-in by default.  ``--latency-ms`` adds a
+simulated network delay per round trip so the stand-in behaves like a
+remote database; ``--oracle`` uses the configured Oracle pool instead
+(the rows are written for ``--patient-id`` and rolled back).
+
+    python benchmarks/symptom_upsert.py --latency-ms 1
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages import database, patient_store  # noqa: E402
+
+SIZES = (1, 10, 100)
+
+
+class RoundTripCursor:
+    """Cursor proxy counting (and optionally delaying) each round trip."""
+    def __init__(self, cursor, latency):
+        self._cursor = cursor
+        self.latency = latency
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _trip(self):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def execute(self, *args, **kwargs):
+        self._trip()
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._trip()
+        return self._cursor.executemany(*args, **kwargs)
+
+
+def legacy_upsert(cursor, patient_id, symptoms):
+    """The previous save_changes loop: 2 round trips per symptom."""
+    for symptom_name, severity in symptoms.items():
+        cursor.execute("""
+            SELECT COUNT(*) FROM symptoms
+            WHERE patient_id = :patient_id AND symptom_name = :symptom_name
+        """, patient_id=patient_id, symptom_name=symptom_name)
+        if cursor.fetchone()[0] > 0:
+            cursor.execute("""
+                UPDATE symptoms
+                SET severity = :severity
+                WHERE patient_id = :patient_id AND symptom_name = :symptom_name
+            """, severity=severity, patient_id=patient_id, symptom_name=symptom_name)
+        else:
+            cursor.execute("""
+                INSERT INTO symptoms (patient_id, symptom_name, severity)
+                VALUES (:patient_id, :symptom_name, :severity)
+            """, patient_id=patient_id, symptom_name=symptom_name, severity=severity)
+
+
+def batched_upsert(cursor, patient_id, symptoms):
+    patient_store.upsert_symptoms(cursor, patient_id, symptoms)
+
+
+def make_symptoms(count):
+    return {f"Symptom {i:03d}": "High" for i in range(count)}
+
+
+def seed(connection, patient_id, count):
+    """Store every other symptom so both update and insert paths are exercised."""
+    cursor = connection.cursor()
+    cursor.execute("DELETE FROM symptoms WHERE patient_id = :id", {'id': patient_id})
+    rows = [{'id': patient_id, 'name': f"Symptom {i:03d}"} for i in range(0, count, 2)]
+    if rows:
+        cursor.executemany(
+            "INSERT INTO symptoms (patient_id, symptom_name, severity) VALUES (:id, :name, 'Low')", rows)
+    cursor.close()
+
+
+def run(path, connection, patient_id, count, latency, repeat):
+    timings, trips = [], 0
+    for _ in range(repeat):
+        seed(connection, patient_id, count)
+        cursor = RoundTripCursor(connection.cursor(), latency)
+        start = time.perf_counter()
+        path(cursor, patient_id, make_symptoms(count))
+        timings.append(time.perf_counter() - start)
+        trips = cursor.round_trips
+        cursor.close()
+        connection.rollback()
+    return statistics.median(timings) * 1000, trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--oracle", action="store_true", help="use the configured Oracle pool")
+    parser.add_argument("--patient-id", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated delay per round trip")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not args.oracle:
+        database.use_sqlite()
+        with database.connection() as conn:
+            conn.cursor().execute("CREATE TABLE symptoms (patient_id INTEGER, symptom_name TEXT, severity TEXT)")
+            conn.commit()
+
+    latency = args.latency_ms / 1000
+    print(f"backend={database.backend()} latency={args.latency_ms}ms repeat={args.repeat}")
+    print(f"{'symptoms':>8} {'legacy ms':>10} {'trips':>6} {'upsert ms':>10} {'trips':>6} {'speedup':>8}")
+    with database.connection() as conn:
+        for count in SIZES:
+            legacy_ms, legacy_trips = run(legacy_upsert, conn, args.patient_id, count, latency, args.repeat)
+            batch_ms, batch_trips = run(batched_upsert, conn, args.patient_id, count, latency, args.repeat)
+            speedup = legacy_ms / batch_ms if batch_ms else float("inf")
+            print(f"{count:>8} {legacy_ms:>10.2f} {legacy_trips:>6} {batch_ms:>10.2f} {batch_trips:>6} {speedup:>7.1f}x")
+    database.close_pool()
+
+
+if __name__ == "__main__":
+    main()
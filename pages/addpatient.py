@@ -2,7 +2,11 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 import sys
 import datetime
 import requests
-import json
+
+from pages import patient_store
+from pages.admission_client import ApiRejected, admission_client
+from pages.query_executor import describe_error
+
 
 class AddPatientDialog(QtWidgets.QDialog):
     """Dialog for adding a new patient to the database."""
@@ -10,6 +14,8 @@ class AddPatientDialog(QtWidgets.QDialog):
         super().__init__(parent)
         self.setWindowTitle("Add New Patient")
         self.setMinimumSize(600, 650)  # Increased height for additional fields
+        self.sending = False
+        self.outcome = None  # "sent" or "queued" once accepted
         self.setup_ui()
         self.connect_signals()
         
@@ -112,7 +118,7 @@ class AddPatientDialog(QtWidgets.QDialog):
         status_label = QtWidgets.QLabel("Status:")
         status_label.setStyleSheet("font-weight: bold;")
         self.status_input = QtWidgets.QComboBox()
-        self.status_input.addItems(['STABLE', 'CRITICAL', 'URGENT', 'GOOD', 'RECOVERING'])
+        self.status_input.addItems(patient_store.STATUSES)
         form_layout.addRow(status_label, self.status_input)
         
         # Notes field
@@ -163,7 +169,7 @@ class AddPatientDialog(QtWidgets.QDialog):
         self.symptom_input.setPlaceholderText("Enter a symptom")
         
         self.severity_input = QtWidgets.QComboBox()
-        self.severity_input.addItems(['Mild', 'Moderate', 'Severe', 'Critical'])
+        self.severity_input.addItems(patient_store.SEVERITIES)
         
         self.add_symptom_btn = QtWidgets.QPushButton("Add")
         self.add_symptom_btn.setStyleSheet("""
@@ -283,85 +289,72 @@ class AddPatientDialog(QtWidgets.QDialog):
             symptom_data = item.data(QtCore.Qt.UserRole)
             symptoms.append(symptom_data)
         
-        try:
-            # API endpoint URL - adjust to your server location
-            api_url = "http://localhost/patient_api/add_patient.php"
-            
-            # Prepare payload
-            payload = {
-                'name': patient_name,
-                'disease_name': disease_name,
-                'birth_date': birth_date,
-                'admission_date': admission_date,
-                'status': status,
-                'notes': notes,
-                'symptoms': symptoms
-            }
-            
-            # Print debug info
-            print(f"Sending request to: {api_url}")
-            print(f"Payload: {json.dumps(payload, indent=2)}")
-            
-            # Send POST request to PHP API
-            response = requests.post(api_url, json=payload)
-            
-            # Print response for debugging
-            print(f"Response status: {response.status_code}")
-            print(f"Response content: {response.text}")
-            
-            # Check response
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('success'):
-                    # Show success message
-                    QtWidgets.QMessageBox.information(
-                        self, "Success", 
-                        f"Patient '{patient_name}' has been added successfully!"
-                    )
-                    # Close the dialog with Accept result
-                    self.accept()
-                else:
-                    # Show error message from API
-                    QtWidgets.QMessageBox.critical(
-                        self, "API Error", 
-                        f"Error: {result.get('message', 'Unknown error')}"
-                    )
-            else:
-                # Show error message for bad response
-                QtWidgets.QMessageBox.critical(
-                    self, "API Error", 
-                    f"Error connecting to API: Status code {response.status_code}\n{response.text}"
-                )
-                
-        except Exception as e:
-            print(f"Error saving patient: {e}")
-            QtWidgets.QMessageBox.critical(
-                self, "Error", 
-                f"Error sending data to server: {str(e)}"
-            )
-    
+        payload = {
+            'name': patient_name,
+            'disease_name': disease_name,
+            'birth_date': birth_date,
+            'admission_date': admission_date,
+            'status': status,
+            'notes': notes,
+            'symptoms': symptoms
+        }
+
+        # Sent in the background; queued locally if the API is down
+        self.set_sending(True)
+        admission_client().submit(payload, self.patient_saved, self.save_failed)
+
+    def set_sending(self, sending):
+        self.sending = sending
+        self.save_button.setEnabled(not sending)
+        self.cancel_button.setEnabled(not sending)
+        self.save_button.setText("Saving..." if sending else "Save Patient")
+
+    def patient_saved(self, outcome):
+        """``outcome`` is "sent" or "queued"; show_add_patient reports it."""
+        self.set_sending(False)
+        self.outcome = outcome
+        self.accept()
+
+    def save_failed(self, error):
+        self.set_sending(False)
+        print(f"Error saving patient: {error}")
+        if isinstance(error, ApiRejected):
+            message = f"Error: {error}"
+        elif isinstance(error, requests.Timeout):
+            message = ("The server did not answer in time. The patient may have been saved; "
+                       "check the patient list before trying again.")
+        else:
+            message = f"Error sending data to server: {describe_error(error)}"
+        QtWidgets.QMessageBox.critical(self, "API Error", message)
+
+    def reject(self):
+        # Keep the dialog open until the submission has been answered
+        if not self.sending:
+            super().reject()
+
     def validate_inputs(self):
-        """Validate the form inputs."""
-        # Check if patient name is provided
-        if not self.name_input.text().strip():
-            QtWidgets.QMessageBox.warning(
-                self, "Input Error", 
-                "Please enter the patient's name."
-            )
-            self.name_input.setFocus()
-            return False
-        
-        # Check if disease is provided
-        if not self.disease_input.text().strip():
-            QtWidgets.QMessageBox.warning(
-                self, "Input Error", 
-                "Please enter the patient's disease."
-            )
-            self.disease_input.setFocus()
-            return False
-        
-        # All validations passed
-        return True
+        """Validate the form inputs (same rules as the bulk import)."""
+        problem = patient_store.validate_admission({
+            'name': self.name_input.text(),
+            'disease_name': self.disease_input.text(),
+            'birth_date': self.birth_date_input.date().toString("yyyy-MM-dd"),
+            'admission_date': self.admission_date_input.date().toString("yyyy-MM-dd"),
+            'status': self.status_input.currentText(),
+        })
+        if problem is None:
+            return True
+
+        field, message = problem
+        QtWidgets.QMessageBox.warning(self, "Input Error", message)
+        widget = {
+            'name': self.name_input,
+            'disease_name': self.disease_input,
+            'birth_date': self.birth_date_input,
+            'admission_date': self.admission_date_input,
+        }.get(field)
+        if widget is not None:
+            widget.setFocus()
+        return False
 
 
 # Test code to run this module directly
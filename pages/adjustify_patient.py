@@ -1,5 +1,7 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
-import oracledb
+from pages import patient_store
+from pages.query_executor import describe_error, executor
+from pages.patient_search import search_index
 
 class AdjustPatientDialog(QtWidgets.QDialog):
     def __init__(self, patient_id, patient_name, parent=None):
@@ -37,8 +39,8 @@ class AdjustPatientDialog(QtWidgets.QDialog):
         current_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #3498db;")
         main_layout.addWidget(current_label)
         
-        # Load current patient data
-        self.current_data = self.load_patient_data()
+        # Current patient data is fetched in the background
+        self.current_data = None
         
         # Display current details (read-only)
         self.current_details = QtWidgets.QTextEdit()
@@ -51,7 +53,7 @@ class AdjustPatientDialog(QtWidgets.QDialog):
                 padding: 10px;
             }
         """)
-        self.current_details.setHtml(self.format_current_data())
+        self.current_details.setHtml("<i>Loading patient data...</i>")
         main_layout.addWidget(self.current_details)
         
         # Adjustments section
@@ -132,57 +134,35 @@ class AdjustPatientDialog(QtWidgets.QDialog):
         main_layout.addWidget(button_box)
         self.setLayout(main_layout)
         
-        # Load initial values
-        self.load_initial_values()
+        # Load current data, then the initial values
+        self.load_patient_data()
     
     def load_patient_data(self):
-        """Load current patient data from database."""
-        connection = None
-        cursor = None
-        try:
-            connection = oracledb.connect(
-                # user="system", 
-                # password="Abdo2004@", 
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
-            
-            query = """
-            SELECT 
-                p.patient_id, p.name, p.status, p.notes,
-                TO_CHAR(p.birth_date, 'YYYY-MM-DD') AS birth_date,
-                TO_CHAR(p.admission_date, 'YYYY-MM-DD') AS admission_date,
-                LISTAGG(d.disease_name, ', ') WITHIN GROUP (ORDER BY d.disease_name) AS diseases,
-                LISTAGG(s.symptom_name || ' (' || s.severity || ')', ', ') WITHIN GROUP (ORDER BY s.symptom_name) AS symptoms
-            FROM 
-                patient p
-            LEFT JOIN disease d ON p.patient_id = d.patient_id
-            LEFT JOIN symptoms s ON p.patient_id = s.patient_id
-            WHERE 
-                p.patient_id = :id
-            GROUP BY 
-                p.patient_id, p.name, p.status, p.notes, p.birth_date, p.admission_date
-            """
-            
-            cursor.execute(query, id=self.patient_id)
-            return cursor.fetchone()
-            
-        except Exception as e:
-            print(f"Error loading patient data: {e}")
-            QtWidgets.QMessageBox.critical(
-                self,
-                "Database Error",
-                f"Could not load patient data:\n{str(e)}"
-            )
-            return None
-        finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                connection.close()
+        """Load current patient data from database in the background."""
+        executor().submit(
+            lambda connection: fetch_patient_data(connection, self.patient_id),
+            self.on_patient_data_loaded,
+            self.on_patient_data_failed,
+            owner=self,
+        )
+
+    def on_patient_data_loaded(self, data):
+        self.current_data = data
+        if data:
+            # Keep search-as-you-type in step with what was just read (e.g. after a save)
+            diseases = [d.strip() for d in (data[6] or "").split(",")]
+            search_index().upsert(data[0], data[1], diseases)
+        self.current_details.setHtml(self.format_current_data())
+        self.load_initial_values()
+
+    def on_patient_data_failed(self, error):
+        print(f"Error loading patient data: {error}")
+        QtWidgets.QMessageBox.critical(
+            self,
+            "Database Error",
+            f"Could not load patient data:\n{describe_error(error)}"
+        )
+        self.current_details.setHtml(self.format_current_data())
     
     def format_current_data(self):
         """Format current patient data for display."""
@@ -249,118 +229,105 @@ class AdjustPatientDialog(QtWidgets.QDialog):
     
     def save_changes(self):
         """Save changes to the database."""
+        if self.current_data is None:
+            QtWidgets.QMessageBox.warning(self, "Please wait", "Patient data is still loading.")
+            return
+
         adjustments = self.get_adjustments()
         
-        connection = None
-        cursor = None
-        try:
-            connection = oracledb.connect(
-                # user="system", 
-                # password="Abdo2004@", 
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
-            
-            # Start transaction
-            connection.begin()
-            
-            # Update patient status and append notes if provided
-            new_notes = self.current_data[3] or ""
-            if adjustments['additional_notes']:
-                if new_notes:
-                    new_notes += "\n\n"
-                new_notes += f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm')}] {adjustments['additional_notes']}"
-            
-            # Update patient record
-            update_query = """
-            UPDATE patient
-            SET status = :status, 
-                notes = :notes
-            WHERE patient_id = :patient_id
-            """
-            
-            cursor.execute(
-                update_query, 
-                status=adjustments['new_status'],
-                notes=new_notes,
-                patient_id=adjustments['patient_id']
-            )
-            
-            # Process symptoms update if provided
-            if adjustments['symptoms_update'].strip():
-                # Parse symptoms from input (assuming format: symptom name, severity)
-                # This is a simple implementation; you might want to improve it based on your needs
-                symptom_lines = adjustments['symptoms_update'].strip().split('\n')
-                
-                for line in symptom_lines:
-                    if ':' in line:
-                        symptom_name, severity = line.split(':', 1)
-                        symptom_name = symptom_name.strip()
-                        severity = severity.strip()
-                        
-                        # Check if symptom already exists for this patient
-                        check_query = """
-                        SELECT COUNT(*) FROM symptoms 
-                        WHERE patient_id = :patient_id AND symptom_name = :symptom_name
-                        """
-                        cursor.execute(check_query, patient_id=adjustments['patient_id'], symptom_name=symptom_name)
-                        count = cursor.fetchone()[0]
-                        
-                        if count > 0:
-                            # Update existing symptom
-                            symptom_update = """
-                            UPDATE symptoms
-                            SET severity = :severity
-                            WHERE patient_id = :patient_id AND symptom_name = :symptom_name
-                            """
-                            cursor.execute(
-                                symptom_update,
-                                severity=severity,
-                                patient_id=adjustments['patient_id'],
-                                symptom_name=symptom_name
-                            )
-                        else:
-                            # Insert new symptom
-                            symptom_insert = """
-                            INSERT INTO symptoms (patient_id, symptom_name, severity)
-                            VALUES (:patient_id, :symptom_name, :severity)
-                            """
-                            cursor.execute(
-                                symptom_insert,
-                                patient_id=adjustments['patient_id'],
-                                symptom_name=symptom_name,
-                                severity=severity
-                            )
-            
-            # Commit the transaction
-            connection.commit()
-            
-            QtWidgets.QMessageBox.information(
-                self,
-                "Success",
-                "Patient data has been successfully updated."
-            )
-            
-            # Refresh the displayed data
-            self.current_data = self.load_patient_data()
-            self.current_details.setHtml(self.format_current_data())
-            
-        except Exception as e:
-            # Rollback in case of error
-            if connection:
-                connection.rollback()
-            
-            print(f"Error saving changes: {e}")
-            QtWidgets.QMessageBox.critical(
-                self,
-                "Database Error",
-                f"Could not save changes:\n{str(e)}"
-            )
-        finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                connection.close()
\ No newline at end of file
+        # Update patient status and append notes if provided
+        new_notes = self.current_data[3] or ""
+        if adjustments['additional_notes']:
+            if new_notes:
+                new_notes += "\n\n"
+            new_notes += f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm')}] {adjustments['additional_notes']}"
+
+        self.save_button.setEnabled(False)
+        executor().submit(
+            lambda connection: write_adjustments(connection, adjustments, new_notes),
+            self.on_changes_saved,
+            self.on_save_failed,
+            owner=self,
+        )
+
+    def on_changes_saved(self, _):
+        self.save_button.setEnabled(True)
+        QtWidgets.QMessageBox.information(
+            self,
+            "Success",
+            "Patient data has been successfully updated."
+        )
+        
+        # Refresh the displayed data
+        self.load_patient_data()
+
+    def on_save_failed(self, error):
+        self.save_button.setEnabled(True)
+        print(f"Error saving changes: {error}")
+        QtWidgets.QMessageBox.critical(
+            self,
+            "Database Error",
+            f"Could not save changes:\n{describe_error(error)}"
+        )
+
+
+def fetch_patient_data(connection, patient_id):
+    """Current patient row with diseases and symptoms (runs on a worker thread)."""
+    cursor = connection.cursor()
+    try:
+        query = """
+        SELECT 
+            p.patient_id, p.name, p.status, p.notes,
+            TO_CHAR(p.birth_date, 'YYYY-MM-DD') AS birth_date,
+            TO_CHAR(p.admission_date, 'YYYY-MM-DD') AS admission_date,
+            LISTAGG(d.disease_name, ', ') WITHIN GROUP (ORDER BY d.disease_name) AS diseases,
+            LISTAGG(s.symptom_name || ' (' || s.severity || ')', ', ') WITHIN GROUP (ORDER BY s.symptom_name) AS symptoms
+        FROM 
+            patient p
+        LEFT JOIN disease d ON p.patient_id = d.patient_id
+        LEFT JOIN symptoms s ON p.patient_id = s.patient_id
+        WHERE 
+            p.patient_id = :id
+        GROUP BY 
+            p.patient_id, p.name, p.status, p.notes, p.birth_date, p.admission_date
+        """
+        cursor.execute(query, id=patient_id)
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def write_adjustments(connection, adjustments, new_notes):
+    """Apply status/notes and symptom changes in one transaction (runs on a worker thread)."""
+    cursor = connection.cursor()
+    try:
+        # Start transaction
+        connection.begin()
+        
+        # Update patient record
+        update_query = """
+        UPDATE patient
+        SET status = :status, 
+            notes = :notes
+        WHERE patient_id = :patient_id
+        """
+        
+        cursor.execute(
+            update_query, 
+            status=adjustments['new_status'],
+            notes=new_notes,
+            patient_id=adjustments['patient_id']
+        )
+        
+        # Insert or update the listed symptoms ("name: severity" per line) in one round trip
+        symptoms = patient_store.parse_symptom_updates(adjustments['symptoms_update'])
+        patient_store.upsert_symptoms(cursor, adjustments['patient_id'], symptoms)
+        
+        # Commit the transaction
+        connection.commit()
+    except Exception:
+        # Rollback in case of error
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
@@ -0,0 +1,235 @@
+"""Submitting new admissions to the patient API without blocking the GUI.
+
+Requests go through one keep-alive ``requests.Session`` on the query
+executor's thread pool, with connect/read timeouts.  Each admission is
+tried at most MAX_ATTEMPTS times, with a growing pause, and only when the
+API could not have processed it: connection failures, connect timeouts
+and gateway errors.  Every payload carries a ``request_id`` so the API can
+recognise a replay.
+
+When the API is unreachable the admission is written to a durable local
+queue (an SQLite file under the user's home directory) so intake desks can
+keep admitting.  The queue drains oldest first: on a timer, and before any
+new submission, which joins the end of the queue while older ones wait.
+A queued admission the API rejects outright is set aside as 'rejected'
+rather than blocking the rest, and ``rejected`` is emitted so the patient
+page can tell the user that patient was never saved.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import requests
+from PyQt5 import QtCore
+
+from pages.query_executor import executor
+
+# Defaults to the PHP script; set HOSPITAL_API_URL to use the Python service
+# instead, e.g. http://localhost:8080/patient_api/add_patient.php (python -m pages.patient_api)
+API_URL = os.environ.get("HOSPITAL_API_URL", "http://localhost/patient_api/add_patient.php")
+CONNECT_TIMEOUT = 3          # seconds
+READ_TIMEOUT = 10            # seconds
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5          # seconds, doubled after each failed attempt
+RETRY_STATUSES = {502, 503, 504}
+DRAIN_INTERVAL_MS = 30 * 1000
+QUEUE_PATH = os.path.join(os.path.expanduser("~"), ".hospital_app", "admission_queue.sqlite3")
+
+
+class ApiUnavailable(Exception):
+    """The API could not be reached (the admission was not processed)."""
+
+
+class ApiRejected(Exception):
+    """The API answered and refused the admission."""
+
+
+class AdmissionQueue:
+    """Durable FIFO of admissions waiting for the API (any thread)."""
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS admissions (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    request_id TEXT UNIQUE NOT NULL,
+                    payload TEXT NOT NULL,
+                    queued_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    last_error TEXT
+                )""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def push(self, payload):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO admissions (request_id, payload, queued_at) VALUES (?, ?, ?)",
+                (payload["request_id"], json.dumps(payload), datetime.now().isoformat(timespec="seconds")))
+
+    def oldest(self):
+        """(seq, payload) of the oldest pending admission, or None."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT seq, payload FROM admissions WHERE state = 'pending' ORDER BY seq LIMIT 1").fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def remove(self, seq):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM admissions WHERE seq = ?", (seq,))
+
+    def record_failure(self, seq, error, rejected=False):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE admissions SET attempts = attempts + 1, last_error = ?, state = ? WHERE seq = ?",
+                (str(error), "rejected" if rejected else "pending", seq))
+
+    def pending(self):
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM admissions WHERE state = 'pending'").fetchone()[0]
+
+
+def post_admission(session, payload):
+    """POST one admission with bounded retries; returns the API's JSON answer (worker thread)."""
+    delay = RETRY_BACKOFF
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            response = session.post(API_URL, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                                     headers={"Idempotency-Key": payload["request_id"]})
+        except (requests.ConnectionError, requests.ConnectTimeout) as e:
+            # Includes refused connections: the request never reached the API
+            error = ApiUnavailable(f"Patient API unreachable: {e}")
+        else:
+            if response.status_code in RETRY_STATUSES:
+                error = ApiUnavailable(f"Patient API unavailable (status {response.status_code})")
+            elif response.status_code != 200:
+                raise ApiRejected(f"Status code {response.status_code}: {response.text[:200]}")
+            else:
+                result = response.json()
+                if not result.get("success"):
+                    raise ApiRejected(result.get("message", "Unknown error"))
+                return result
+        if attempt < MAX_ATTEMPTS:
+            time.sleep(delay)
+            delay *= 2
+    raise error
+
+
+class AdmissionClient(QtCore.QObject):
+    """Sends admissions now or queues them; ``delivered`` fires after queued ones are sent."""
+    delivered = QtCore.pyqtSignal()
+    queue_changed = QtCore.pyqtSignal(int)
+    rejected = QtCore.pyqtSignal(object, str)  # queued admission the API refused, reason
+
+    def __init__(self, queue=None, parent=None):
+        super().__init__(parent)
+        self.queue = queue if queue is not None else AdmissionQueue()
+        self._session = requests.Session()  # keep-alive connection reused by every request
+        self._draining = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.drain)
+        if self.queue.pending():
+            self._timer.start(DRAIN_INTERVAL_MS)
+            QtCore.QTimer.singleShot(0, self.drain)
+
+    def submit(self, payload, on_done, on_error):
+        """Send ``payload`` in the background.
+
+        ``on_done("sent")`` when the API accepted it, ``on_done("queued")``
+        when it was stored for later; ``on_error(error)`` if the API rejected
+        it or the answer was lost (a read timeout: it may have been saved).
+        """
+        payload = dict(payload, request_id=payload.get("request_id") or str(uuid.uuid4()))
+
+        def work():
+            if self.queue.pending():
+                # Keep admissions in order behind the ones already waiting
+                self.queue.push(payload)
+                return "queued"
+            try:
+                post_admission(self._session, payload)
+                return "sent"
+            except ApiUnavailable as e:
+                print(f"{e}; queueing admission {payload['request_id']}")
+                self.queue.push(payload)
+                return "queued"
+
+        def done(outcome):
+            if outcome == "queued":
+                self._queued()
+            on_done(outcome)
+
+        executor().submit(work, done, on_error, busy=False, needs_connection=False)
+
+    def pending(self):
+        return self.queue.pending()
+
+    def _queued(self):
+        self.queue_changed.emit(self.queue.pending())
+        if not self._timer.isActive():
+            self._timer.start(DRAIN_INTERVAL_MS)
+        self.drain()
+
+    def drain(self):
+        """Send queued admissions oldest first until the queue is empty or the API is down."""
+        if self._draining:
+            return
+        self._draining = True
+
+        def work():
+            sent, refused = 0, []
+            while True:
+                item = self.queue.oldest()
+                if item is None:
+                    return sent, refused
+                seq, payload = item
+                try:
+                    post_admission(self._session, payload)
+                except ApiUnavailable as e:
+                    self.queue.record_failure(seq, e)
+                    return sent, refused
+                except (ApiRejected, requests.RequestException, ValueError) as e:
+                    print(f"Queued admission {payload['request_id']} rejected: {e}")
+                    self.queue.record_failure(seq, e, rejected=True)
+                    refused.append((payload, str(e)))
+                    continue
+                self.queue.remove(seq)
+                sent += 1
+
+        def done(result):
+            sent, refused = result
+            self._draining = False
+            for payload, reason in refused:
+                self.rejected.emit(payload, reason)
+            pending = self.queue.pending()
+            self.queue_changed.emit(pending)
+            if not pending:
+                self._timer.stop()
+            if sent:
+                print(f"Delivered {sent} queued admission(s)")
+                self.delivered.emit()
+
+        def failed(error):
+            self._draining = False
+            print(f"Error draining the admission queue: {error}")
+
+        executor().submit(work, done, failed, busy=False, needs_connection=False)
+
+
+_client = None
+
+
+def admission_client():
+    """Return the process-wide admission client."""
+    global _client
+    if _client is None:
+        _client = AdmissionClient()
+    return _client
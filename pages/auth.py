@@ -0,0 +1,244 @@
+"""Employee authentication.
+
+Passwords are stored as salted scrypt hashes (``scrypt$n$r$p$salt$hash``,
+base64 fields).  scrypt is deliberately slow and memory-hard, so
+``authenticate`` and ``hash_password`` must run on the query executor,
+never on the GUI thread.
+
+Rows still holding a plaintext password are accepted once and rewritten
+as a hash on that employee's next successful login.  The
+``employees.password`` column must be wide enough for HASH_LENGTH
+characters; ``python -m pages.auth --widen-password-column`` widens it.
+Until then logins still succeed (the migration is retried next time),
+while signup stops with PasswordColumnTooNarrow instead of a database
+error.
+
+Failed (worker ID, password) pairs are remembered for NEGATIVE_TTL
+seconds, so a retry loop of the same bad attempt costs neither a round
+trip nor a hash.
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+from pages import database
+
+SCRYPT_N = 2 ** 14          # CPU/memory cost: 128 * N * r bytes = 16 MiB per hash
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+SCHEME = "scrypt"
+HASH_LENGTH = 96            # upper bound of len(hash_password(...)) with the settings above
+PASSWORD_COLUMN_WIDTH = 128
+
+NEGATIVE_TTL = 30           # seconds a failed attempt is answered from memory
+NEGATIVE_CACHE_SIZE = 1024
+
+# Same text every time, so the session's statement cache keeps it parsed
+CREDENTIALS_QUERY = """
+    SELECT full_name, role, password
+    FROM employees
+    WHERE worker_id = :worker_id
+"""
+MIGRATE_PASSWORD = """
+    UPDATE employees
+    SET password = :new_hash
+    WHERE worker_id = :worker_id AND password = :old_value
+"""
+
+PASSWORD_WIDTH_QUERY = """
+    SELECT char_length
+    FROM user_tab_columns
+    WHERE table_name = 'EMPLOYEES' AND column_name = 'PASSWORD'
+"""
+WIDEN_PASSWORD_COLUMN = f"ALTER TABLE employees MODIFY password VARCHAR2({PASSWORD_COLUMN_WIDTH})"
+
+_negative = {}              # (worker_id, sha256(password)) -> expiry (monotonic)
+_negative_lock = threading.Lock()
+
+
+class PasswordColumnTooNarrow(Exception):
+    """employees.password cannot hold a hash yet."""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r * p, dklen=KEY_BYTES)
+
+
+def hash_password(password):
+    """Salted scrypt hash of ``password`` in the stored format."""
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{SCHEME}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}"
+
+
+_dummy_hash = None
+
+
+def _unknown_worker_hash():
+    """Hash verified against when the worker ID is unknown, so both cases take as long."""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(os.urandom(8).hex())
+    return _dummy_hash
+
+
+def is_hashed(stored):
+    return str(stored or "").startswith(SCHEME + "$")
+
+
+def verify_password(password, stored):
+    """(matches, needs_rehash) for a candidate against a stored value."""
+    stored = str(stored or "")
+    if not is_hashed(stored):
+        # Legacy plaintext row
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8")), True
+    try:
+        _, n, r, p, salt, key = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        expected = base64.b64decode(salt), base64.b64decode(key)
+    except ValueError:
+        return False, False
+    candidate = _scrypt(password, expected[0], n, r, p)
+    matches = hmac.compare_digest(candidate, expected[1])
+    return matches, matches and (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+def _attempt_key(worker_id, password):
+    return worker_id, hashlib.sha256(password.encode("utf-8")).digest()
+
+
+def _recently_failed(key):
+    now = time.monotonic()
+    with _negative_lock:
+        expiry = _negative.get(key)
+        if expiry is None:
+            return False
+        if expiry < now:
+            del _negative[key]
+            return False
+        return True
+
+
+def _remember_failure(key):
+    now = time.monotonic()
+    with _negative_lock:
+        if len(_negative) >= NEGATIVE_CACHE_SIZE:
+            for stale in [k for k, expiry in _negative.items() if expiry < now] or list(_negative)[:1]:
+                del _negative[stale]
+        _negative[key] = now + NEGATIVE_TTL
+
+
+def forget_failures(worker_id):
+    """Drop cached failures for a worker (e.g. after a password change)."""
+    with _negative_lock:
+        for key in [k for k in _negative if k[0] == worker_id]:
+            del _negative[key]
+
+
+def authenticate(connection, worker_id, password):
+    """(full_name, role) if the credentials are valid, else None (worker thread)."""
+    key = _attempt_key(worker_id, password)
+    if _recently_failed(key):
+        return None
+
+    cursor = connection.cursor()
+    try:
+        cursor.prepare(CREDENTIALS_QUERY)
+        cursor.execute(None, {"worker_id": worker_id})
+        row = cursor.fetchone()
+        if row is None:
+            verify_password(password, _unknown_worker_hash())
+            _remember_failure(key)
+            return None
+
+        full_name, role, stored = row
+        matches, needs_rehash = verify_password(password, stored)
+        if not matches:
+            _remember_failure(key)
+            return None
+        if needs_rehash:
+            _migrate(connection, cursor, worker_id, stored, password)
+        return full_name, role
+    finally:
+        cursor.close()
+
+
+def _migrate(connection, cursor, worker_id, old_value, password):
+    """Replace a plaintext or outdated value with a current hash."""
+    try:
+        cursor.execute(MIGRATE_PASSWORD, {
+            "new_hash": hash_password(password),
+            "worker_id": worker_id,
+            "old_value": old_value,
+        })
+        connection.commit()
+        print(f"Password of worker {worker_id} migrated to {SCHEME}")
+    except database.DatabaseError as error:
+        connection.rollback()
+        print(f"Could not migrate the password of worker {worker_id}: {error}")
+
+
+def password_column_width(connection):
+    """Width of employees.password in characters, or None if unknown or unbounded (SQLite)."""
+    if database.backend() != "oracle":
+        return None
+    cursor = connection.cursor()
+    try:
+        cursor.execute(PASSWORD_WIDTH_QUERY)
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return row[0] if row else None
+
+
+def check_password_column(connection):
+    """Raise PasswordColumnTooNarrow if employees.password cannot hold HASH_LENGTH characters."""
+    width = password_column_width(connection)
+    if width is not None and width < HASH_LENGTH:
+        raise PasswordColumnTooNarrow(
+            f"The employees.password column holds {width} characters but password hashes need "
+            f"{HASH_LENGTH}. Ask an administrator to run: python -m pages.auth --widen-password-column"
+        )
+
+
+def widen_password_column(connection):
+    """Widen employees.password for hashes; returns False if it was wide enough already."""
+    width = password_column_width(connection)
+    if width is None or width >= HASH_LENGTH:
+        return False
+    cursor = connection.cursor()
+    try:
+        cursor.execute(WIDEN_PASSWORD_COLUMN)
+    finally:
+        cursor.close()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Employee authentication maintenance")
+    parser.add_argument("--widen-password-column", action="store_true",
+                        help=f"widen employees.password to VARCHAR2({PASSWORD_COLUMN_WIDTH}) for password hashes")
+    args = parser.parse_args()
+
+    with database.connection() as connection:
+        if args.widen_password_column:
+            if widen_password_column(connection):
+                print(f"employees.password widened to {PASSWORD_COLUMN_WIDTH} characters")
+            else:
+                print("employees.password is already wide enough")
+    database.close_pool()
+
+
+if __name__ == "__main__":
+    main()
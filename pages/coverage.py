@@ -0,0 +1,142 @@
+"""Staffing coverage: who is actually on duty, hour by hour.
+
+Shift intervals from a ``ShiftSchedule`` are laid over the chosen date
+range, and approved time off is cut out of them.  A sweep line then runs
+over each department's start/end events: the level between two events is
+the headcount, and the lowest level seen within an hour is that hour's
+headcount.  Cost is O(E log E + hours) for E shift pieces.  That covers a
+2,000-person staff's week in a few milliseconds, so it is recomputed on
+every filter change.
+
+Time off is whole days: an approved request from the 3rd to the 5th
+removes any shift time between the 3rd 00:00 and the 6th 00:00.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from pages.shift_schedule import MINUTES_PER_DAY
+
+MIN_STAFF = 2           # default headcount below which an hour is understaffed
+UNASSIGNED = "Unassigned"
+
+
+def _subtract(start, end, holes):
+    """Pieces of [start, end) left after removing the ``holes`` intervals."""
+    pieces = [(start, end)]
+    for hole_start, hole_end in holes:
+        pieces = [
+            piece
+            for s, e in pieces
+            for piece in ((s, min(e, hole_start)), (max(s, hole_end), e))
+            if piece[0] < piece[1]
+        ]
+    return pieces
+
+
+def _hourly_minimum(events, hours):
+    """Lowest level in each hour for sorted (minute, delta) events."""
+    lows = []
+    level = i = 0
+    for hour in range(hours):
+        hour_start, hour_end = hour * 60, hour * 60 + 60
+        while i < len(events) and events[i][0] <= hour_start:
+            level += events[i][1]
+            i += 1
+        low = level
+        while i < len(events) and events[i][0] < hour_end:
+            minute = events[i][0]
+            # Apply every event of that minute before looking at the level
+            while i < len(events) and events[i][0] == minute:
+                level += events[i][1]
+                i += 1
+            low = min(low, level)
+        lows.append(low)
+    return lows
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class Coverage:
+    """Hourly headcount per department from ``first_day`` for ``len(self)`` hours."""
+    def __init__(self, first_day, hours, headcount):
+        self.first_day = first_day
+        self.hours = hours
+        self.headcount = headcount  # department -> [lowest headcount per hour]; None = everyone
+
+    def __len__(self):
+        return self.hours
+
+    @property
+    def departments(self):
+        return sorted(dept for dept in self.headcount if dept is not None)
+
+    def hour_start(self, hour):
+        return datetime.combine(self.first_day, datetime.min.time()) + timedelta(hours=hour)
+
+    def lowest(self, department=None):
+        counts = self.headcount.get(department) or [0]
+        return min(counts)
+
+    def understaffed(self, min_staff=MIN_STAFF):
+        """[(department, first hour, end hour, lowest headcount)] of runs below ``min_staff``."""
+        windows = []
+        for dept in self.departments:
+            run_start, run_low = None, None
+            for hour, count in enumerate(self.headcount[dept] + [min_staff]):  # sentinel closes a run
+                if count < min_staff:
+                    if run_start is None:
+                        run_start, run_low = hour, count
+                    run_low = min(run_low, count)
+                elif run_start is not None:
+                    windows.append((dept, run_start, hour, run_low))
+                    run_start = None
+        return windows
+
+
+def compute_coverage(schedule, time_off, first_day, last_day):
+    """Coverage of ``schedule`` from ``first_day`` to ``last_day`` inclusive.
+
+    ``time_off`` yields (worker_id, start, end) of approved requests; dates
+    may be ``date`` objects or 'YYYY-MM-DD' strings.
+    """
+    first_day, last_day = _as_date(first_day), _as_date(last_day)
+    days = max((last_day - first_day).days + 1, 0)
+    span = days * MINUTES_PER_DAY
+
+    rows = {worker_id: row for row, (worker_id, _, _) in enumerate(schedule.workers)}
+    holes = defaultdict(list)  # worker row -> [(start, end)] minutes from first_day
+    for worker_id, start, end in time_off:
+        row = rows.get(worker_id)
+        if row is None or start is None or end is None:
+            continue
+        hole_start = (_as_date(start) - first_day).days * MINUTES_PER_DAY
+        hole_end = ((_as_date(end) - first_day).days + 1) * MINUTES_PER_DAY
+        if hole_end > 0 and hole_start < span:
+            holes[row].append((hole_start, hole_end))
+
+    events = defaultdict(list)  # department -> [(minute, +1/-1)]
+    # Start a day early: last night's overnight shifts run into the first morning.
+    # shifts_on(day) with no department lists every shift exactly once, including
+    # those of workers without a department.
+    for day in range(-1, days):
+        base = day * MINUTES_PER_DAY
+        for shift in schedule.shifts_on((first_day + timedelta(days=day)).weekday()):
+            worker = schedule.worker[shift]
+            dept = schedule.workers[worker][2] or UNASSIGNED
+            for start, end in _subtract(base + schedule.start[shift], base + schedule.end[shift],
+                                        holes.get(worker, ())):
+                start, end = max(start, 0), min(end, span)
+                if start < end:
+                    events[dept] += ((start, 1), (end, -1))
+
+    hours = days * 24
+    departments = {worker[2] or UNASSIGNED for worker in schedule.workers}
+    headcount = {dept: _hourly_minimum(sorted(events[dept]), hours) for dept in departments}
+    headcount[None] = _hourly_minimum(sorted(e for dept_events in events.values() for e in dept_events), hours)
+    return Coverage(first_day, hours, headcount)
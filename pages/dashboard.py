@@ -1,15 +1,19 @@
 import sys
 import random
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                             QWidget, QTabWidget, QLabel, QComboBox, QFrame, 
                             QPushButton, QGridLayout, QSizePolicy, QSpacerItem)
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QIcon
 import pyqtgraph as pg
-import pandas as pd
 import numpy as np
 
+from pages import preloader
+from pages.disease_stats import AGE_LABELS, SEVERITY_ORDER, DiseaseStats, FilterCube, fetch_disease_stats
+from pages.query_executor import describe_error, executor
+
 
 # Set global pyqtgraph configuration for a more professional look
 pg.setConfigOption('background', 'w')  # White background
@@ -101,8 +105,10 @@ class DiseaseStatsDashboard(QMainWindow):
 
 
         
-        # Sample data - replace with your actual data loading mechanism
-        self.load_data()
+        # Start empty; the aggregated statistics are fetched in the background once the UI is up
+        self.data = DiseaseStats()
+        # Memoized slices per (period, department, disease) filter combination
+        self.cube = FilterCube(self.data)
         
         # Create the main widget and layout
         main_widget = QWidget()
@@ -177,7 +183,7 @@ class DiseaseStatsDashboard(QMainWindow):
         
         refresh_btn = QPushButton("Refresh Data")
         refresh_btn.setIcon(QIcon.fromTheme("view-refresh"))
-        refresh_btn.clicked.connect(self.update_charts)
+        refresh_btn.clicked.connect(self.refresh_data)
         
         filter_layout.addWidget(date_label)
         filter_layout.addWidget(self.period_combo)
@@ -261,6 +267,18 @@ class DiseaseStatsDashboard(QMainWindow):
         self.create_demographics_tab()
         self.create_severity_analysis_tab()
 
+        # Only the visible tab is drawn; the others are redrawn when shown
+        self.tab_renderers = [
+            ("Disease Distribution", self.compute_distribution, self.update_disease_distribution_plot),
+            ("Trend Analysis", self.compute_trend, self.update_trend_analysis_plot),
+            ("Demographics", self.compute_demographics, self.update_demographics_plots),
+            ("Severity Analysis", self.compute_severity, self.update_severity_analysis_plots),
+        ]
+        self.dirty_tabs = set()
+        self.selection = None
+        self.tab_timings = {}  # tab name -> (compute ms, render ms) of its last refresh
+        self.tabs.currentChanged.connect(self.render_current_tab)
+
                 # Create bottom action layout (add this before the initial update)
         bottom_action_layout = QHBoxLayout()
         bottom_action_layout.addStretch(1)  # Add stretch to push button left
@@ -288,6 +306,7 @@ class DiseaseStatsDashboard(QMainWindow):
         
         # Initial update
         self.update_charts()
+        self.load_data()
 
     def go_back_to_workspaces(self):
         """Return to the workspaces/home page."""
@@ -302,100 +321,53 @@ class DiseaseStatsDashboard(QMainWindow):
  
         
     def load_data(self):
-        import oracledb
-        
-        connection = None
-        cursor = None
-        try:
-            # Connect to database
-            connection = oracledb.connect(
-                # user="system", 
-                # password="Abdo2004@", 
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
-            
-            # SQL query to fetch disease statistics data
-            # Modify this query according to your database schema
-            query = """
-            SELECT 
-                d.disease_name as disease, 
-                d.diagnosis_date as diagnosis_date, 
-                FLOOR(MONTHS_BETWEEN(SYSDATE, p.birth_date) / 12) AS age, 
-                p.department as department, 
-                s.severity as severity
-            FROM 
-                patient p
-            JOIN 
-                disease d ON p.patient_id = d.patient_id
-            JOIN
-                symptoms s on p.patient_id = s.patient_id
-            WHERE 
-                d.diagnosis_date >= ADD_MONTHS(SYSDATE, -12)  -- Last 12 months of data
-            """
-            
-            # Execute query
-            cursor.execute(query)
-            
-            # Fetch all records
-            rows = cursor.fetchall()
-            
-            # Get column names from cursor description
-            columns = [col[0] for col in cursor.description]
-            
-            # Prepare data lists
-            diseases = []
-            dates = []
-            ages = []
-            departments = []
-            severities = []
-            
-            # Process rows
-            for row in rows:
-                diseases.append(row[0])
-                dates.append(row[1])
-                ages.append(row[2])
-                departments.append(row[3])
-                severities.append(row[4])
-            
-            # Create DataFrame
-            self.data = pd.DataFrame({
-                'disease': diseases,
-                'date': dates,
-                'age': ages,
-                'department': departments,
-                'severity': severities,
-            })
-            
-            # Close cursor and connection
-            cursor.close()
-            connection.close()
-            
-            print(f"Successfully loaded {len(self.data)} records from database")
-            
-        except oracledb.Error as error:
-            print(f"Database error: {error}")
-            # Create empty DataFrame if database connection fails
-            self.data = pd.DataFrame({
-                'disease': [],
-                'date': [],
-                'age': [],
-                'department': [],
-                'severity': [],
-            })
-        except Exception as e:
-            print(f"Error: {e}")
-            # Create empty DataFrame if any other error occurs
-            self.data = pd.DataFrame({
-                'disease': [],
-                'date': [],
-                'age': [],
-                'department': [],
-                'severity': [],
-            })
+        """Fetch the disease statistics in the background and redraw when they arrive."""
+        data = preloader.take("disease_stats")
+        if data is not None:
+            # Already fetched behind the splash screen
+            self.on_data_loaded(data)
+            return
+        executor().submit(
+            lambda connection: DiseaseStats(fetch_disease_stats(connection)),
+            self.on_data_loaded, self.on_data_failed, owner=self,
+        )
+
+    def refresh_data(self):
+        """Fetch only the days since the last load and merge them into the cube."""
+        since_day = self.data.last_day
+        if since_day is None:
+            self.load_data()
+            return
+        executor().submit(
+            lambda connection: fetch_disease_stats(connection, since_day),
+            lambda rows: self.on_batch_loaded(rows, since_day),
+            self.on_data_failed, owner=self,
+        )
+
+    def refresh_workspace(self):
+        """Called by workspace_cache when a stale dashboard is reopened."""
+        self.refresh_data()
+
+    def needs_refresh(self):
+        # Nothing loaded yet, e.g. the first load was cancelled by leaving the page
+        return self.data.last_day is None
+
+    def on_data_loaded(self, data):
+        self.data = data
+        self.cube.reset(data)
+        print(f"Successfully loaded {len(self.data)} aggregated cells ({self.data.total_cases()} records) from database")
+        self.update_charts()
+
+    def on_batch_loaded(self, rows, since_day):
+        affected = self.cube.merge(rows, since_day)
+        print(f"Merged {len(rows)} cells from {since_day}; {len(affected)} department/disease pairs changed")
+        self.update_charts()
+
+    def on_data_failed(self, error):
+        # Keep whatever is already loaded if the database query fails
+        print(f"Database error: {describe_error(error)}")
+        self.update_charts()
+
     def create_disease_distribution_tab(self):
         tab = QWidget()
         layout = QVBoxLayout()
@@ -490,65 +462,62 @@ class DiseaseStatsDashboard(QMainWindow):
         dept = self.dept_combo.currentText().replace("All Departments", "")
         disease = self.disease_combo.currentText().replace("All Diseases", "")
         
-        filtered_data = self.data.copy()
-        
-        # Apply department filter
-        if dept:
-            filtered_data = filtered_data[filtered_data['department'] == dept]
-        
-        # Apply disease filter
-        if disease:
-            filtered_data = filtered_data[filtered_data['disease'] == disease]
-        
-        # Apply period filter
-        days = 0
-        if period == "Last Week":
-            days = 7
-        elif period == "Last Month":
-            days = 30
-        elif period == "Last Quarter":
-            days = 90
-        elif period == "Last Year":
-            days = 365
-            
-        if days > 0:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            filtered_data = filtered_data[filtered_data['date'] >= cutoff_date]
+        self.selection = self.cube.get(period, dept, disease)
         
         # Update summary cards
-        self.update_summary_cards(filtered_data)
-        
-        # Update the disease count plot
-        self.update_disease_distribution_plot(filtered_data)
-        
-        # Update the trend analysis plot
-        self.update_trend_analysis_plot(filtered_data)
-        
-        # Update the demographics plots
-        self.update_demographics_plots(filtered_data)
+        self.update_summary_cards(self.selection)
         
-        # Update the severity analysis plot
-        self.update_severity_analysis_plots(filtered_data)
+        # Every tab is now out of date; draw the visible one
+        self.dirty_tabs = set(range(len(self.tab_renderers)))
+        self.render_current_tab()
+
+    def render_current_tab(self, index=None):
+        """Compute and draw the visible tab if its charts are out of date."""
+        index = self.tabs.currentIndex() if index is None else index
+        if self.selection is None or index not in self.dirty_tabs:
+            return
+        name, compute, render = self.tab_renderers[index]
+
+        start = time.perf_counter()
+        compute(self.selection)
+        computed = time.perf_counter()
+        render(self.selection)
+        rendered = time.perf_counter()
+
+        self.dirty_tabs.discard(index)
+        self.tab_timings[name] = ((computed - start) * 1000, (rendered - computed) * 1000)
+
+    # Aggregates each tab needs; memoized on the slice, so the render step only draws
+    def compute_distribution(self, data):
+        data.disease_counts()
+
+    def compute_trend(self, data):
+        data.weekly_counts()
+
+    def compute_demographics(self, data):
+        data.age_group_counts()
+        data.department_counts()
+
+    def compute_severity(self, data):
+        data.severity_counts()
+        data.severity_share_by_disease(top=5)
     
     def update_summary_cards(self, data):
         # Update total cases
-        total_cases = len(data)
+        total_cases = data.total_cases()
         self.total_cases_number.setText(f"{total_cases:,}")
         
         # Update critical cases
-        critical_cases = len(data[data['severity'] == 'Critical'])
+        critical_cases = data.critical_cases()
         self.critical_cases_number.setText(f"{critical_cases:,}")
         
         # Update average age
-        avg_age = data['age'].mean()
+        avg_age = data.average_age()
         self.avg_age_number.setText(f"{avg_age:.1f}")
         
         # Update most common disease
-        if not data.empty:
-            common_disease = data['disease'].value_counts().idxmax()
-            self.common_disease_name.setText(common_disease)
-        else:
-            self.common_disease_name.setText("N/A")
+        common_disease = data.most_common_disease()
+        self.common_disease_name.setText(common_disease if common_disease else "N/A")
     
     def update_disease_distribution_plot(self, data):
         # Clear the plot
@@ -558,18 +527,18 @@ class DiseaseStatsDashboard(QMainWindow):
             return
             
         # Count diseases
-        disease_counts = data['disease'].value_counts().nlargest(10)  # Top 10 diseases
+        disease_counts = data.disease_counts().most_common(10)  # Top 10 diseases
         
         # Create bar chart
         x = np.arange(len(disease_counts))
-        y = disease_counts.values
+        y = [count for _, count in disease_counts]
         
         # Create bar graph with professional color
         bar_graph = pg.BarGraphItem(x=x, height=y, width=0.6, brush=(52, 152, 219))
         self.disease_plot.addItem(bar_graph)
         
         # Set x-axis labels
-        ticks = [(i, name) for i, name in enumerate(disease_counts.index)]
+        ticks = [(i, name) for i, (name, _) in enumerate(disease_counts)]
         self.disease_plot.getAxis('bottom').setTicks([ticks])
     
     def update_trend_analysis_plot(self, data):
@@ -580,13 +549,11 @@ class DiseaseStatsDashboard(QMainWindow):
             return
             
         # Group by week for a cleaner trend line
-        data['week'] = pd.to_datetime(data['date']).dt.isocalendar().week
-        data['year'] = pd.to_datetime(data['date']).dt.isocalendar().year
-        time_series = data.groupby(['year', 'week']).size()
+        time_series = data.weekly_counts()
         
         # Convert to lists for plotting
         x = list(range(len(time_series)))
-        y = time_series.values
+        y = [count for _, count in time_series]
         
         # Create line plot with professional styling
         pen = pg.mkPen(color=(41, 128, 185), width=3)
@@ -594,7 +561,7 @@ class DiseaseStatsDashboard(QMainWindow):
         
         # Add labels for x-axis
         tick_labels = []
-        for i, (year, week) in enumerate(time_series.index):
+        for i, ((year, week), _) in enumerate(time_series):
             if i % 4 == 0:  # Only show every 4th label to avoid crowding
                 tick_labels.append((i, f"{year}-W{week}"))
         
@@ -609,44 +576,34 @@ class DiseaseStatsDashboard(QMainWindow):
         if data.empty:
             return
             
-        # Age distribution
-        age_bins = [(0, 10), (11, 20), (21, 30), (31, 40), (41, 50), 
-                    (51, 60), (61, 70), (71, 80), (81, 90), (91, 100)]
-        age_labels = ['0-10', '11-20', '21-30', '31-40', '41-50', 
-                      '51-60', '61-70', '71-80', '81-90', '91-100']
-        
-        # Create age groups
-        data['age_group'] = pd.cut(data['age'], bins=[0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100], 
-                                   labels=age_labels)
-        
-        # Count by age group
-        age_counts = data['age_group'].value_counts().reindex(age_labels)
+        # Age distribution, counted per age group
+        age_counts = data.age_group_counts()
         
         # Create bar chart
         x = np.arange(len(age_counts))
-        y = age_counts.values
+        y = age_counts
         
         # Create bar graph with professional color
         bar_graph = pg.BarGraphItem(x=x, height=y, width=0.6, brush=(46, 204, 113))
         self.age_dist_plot.addItem(bar_graph)
         
         # Set x-axis labels
-        ticks = [(i, name) for i, name in enumerate(age_counts.index)]
+        ticks = [(i, name) for i, name in enumerate(AGE_LABELS)]
         self.age_dist_plot.getAxis('bottom').setTicks([ticks])
         
         # Department distribution
-        dept_counts = data['department'].value_counts()
+        dept_counts = data.department_counts().most_common()
         
         # Create bar chart
         x = np.arange(len(dept_counts))
-        y = dept_counts.values
+        y = [count for _, count in dept_counts]
         
         # Create bar graph with professional color
         bar_graph = pg.BarGraphItem(x=x, height=y, width=0.6, brush=(142, 68, 173))
         self.dept_dist_plot.addItem(bar_graph)
         
         # Set x-axis labels
-        ticks = [(i, name) for i, name in enumerate(dept_counts.index)]
+        ticks = [(i, name) for i, (name, _) in enumerate(dept_counts)]
         self.dept_dist_plot.getAxis('bottom').setTicks([ticks])
     
     def update_severity_analysis_plots(self, data):
@@ -658,12 +615,8 @@ class DiseaseStatsDashboard(QMainWindow):
             return
             
         # Overall severity counts
-        severity_order = ['Mild', 'Moderate', 'Severe', 'Critical']
-        severity_counts = data['severity'].value_counts().reindex(severity_order)
-        
-        # Create bar chart for overall severity
-        x = np.arange(len(severity_counts))
-        y = severity_counts.values
+        severity_order = SEVERITY_ORDER
+        severity_counts = data.severity_counts()
         
         # Define colors based on severity
         severity_colors = {
@@ -674,41 +627,29 @@ class DiseaseStatsDashboard(QMainWindow):
         }
         
         # Create individual bar graph items with different colors
-        for i, severity in enumerate(severity_counts.index):
-            if pd.notna(severity):  # Check if severity is not NaN
+        for i, (severity, count) in enumerate(zip(severity_order, severity_counts)):
+            if count:
                 color = severity_colors.get(severity, (52, 152, 219))  # Default blue
-                bar = pg.BarGraphItem(x=[i], height=[severity_counts[severity]], width=0.6, brush=color)
+                bar = pg.BarGraphItem(x=[i], height=[count], width=0.6, brush=color)
                 self.severity_plot.addItem(bar)
         
         # Set x-axis labels
-        ticks = [(i, name) for i, name in enumerate(severity_counts.index)]
+        ticks = [(i, name) for i, name in enumerate(severity_order)]
         self.severity_plot.getAxis('bottom').setTicks([ticks])
         
-        # Severity by disease (stacked bar chart)
-        top_diseases = data['disease'].value_counts().nlargest(5).index.tolist()
-        disease_data = data[data['disease'].isin(top_diseases)]
-        
-        # Create severity percentages by disease
-        severity_by_disease = pd.crosstab(disease_data['disease'], disease_data['severity'], 
-                                          normalize='index') * 100
+        # Severity percentages for the top 5 diseases
+        top_diseases, severity_by_disease = data.severity_share_by_disease(top=5)
         
-        # Reindex to ensure all severity levels are included
-        severity_by_disease = severity_by_disease.reindex(columns=severity_order, fill_value=0)
-        
-        # Create stacked bar chart
-        bar_offset = np.zeros(len(top_diseases))
-        
-        for i, severity in enumerate(severity_order):
-            if severity in severity_by_disease.columns:
-                x = np.arange(len(top_diseases))
-                y = severity_by_disease[severity].values
-                
-                # Color based on severity
-                color = severity_colors.get(severity, (52, 152, 219))
-                
-                # Add bar for this severity level
-                bars = pg.BarGraphItem(x=x, height=y, width=0.6, brush=color, name=severity)
-                self.severity_by_disease_plot.addItem(bars)
+        for severity in severity_order:
+            x = np.arange(len(top_diseases))
+            y = severity_by_disease[severity]
+            
+            # Color based on severity
+            color = severity_colors.get(severity, (52, 152, 219))
+            
+            # Add bar for this severity level
+            bars = pg.BarGraphItem(x=x, height=y, width=0.6, brush=color, name=severity)
+            self.severity_by_disease_plot.addItem(bars)
         
         # Set x-axis labels
         ticks = [(i, name) for i, name in enumerate(top_diseases)]
@@ -719,7 +660,6 @@ class DiseaseStatsDashboard(QMainWindow):
         for severity, color in severity_colors.items():
             legend.addItem(pg.BarGraphItem(x=[0], height=[0], width=0.6, brush=color), severity)
 
-
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = DiseaseStatsDashboard()
@@ -0,0 +1,383 @@
+"""Process-wide database access shared by every page.
+
+Pages borrow sessions from a single ``oracledb`` connection pool instead of
+opening (and tearing down) a new connection for every query.  A pooled
+connection's ``close()`` hands the session back to the pool, so existing
+``try/finally: connection.close()`` blocks keep working unchanged.
+
+For offline work the pool can be swapped for a local SQLite stand-in with
+``use_sqlite()``; it exposes the same acquire/release/cursor surface.
+"""
+import calendar
+import math
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+
+try:
+    import oracledb
+except ImportError:  # only the SQLite stand-in is usable without the driver
+    oracledb = None
+
+# Catch this instead of oracledb.DatabaseError so the stand-in is covered too.
+if oracledb is not None:
+    DatabaseError = (oracledb.DatabaseError, sqlite3.DatabaseError)
+else:
+    DatabaseError = (sqlite3.DatabaseError,)
+
+
+def describe_error(error):
+    """Readable message for an Oracle or stand-in database error."""
+    if error.args and hasattr(error.args[0], "code"):
+        err = error.args[0]
+        return f"Error {err.code}: {err.message}"
+    return str(error)
+
+
+# Database Configuration
+# DB_USERNAME = "system"
+# DB_PASSWORD = "Abdo2004@"
+# DB_DSN = "localhost:1521/FREE"
+DB_USERNAME = "system"
+DB_PASSWORD = "s2004b22"
+DB_DSN = "192.168.21.1:1521/FREE"
+
+# Pool Configuration
+POOL_MIN = 1                 # sessions opened up front
+POOL_MAX = 8                 # hard cap on concurrent sessions
+POOL_INCREMENT = 1           # sessions opened each time the pool grows
+POOL_PING_INTERVAL = 60      # seconds a session may idle before it is pinged on acquire
+POOL_WAIT_TIMEOUT = 10000    # ms to wait for a free session before failing
+STATEMENT_CACHE_SIZE = 40    # parsed statements kept per session
+
+_settings = {
+    "user": DB_USERNAME,
+    "password": DB_PASSWORD,
+    "dsn": DB_DSN,
+    "min": POOL_MIN,
+    "max": POOL_MAX,
+    "increment": POOL_INCREMENT,
+    "ping_interval": POOL_PING_INTERVAL,
+    "wait_timeout": POOL_WAIT_TIMEOUT,
+    "stmtcachesize": STATEMENT_CACHE_SIZE,
+}
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure(**settings):
+    """Override pool settings (user, password, dsn, min, max, increment,
+    ping_interval, wait_timeout, stmtcachesize).
+
+    Takes effect the next time the pool is created, so call it before the
+    first query or after ``close_pool()``.
+    """
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown pool settings: {', '.join(sorted(unknown))}")
+    _settings.update(settings)
+
+
+def get_pool():
+    """Return the shared pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _create_oracle_pool()
+    return _pool
+
+
+def _create_oracle_pool():
+    if oracledb is None:
+        raise RuntimeError("python-oracledb is not installed; call database.use_sqlite() to work offline")
+    return oracledb.create_pool(
+        user=_settings["user"],
+        password=_settings["password"],
+        dsn=_settings["dsn"],
+        min=_settings["min"],
+        max=_settings["max"],
+        increment=_settings["increment"],
+        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=_settings["wait_timeout"],
+        ping_interval=_settings["ping_interval"],
+        stmtcachesize=_settings["stmtcachesize"],
+    )
+
+
+def use_sqlite(path=None):
+    """Replace the Oracle pool with a local SQLite stand-in.
+
+    ``path`` defaults to a shared in-memory database that lives until
+    ``close_pool()`` is called.  Returns the stand-in pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = SQLitePool(path, max_size=_settings["max"])
+    return _pool
+
+
+def acquire():
+    """Borrow a session from the pool; ``close()`` it to give it back."""
+    return get_pool().acquire()
+
+
+def release(connection):
+    """Give a borrowed session back to the pool."""
+    if connection is not None:
+        connection.close()
+
+
+@contextmanager
+def connection():
+    """Context manager yielding a pooled session that is released on exit."""
+    conn = acquire()
+    try:
+        yield conn
+    finally:
+        release(conn)
+
+
+def backend():
+    """Name of the active backend: ``"oracle"`` or ``"sqlite"``."""
+    return "sqlite" if isinstance(get_pool(), SQLitePool) else "oracle"
+
+
+def pool_stats():
+    """Opened/busy session counts, for diagnostics."""
+    pool = get_pool()
+    return {"opened": pool.opened, "busy": pool.busy, "max": pool.max}
+
+
+def close_pool():
+    """Close every pooled session (application shutdown or reconfiguration)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            try:
+                _pool.close(force=True)
+            except Exception as e:
+                print(f"Error closing database pool: {e}")
+            _pool = None
+
+
+# ------------------------- SQLite stand-in -------------------------
+# Oracle-only syntax rewritten before a statement reaches SQLite.
+_SQLITE_REWRITES = [
+    (re.compile(r"\bSYSDATE\b", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bFETCH\s+FIRST\s+(\S+)\s+ROWS?\s+ONLY\b", re.IGNORECASE), r"LIMIT \1"),
+]
+
+# Oracle date format elements understood by TO_CHAR/TO_DATE in the stand-in;
+# TRUNC, ADD_MONTHS, MONTHS_BETWEEN, FLOOR and CEIL are registered as well.
+_DATE_FORMATS = [
+    ("YYYY", "%Y"), ("MON", "%b"), ("MM", "%m"), ("DD", "%d"),
+    ("HH24", "%H"), ("MI", "%M"), ("SS", "%S"),
+]
+
+
+def _oracle_to_strftime(fmt):
+    fmt = (fmt or "YYYY-MM-DD").upper()
+    for oracle_fmt, py_fmt in _DATE_FORMATS:
+        fmt = fmt.replace(oracle_fmt, py_fmt)
+    return fmt
+
+
+def _parse_date(value):
+    if value is None or isinstance(value, (date, datetime)):
+        return value
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d-%b-%Y"):
+        try:
+            return datetime.strptime(str(value), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _sqlite_to_char(value, fmt=None):
+    parsed = _parse_date(value)
+    if parsed is None:
+        return None if value is None else str(value)
+    return parsed.strftime(_oracle_to_strftime(fmt))
+
+
+def _sqlite_trunc(value, fmt=None):
+    parsed = _parse_date(value)
+    if parsed is None:
+        return None
+    return datetime(parsed.year, parsed.month, parsed.day).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _sqlite_add_months(value, months):
+    parsed = _parse_date(value)
+    if parsed is None or months is None:
+        return None
+    month_index = parsed.year * 12 + parsed.month - 1 + int(months)
+    year, month = divmod(month_index, 12)
+    day = min(parsed.day, calendar.monthrange(year, month + 1)[1])
+    return parsed.replace(year=year, month=month + 1, day=day).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _sqlite_months_between(later, earlier):
+    a, b = _parse_date(later), _parse_date(earlier)
+    if a is None or b is None:
+        return None
+    return (a.year - b.year) * 12 + (a.month - b.month) + (a.day - b.day) / 31
+
+
+def _sqlite_floor(value):
+    return None if value is None else math.floor(value)
+
+
+def _sqlite_ceil(value):
+    return None if value is None else math.ceil(value)
+
+
+def _sqlite_to_date(value, fmt=None):
+    if value is None:
+        return None
+    parsed = datetime.strptime(str(value), _oracle_to_strftime(fmt))
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SQLiteCursor:
+    """Cursor wrapper accepting the oracledb calling conventions."""
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._prepared = None
+        self.prefetchrows = 2
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    @staticmethod
+    def _translate(sql):
+        for pattern, replacement in _SQLITE_REWRITES:
+            sql = pattern.sub(replacement, sql)
+        return sql
+
+    def execute(self, statement, parameters=None, **kwargs):
+        if statement is None:
+            statement = self._prepared
+        params = dict(parameters or {}, **kwargs) if isinstance(parameters, (dict, type(None))) else parameters
+        self._cursor.execute(self._translate(statement), params if params is not None else ())
+        return self
+
+    def executemany(self, statement, parameters, batcherrors=False, **kwargs):
+        self._cursor.executemany(self._translate(statement), parameters)
+        return self
+
+    def getbatcherrors(self):
+        return []
+
+    def prepare(self, statement):
+        self._prepared = statement
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Connection wrapper whose ``close()`` returns it to its stand-in pool."""
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def cursor(self):
+        return SQLiteCursor(self._raw.cursor())
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def begin(self):
+        pass
+
+    def ping(self):
+        self._raw.execute("SELECT 1")
+
+    def cancel(self):
+        self._raw.interrupt()
+
+    def close(self):
+        if self._raw is not None:
+            self._pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLitePool:
+    """Minimal pool with the same surface as ``oracledb.ConnectionPool``."""
+    def __init__(self, path=None, max_size=POOL_MAX):
+        self.uri = path is None
+        self.path = path or f"file:hospital_standin_{id(self)}?mode=memory&cache=shared"
+        self.max = max_size
+        self._idle = []
+        self._busy = 0
+        self._lock = threading.Condition()
+        # Keeps a shared in-memory database alive between acquires.
+        self._anchor = self._open()
+
+    def _open(self):
+        raw = sqlite3.connect(self.path, uri=self.uri, check_same_thread=False, timeout=30)
+        raw.create_function("TO_CHAR", -1, _sqlite_to_char)
+        raw.create_function("TO_DATE", -1, _sqlite_to_date)
+        raw.create_function("TRUNC", -1, _sqlite_trunc)
+        raw.create_function("ADD_MONTHS", 2, _sqlite_add_months)
+        raw.create_function("MONTHS_BETWEEN", 2, _sqlite_months_between)
+        raw.create_function("FLOOR", 1, _sqlite_floor)
+        raw.create_function("CEIL", 1, _sqlite_ceil)
+        return raw
+
+    @property
+    def opened(self):
+        return len(self._idle) + self._busy
+
+    @property
+    def busy(self):
+        return self._busy
+
+    def acquire(self):
+        with self._lock:
+            deadline = time.monotonic() + POOL_WAIT_TIMEOUT / 1000
+            while not self._idle and self._busy >= self.max:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError("timed out waiting for a pooled session")
+                self._lock.wait(remaining)
+            raw = self._idle.pop() if self._idle else self._open()
+            self._busy += 1
+        return SQLiteConnection(self, raw)
+
+    def release(self, connection):
+        raw, connection._raw = connection._raw, None
+        if raw is None:
+            return
+        raw.rollback()
+        with self._lock:
+            self._busy -= 1
+            self._idle.append(raw)
+            self._lock.notify()
+
+    def close(self, force=False):
+        with self._lock:
+            for raw in self._idle:
+                raw.close()
+            self._idle.clear()
+            if self._anchor is not None:
+                self._anchor.close()
+                self._anchor = None
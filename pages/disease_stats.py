@@ -0,0 +1,321 @@
+"""Pre-aggregated disease statistics for the dashboard.
+
+Instead of pulling one row per disease x symptom pair, the database returns
+counts grouped by disease, diagnosis day, department, age bucket and
+severity.  The dashboard keeps those cells in a small columnar store and
+derives every chart from them, so it loads thousands of cells rather than
+millions of rows.  Counts match the old row-level DataFrame: a cell's
+``cases`` is the number of joined rows it stands for.
+
+``FilterCube`` memoizes one slice per (period, department, disease) filter
+combination with LRU eviction; each slice memoizes the aggregates derived
+from it, so flipping back to a filter already seen is a dictionary lookup.
+"""
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timedelta
+from functools import wraps
+
+SEVERITY_ORDER = ['Mild', 'Moderate', 'Severe', 'Critical']
+AGE_LABELS = ['0-10', '11-20', '21-30', '31-40', '41-50',
+              '51-60', '61-70', '71-80', '81-90', '91-100']
+
+# Days covered by each "Time Period" choice; None means no cutoff
+PERIOD_DAYS = {
+    "Last Week": 7,
+    "Last Month": 30,
+    "Last Quarter": 90,
+    "Last Year": 365,
+    "All Time": None,
+}
+
+CUBE_SIZE = 64  # filter combinations kept by FilterCube
+
+AGGREGATE_QUERY = """
+SELECT
+    d.disease_name,
+    TO_CHAR(TRUNC(d.diagnosis_date), 'YYYY-MM-DD') AS diagnosis_day,
+    p.department,
+    CASE
+        WHEN FLOOR(MONTHS_BETWEEN(SYSDATE, p.birth_date) / 12) BETWEEN 1 AND 100
+        THEN CEIL(FLOOR(MONTHS_BETWEEN(SYSDATE, p.birth_date) / 12) / 10)
+    END AS age_bucket,
+    s.severity,
+    COUNT(*) AS cases,
+    SUM(FLOOR(MONTHS_BETWEEN(SYSDATE, p.birth_date) / 12)) AS age_sum,
+    COUNT(p.birth_date) AS age_count
+FROM
+    patient p
+JOIN
+    disease d ON p.patient_id = d.patient_id
+JOIN
+    symptoms s ON p.patient_id = s.patient_id
+WHERE
+    d.diagnosis_date >= {since}
+GROUP BY
+    d.disease_name,
+    TRUNC(d.diagnosis_date),
+    p.department,
+    CASE
+        WHEN FLOOR(MONTHS_BETWEEN(SYSDATE, p.birth_date) / 12) BETWEEN 1 AND 100
+        THEN CEIL(FLOOR(MONTHS_BETWEEN(SYSDATE, p.birth_date) / 12) / 10)
+    END,
+    s.severity
+"""
+
+
+def fetch_disease_stats(connection, since_day=None):
+    """Aggregated cells for the last 12 months, or from ``since_day`` on (worker thread)."""
+    cursor = connection.cursor()
+    try:
+        cursor.arraysize = 2000
+        if since_day is None:
+            query = AGGREGATE_QUERY.format(since="ADD_MONTHS(TRUNC(SYSDATE), -12)")  # Last 12 months of data
+            cursor.execute(query)
+        else:
+            query = AGGREGATE_QUERY.format(since="TO_DATE(:since_day, 'YYYY-MM-DD')")
+            cursor.execute(query, {'since_day': since_day.isoformat()})
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _memoized(method):
+    """Cache a no-argument StatsSlice method on the instance."""
+    @wraps(method)
+    def wrapper(self):
+        try:
+            return self._memo[method.__name__]
+        except KeyError:
+            result = self._memo[method.__name__] = method(self)
+            return result
+    return wrapper
+
+
+def _as_day(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+class DiseaseStats:
+    """Columnar store of aggregated cells (one list per column)."""
+    def __init__(self, rows=()):
+        self.disease = []
+        self.day = []
+        self.department = []
+        self.age_bucket = []   # 1..10 (index into AGE_LABELS + 1) or None
+        self.severity = []
+        self.cases = []
+        self.age_sum = []
+        self.age_count = []
+        self.append(rows)
+
+    def __len__(self):
+        return len(self.cases)
+
+    @property
+    def empty(self):
+        return not self.cases
+
+    @property
+    def last_day(self):
+        return max(self.day) if self.day else None
+
+    def merge(self, rows, since_day):
+        """Replace every cell from ``since_day`` on with freshly fetched ``rows``.
+
+        Replaced cells are zeroed rather than removed so indices held by
+        cached slices stay valid.  Returns the (department, disease) pairs
+        whose counts may have changed.
+        """
+        affected = set()
+        for i in range(len(self.cases)):
+            if self.day[i] >= since_day and self.cases[i]:
+                affected.add((self.department[i], self.disease[i]))
+                self.cases[i] = 0
+                self.age_sum[i] = 0.0
+                self.age_count[i] = 0
+        first_new = len(self.cases)
+        self.append(rows)
+        for i in range(first_new, len(self.cases)):
+            affected.add((self.department[i], self.disease[i]))
+        return affected
+
+    def append(self, rows):
+        for disease, day, department, bucket, severity, cases, age_sum, age_count in rows:
+            self.disease.append(disease)
+            self.day.append(_as_day(day))
+            self.department.append(department)
+            self.age_bucket.append(int(bucket) if bucket is not None else None)
+            self.severity.append(severity)
+            self.cases.append(int(cases))
+            self.age_sum.append(float(age_sum or 0))
+            self.age_count.append(int(age_count or 0))
+
+    def total_cases(self):
+        return sum(self.cases)
+
+    def select(self, days=None, department=None, disease=None, today=None):
+        """Slice of the cells matching the filters (empty strings/None mean 'all')."""
+        cutoff = None
+        if days:
+            cutoff = (today or date.today()) - timedelta(days=days)
+        indices = [
+            i for i in range(len(self.cases))
+            if self.cases[i]
+            and (not department or self.department[i] == department)
+            and (not disease or self.disease[i] == disease)
+            and (cutoff is None or self.day[i] >= cutoff)
+        ]
+        return StatsSlice(self, indices)
+
+
+class StatsSlice:
+    """The cells selected by one filter combination, with chart-ready aggregates."""
+    def __init__(self, stats, indices):
+        self.stats = stats
+        self.indices = indices
+        self._memo = {}
+
+    @property
+    def empty(self):
+        return not self.indices
+
+    def _count_by(self, column):
+        counts = Counter()
+        cases = self.stats.cases
+        for i in self.indices:
+            counts[column[i]] += cases[i]
+        return counts
+
+    # ---------------- summary cards ----------------
+    @_memoized
+    def total_cases(self):
+        cases = self.stats.cases
+        return sum(cases[i] for i in self.indices)
+
+    @_memoized
+    def critical_cases(self):
+        return self._count_by(self.stats.severity).get('Critical', 0)
+
+    @_memoized
+    def average_age(self):
+        """Mean age over the selected rows, or NaN when there are none."""
+        age_sum = sum(self.stats.age_sum[i] for i in self.indices)
+        age_count = sum(self.stats.age_count[i] for i in self.indices)
+        return age_sum / age_count if age_count else float('nan')
+
+    @_memoized
+    def most_common_disease(self):
+        counts = self.disease_counts()
+        return counts.most_common(1)[0][0] if counts else None
+
+    # ---------------- charts ----------------
+    @_memoized
+    def disease_counts(self):
+        return self._count_by(self.stats.disease)
+
+    @_memoized
+    def weekly_counts(self):
+        """[((iso_year, iso_week), cases)] in chronological order."""
+        weeks = Counter()
+        day, cases = self.stats.day, self.stats.cases
+        for i in self.indices:
+            iso = day[i].isocalendar()
+            weeks[(iso[0], iso[1])] += cases[i]
+        return sorted(weeks.items())
+
+    @_memoized
+    def age_group_counts(self):
+        """Cases per AGE_LABELS bucket, in label order."""
+        counts = self._count_by(self.stats.age_bucket)
+        return [counts.get(bucket, 0) for bucket in range(1, len(AGE_LABELS) + 1)]
+
+    @_memoized
+    def department_counts(self):
+        return self._count_by(self.stats.department)
+
+    @_memoized
+    def severity_counts(self):
+        """Cases per SEVERITY_ORDER level, in that order."""
+        counts = self._count_by(self.stats.severity)
+        return [counts.get(severity, 0) for severity in SEVERITY_ORDER]
+
+    def severity_share_by_disease(self, top=5):
+        """(top diseases, {severity: [percent per disease]})."""
+        key = ('severity_share_by_disease', top)
+        if key not in self._memo:
+            self._memo[key] = self._severity_share_by_disease(top)
+        return self._memo[key]
+
+    def _severity_share_by_disease(self, top):
+        top_diseases = [name for name, _ in self.disease_counts().most_common(top)]
+        per_disease = {name: Counter() for name in top_diseases}
+        stats = self.stats
+        for i in self.indices:
+            counter = per_disease.get(stats.disease[i])
+            if counter is not None:
+                counter[stats.severity[i]] += stats.cases[i]
+        shares = {}
+        for severity in SEVERITY_ORDER:
+            shares[severity] = [
+                100.0 * per_disease[name][severity] / sum(per_disease[name].values())
+                for name in top_diseases
+            ]
+        return top_diseases, shares
+
+
+class FilterCube:
+    """LRU cache of StatsSlices keyed by (period, department, disease)."""
+    def __init__(self, stats=None, max_entries=CUBE_SIZE):
+        self.stats = stats if stats is not None else DiseaseStats()
+        self.max_entries = max_entries
+        self._slices = OrderedDict()
+        self._day = date.today()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._slices)
+
+    def get(self, period, department="", disease=""):
+        """Slice for a filter combination, computed on first use."""
+        today = date.today()
+        if today != self._day:
+            # Period windows moved; every cached slice is stale
+            self._slices.clear()
+            self._day = today
+        key = (period, department or "", disease or "")
+        selection = self._slices.get(key)
+        if selection is not None:
+            self._slices.move_to_end(key)
+            self.hits += 1
+            return selection
+        self.misses += 1
+        selection = self.stats.select(PERIOD_DAYS.get(period), department, disease, today=today)
+        self._slices[key] = selection
+        if len(self._slices) > self.max_entries:
+            self._slices.popitem(last=False)
+        return selection
+
+    def reset(self, stats):
+        """Start over with a newly loaded store."""
+        self.stats = stats
+        self._slices.clear()
+
+    def merge(self, rows, since_day):
+        """Merge an incremental batch and drop only the slices it affects.
+
+        A batch only touches recent days, which every period window
+        includes, so a slice is affected when its department and disease
+        filters match any changed (department, disease) pair.
+        """
+        affected = self.stats.merge(rows, since_day)
+        for key in list(self._slices):
+            _, department, disease = key
+            if any((not department or department == dept) and (not disease or disease == name)
+                   for dept, name in affected):
+                del self._slices[key]
+        return affected
@@ -1,5 +1,7 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 
+from pages import image_service
+
 class AnimatedButton(QtWidgets.QPushButton):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -36,11 +38,11 @@ class AnimatedButton(QtWidgets.QPushButton):
 class BackgroundImageFrame(QtWidgets.QFrame):
     def __init__(self, parent=None, background_image=None):
         super().__init__(parent)
-        self.background_image = background_image
+        self.background_image = background_image  # path of the image, scaled by image_service
         self.parent_widget = parent
         
-    def setBackgroundImage(self, pixmap):
-        self.background_image = pixmap
+    def setBackgroundImage(self, image_path):
+        self.background_image = image_path
         self.update()
         
     def paintEvent(self, event):
@@ -53,20 +55,14 @@ class BackgroundImageFrame(QtWidgets.QFrame):
         path.addRoundedRect(QtCore.QRectF(self.rect()), 20, 20)
         painter.setClipPath(path)
         
-        if self.background_image and not self.background_image.isNull():
-            # Scale the background image to fit the frame nicely
-            scaled_img = self.background_image.scaled(
-                self.size(),
-                QtCore.Qt.KeepAspectRatioByExpanding,
-                QtCore.Qt.SmoothTransformation
-            )
-            
-            # Center the image within frame
-            pos_x = (self.width() - scaled_img.width()) // 2
-            pos_y = (self.height() - scaled_img.height()) // 2
-            
-            # Draw the background image
-            painter.drawPixmap(pos_x, pos_y, scaled_img)
+        # Cached variant of the image at this size (scaled off the GUI thread)
+        scaled_img = None
+        if self.background_image:
+            scaled_img = image_service.scaled_pixmap(
+                self.background_image, self.size(), self.devicePixelRatioF(), on_ready=self.update)
+        if scaled_img is not None:
+            # Draw the background image centered within the frame
+            image_service.draw_cover(painter, self.rect(), scaled_img)
             
             # Add a subtle overlay for better text visibility
             painter.fillRect(self.rect(), QtGui.QColor(0, 0, 0, 40))
@@ -86,17 +82,16 @@ class ExitPage(QtWidgets.QWidget):
     def __init__(self, stacked_widget, parent=None):
         super().__init__(parent)
         self.stacked_widget = stacked_widget
-        # Load main background
-        self.bg_pixmap = QtGui.QPixmap("resources/hospital-bg5.jpg")
-        if self.bg_pixmap.isNull():
-            print("Warning: Failed to load background image from resources/hospital-bg5.jpg")
+        # Main background (decoded once and scaled by image_service)
+        self.bg_path = "resources/hospital-bg5.jpg"
+        if not image_service.available(self.bg_path):
+            self.bg_path = None
         
-        # Load frame background
-        self.frame_bg_pixmap = QtGui.QPixmap("resources/app2bg.jpg")
-        if self.frame_bg_pixmap.isNull():
-            print("Warning: Failed to load frame background image from resources/app2bg.jpg")
+        # Frame background
+        self.frame_bg_path = "resources/app2bg.jpg"
+        if not image_service.available(self.frame_bg_path):
             # Fall back to main background if frame background fails
-            self.frame_bg_pixmap = self.bg_pixmap
+            self.frame_bg_path = self.bg_path
         
         self.setup_ui()
 
@@ -113,7 +108,7 @@ class ExitPage(QtWidgets.QWidget):
         self.overlay.hide()
 
         # Create the custom frame for the exit box with background image
-        self.frame = BackgroundImageFrame(self, self.frame_bg_pixmap)
+        self.frame = BackgroundImageFrame(self, self.frame_bg_path)
         self.frame.setFixedSize(550, 380)
         
         # Add shadow effect to the frame
@@ -225,17 +220,12 @@ class ExitPage(QtWidgets.QWidget):
         painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, True)
         painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
         
-        if not self.bg_pixmap.isNull():
-            scaled_pixmap = self.bg_pixmap.scaled(
-                self.size(),
-                QtCore.Qt.KeepAspectRatioByExpanding,
-                QtCore.Qt.SmoothTransformation
-            )
-            
-            pos_x = (self.width() - scaled_pixmap.width()) // 2 if scaled_pixmap.width() > self.width() else 0
-            pos_y = (self.height() - scaled_pixmap.height()) // 2 if scaled_pixmap.height() > self.height() else 0
-            
-            painter.drawPixmap(pos_x, pos_y, scaled_pixmap)
+        scaled_pixmap = None
+        if self.bg_path:
+            scaled_pixmap = image_service.scaled_pixmap(
+                self.bg_path, self.size(), self.devicePixelRatioF(), on_ready=self.update)
+        if scaled_pixmap is not None:
+            image_service.draw_cover(painter, self.rect(), scaled_pixmap)
             
             # Add a subtle gradient overlay
             gradient = QtGui.QLinearGradient(0, 0, 0, self.height())
@@ -1,12 +1,52 @@
 import sys
 import time
 from PyQt5 import QtWidgets, QtGui, QtCore
-import oracledb
 
-# New Imports for workspace widgets
-from .patient import PatientWidget
-from .dashboard import DiseaseStatsDashboard  # Import DiseaseStatsDashboard from its module
-from .workerTiming import WorkerTimingSpace  # Import WorkerTimingSpace from its module
+from . import auth, image_service
+from .preloader import Preloader
+from .query_executor import describe_error, executor
+# Workspace widgets (and the numpy/pyqtgraph/QtChart/matplotlib stacks behind
+# them) are imported on demand; see pages/startup.py
+from .startup import WORKSPACES
+from .workspace_cache import workspace_cache
+
+
+def register_employee(connection, worker_id, password, full_name, role, phone):
+    """Insert a new employee; returns False if the worker ID is taken."""
+    cursor = connection.cursor()
+    try:
+        # Check for existing worker_id
+        check_query = """
+            SELECT COUNT(*) FROM employees
+            WHERE worker_id = :worker_id
+        """
+        cursor.execute(check_query, {"worker_id": worker_id})
+        if cursor.fetchone()[0] > 0:
+            return False
+
+        # Fail clearly on a schema not yet widened for hashes (see pages/auth.py)
+        auth.check_password_column(connection)
+
+        # Insert the new employee record
+        insert_query = """
+            INSERT INTO employees
+            (worker_id, password, full_name, role, phone_number)
+            VALUES
+            (:worker_id, :password, :full_name, :role, :phone)
+        """
+        cursor.execute(insert_query, {
+            "worker_id": worker_id,
+            "password": auth.hash_password(password),
+            "full_name": full_name,
+            "role": role,
+            "phone": phone
+        })
+        connection.commit()
+        # An attempt made before the account existed must not block the first login
+        auth.forget_failures(worker_id)
+        return True
+    finally:
+        cursor.close()
 
 
 # ------------------------- HomePage (Login Window) -------------------------
@@ -15,6 +55,7 @@ class HomePage(QtWidgets.QWidget):
         super().__init__(parent)
         self.main_window = main_window
         self.is_signup_mode = False
+        self.login_timings = {}  # stage -> time.perf_counter() of the last sign-in
         self.setup_ui()
         # Start with animation
         self.animate_login_appearance()
@@ -688,85 +729,52 @@ class HomePage(QtWidgets.QWidget):
         self.signup_button.setText("Registering...")
         self.signup_button.setEnabled(False)
 
-        # Simulate processing delay before actual DB logic
-        QtCore.QTimer.singleShot(
-            800,
-            lambda: self.process_signup(worker_id, password, full_name, role, phone)
-        )
+        # The insert runs in the background while the button shows its loading state
+        self.process_signup(worker_id, password, full_name, role, phone)
 
 
     # ------------------------- Process Signup -------------------------
     def process_signup(self, worker_id, password, full_name, role, phone):
-        """Perform the actual signup database insertion."""
-        try:
-            connection = oracledb.connect(
-                # user="system",
-                # password="Abdo2004@",
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
+        """Run the signup database insertion in the background."""
+        executor().submit(
+            lambda connection: register_employee(connection, worker_id, password, full_name, role, phone),
+            self.finish_signup,
+            self.signup_failed,
+            owner=self,
+            busy=False,
+        )
 
-            # Check for existing worker_id
-            check_query = """
-                SELECT COUNT(*) FROM employees
-                WHERE worker_id = :worker_id
-            """
-            cursor.execute(check_query, {"worker_id": worker_id})
-            exists = cursor.fetchone()[0] > 0
-
-            if exists:
-                self.display_message("Worker ID already exists!", False)
-                self.shake_animation(self.login_frame)
-                self.signup_button.setText("Register")
-                self.signup_button.setEnabled(True)
-                # Scroll to show the error
-                QtCore.QTimer.singleShot(
-                    50,
-                    lambda: self.scroll_area.verticalScrollBar().setValue(
-                        self.scroll_area.verticalScrollBar().maximum()
-                    )
-                )
-                return
-
-            # Insert the new employee record
-            insert_query = """
-                INSERT INTO employees
-                (worker_id, password, full_name, role, phone_number)
-                VALUES
-                (:worker_id, :password, :full_name, :role, :phone)
-            """
-            cursor.execute(insert_query, {
-                "worker_id": worker_id,
-                "password": password,
-                "full_name": full_name,
-                "role": role,
-                "phone": phone
-            })
-            connection.commit()
-
-            # Success feedback
-            self.display_message("Account created successfully!", True)
-
-            # After a short delay, switch back to login mode
-            QtCore.QTimer.singleShot(1500, self.toggle_signup_mode)
-
-        except oracledb.DatabaseError as e:
-            # Handle database errors gracefully
-            self.display_message(f"Database Error: {str(e)}", False)
+    def finish_signup(self, created):
+        """Report the signup outcome on the GUI thread."""
+        # Restore signup button state
+        self.signup_button.setText("Register")
+        self.signup_button.setEnabled(True)
+
+        if not created:
+            self.display_message("Worker ID already exists!", False)
             self.shake_animation(self.login_frame)
-        finally:
-            # Restore signup button state
-            self.signup_button.setText("Register")
-            self.signup_button.setEnabled(True)
-            # Clean up DB resources
-            try:
-                cursor.close()
-                connection.close()
-            except:
-                pass
+            # Scroll to show the error
+            QtCore.QTimer.singleShot(
+                50,
+                lambda: self.scroll_area.verticalScrollBar().setValue(
+                    self.scroll_area.verticalScrollBar().maximum()
+                )
+            )
+            return
+
+        # Switch back to login mode right away, keeping the success feedback visible
+        self.toggle_signup_mode()
+        self.display_message("Account created successfully!", True)
+
+    def signup_failed(self, error):
+        # Handle database errors gracefully
+        if isinstance(error, auth.PasswordColumnTooNarrow):
+            self.display_message(str(error), False)
+        else:
+            self.display_message(f"Database Error: {describe_error(error)}", False)
+        self.shake_animation(self.login_frame)
+        self.signup_button.setText("Register")
+        self.signup_button.setEnabled(True)
 
 
     # ------------------------- Login Handling -------------------------
@@ -785,131 +793,93 @@ class HomePage(QtWidgets.QWidget):
             self.shake_animation(self.login_frame)
             return
 
-        # Show loading state
+        # Show loading state while the credentials are checked in the background
+        self.login_timings = {"click": time.perf_counter()}
         self.login_button.setText("Signing In...")
         self.login_button.setEnabled(False)
-
-        # Simulate processing delay before actual login logic
-        QtCore.QTimer.singleShot(800, lambda: self.process_login(worker_id, password))
+        self.process_login(worker_id, password)
 
 
     # ------------------------- Process Login -------------------------
     def process_login(self, worker_id, password):
-        """Perform the actual login verification against the database."""
-        try:
-            connection = oracledb.connect(
-                # user="system",
-                # password="Abdo2004@",
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
+        """Check the credentials in the background (the hash is deliberately slow)."""
+        executor().submit(
+            lambda connection: auth.authenticate(connection, worker_id, password),
+            lambda result: self.finish_login(result, worker_id),
+            self.login_failed,
+            owner=self,
+            busy=False,
+        )
 
-            # Fetch stored credentials
-            query = """
-                SELECT full_name, role, password
-                FROM employees
-                WHERE worker_id = :worker_id
-            """
-            cursor.execute(query, {"worker_id": worker_id})
-            result = cursor.fetchone()
-
-            # Verify credentials
-            if result and result[2] == password:
-                full_name, role = result[0], result[1]
-                print("Login successful, proceeding to main")
-                # Show success message
-                self.display_message(f"Welcome back, {full_name}!", True)
-
-                # Update login button style to success
-                self.login_button.setText("Success!")
-                self.login_button.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(
-                            x1:0, y1:0, x2:1, y2:0,
-                            stop:0 #2e7d32, stop:1 #4caf50
-                        );
-                        color: white;
-                        border-radius: 25px;
-                        border: none;
-                    }
-                """)
-
-                # Proceed to main UI after a brief pause
-                QtCore.QTimer.singleShot(
-                    1000,
-                    lambda: self.proceed_to_main(worker_id, full_name, role)
-                )
-            else:
-                # Invalid credentials feedback
-                self.display_message("Invalid Worker ID or Password", False)
-                self.shake_animation(self.login_frame)
-
-                # Restore login button
-                self.login_button.setText("Sign In")
-                self.login_button.setEnabled(True)
-                self.login_button.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(
-                            x1:0, y1:0, x2:1, y2:0,
-                            stop:0 #303f9f, stop:1 #3f51b5
-                        );
-                        color: white;
-                        border-radius: 25px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background: qlineargradient(
-                            x1:0, y1:0, x2:1, y2:0,
-                            stop:0 #3949ab, stop:1 #5c6bc0
-                        );
-                    }
-                    QPushButton:pressed {
-                        background: qlineargradient(
-                            x1:0, y1:0, x2:1, y2:0,
-                            stop:0 #283593, stop:1 #3f51b5
-                        );
-                    }
-                """)
-        except oracledb.DatabaseError as e:
-            self.display_message(f"Database Error: {str(e)}", False)
+    def finish_login(self, result, worker_id):
+        """Act on the outcome of auth.authenticate on the GUI thread."""
+        self.login_timings["verified"] = time.perf_counter()
+        if result is not None:
+            full_name, role = result
+            print("Login successful, proceeding to main")
+            # Show success message
+            self.display_message(f"Welcome back, {full_name}!", True)
+
+            # Update login button style to success
+            self.login_button.setText("Success!")
+            self.login_button.setStyleSheet("""
+                QPushButton {
+                    background: qlineargradient(
+                        x1:0, y1:0, x2:1, y2:0,
+                        stop:0 #2e7d32, stop:1 #4caf50
+                    );
+                    color: white;
+                    border-radius: 25px;
+                    border: none;
+                }
+            """)
+
+            # Proceed to main UI straight away; the splash covers the remaining work
+            self.proceed_to_main(worker_id, full_name, role)
+        else:
+            # Invalid credentials feedback
+            self.display_message("Invalid Worker ID or Password", False)
+            self.shake_animation(self.login_frame)
+
+            # Restore login button
             self.login_button.setText("Sign In")
             self.login_button.setEnabled(True)
-        finally:
-            try:
-                cursor.close()
-                connection.close()
-            except:
-                pass
+            self.login_button.setStyleSheet("""
+                QPushButton {
+                    background: qlineargradient(
+                        x1:0, y1:0, x2:1, y2:0,
+                        stop:0 #303f9f, stop:1 #3f51b5
+                    );
+                    color: white;
+                    border-radius: 25px;
+                    border: none;
+                }
+                QPushButton:hover {
+                    background: qlineargradient(
+                        x1:0, y1:0, x2:1, y2:0,
+                        stop:0 #3949ab, stop:1 #5c6bc0
+                    );
+                }
+                QPushButton:pressed {
+                    background: qlineargradient(
+                        x1:0, y1:0, x2:1, y2:0,
+                        stop:0 #283593, stop:1 #3f51b5
+                    );
+                }
+            """)
+
+    def login_failed(self, error):
+        self.display_message(f"Database Error: {describe_error(error)}", False)
+        self.login_button.setText("Sign In")
+        self.login_button.setEnabled(True)
 
 
     # ------------------------- Transition to Main -------------------------
     def proceed_to_main(self, worker_id, full_name, role):
-   
+     """Put up the splash (which runs the preloader) and open the workspace when it is done."""
      print("proceed_to_main called")  # Debug
      if self.main_window:
-        # Store the transition parameters as instance variables
-        self._transition_worker_id = worker_id
-        self._transition_full_name = full_name
-        self._transition_role = role
-        
-        # Create fade animation
-        self.fade_anim = QtCore.QPropertyAnimation(self, b"windowOpacity")
-        self.fade_anim.setDuration(500)
-        self.fade_anim.setStartValue(1.0)
-        self.fade_anim.setEndValue(0.0)
-        
-        # Connect signal using lambda with stored parameters
-        self.fade_anim.finished.connect(
-            lambda: self.show_splash_screen(
-                self._transition_worker_id,
-                self._transition_full_name,
-                self._transition_role
-            )
-        )
-        self.fade_anim.start()
+        self.show_splash_screen(worker_id, full_name, role)
      else:
         print("No main_window reference!")  # Debug
 
@@ -918,20 +888,20 @@ class HomePage(QtWidgets.QWidget):
     def show_splash_screen(self, worker_id, full_name, role):
      print("Attempting to show splash screen")  # Debug
      if self.main_window:
-        print(f"Main window exists: {self.main_window}")  # Debug
         splash = SplashScreen(self.main_window, worker_id, full_name, role)
         self.main_window.addWidget(splash)
         self.main_window.setCurrentWidget(splash)
-        print("Splash screen should be visible now")  # Debug
         
-        QtCore.QTimer.singleShot(2000, 
-            lambda: self.show_workspace(worker_id, full_name, role))
-# in show_splash_screen
+        # Move on as soon as the preloader has finished (no fixed delay)
+        splash.preloader.finished.connect(lambda: self.show_workspace(worker_id, full_name, role, splash))
+        splash.preloader.start()
+
     # ------------------------- Main Workspace -------------------------
-    def show_workspace(self, worker_id, full_name, role):
+    def show_workspace(self, worker_id, full_name, role, splash=None):
         """Load and display the main application workspace."""
+        self.login_timings["preloaded"] = time.perf_counter()
         # remember if there was an active workspace
-        print("Timer fired, showing workspace") 
+        print("Preload finished, showing workspace")
         active_ws = MainWindow.active_workspace
  
         # create the real main window (your workspace)
@@ -944,16 +914,15 @@ class HomePage(QtWidgets.QWidget):
         self.main_window.addWidget(workspace)
         self.main_window.setCurrentWidget(workspace)
 
+        # The splash has done its job; don't leave it in the stack
+        if splash is not None:
+            self.main_window.removeWidget(splash)
+            splash.deleteLater()
+
         # if the user had an active page before, restore it
         if active_ws:
             workspace.handle_workspace_click(None, active_ws)
-
-        # fade it in
-        fade_in = QtCore.QPropertyAnimation(workspace, b"windowOpacity")
-        fade_in.setDuration(500)
-        fade_in.setStartValue(0.0)
-        fade_in.setEndValue(1.0)
-        fade_in.start()
+        self.login_timings["workspace"] = time.perf_counter()
 
 
 # ------------------------- SplashScreen Widget -------------------------
@@ -969,14 +938,11 @@ class SplashScreen(QtWidgets.QWidget):
         self.setWindowFlag(QtCore.Qt.FramelessWindowHint)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
 
-        self.counter = 0
-        self.n = 100  # total progress steps
+        # the progress bar follows the real preload work
+        self.preloader = Preloader(parent=self)
+        self.n = len(self.preloader)  # total progress steps
         self._init_ui()
-
-        # start a timer to drive the progress bar
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._loading_step)
-        self.timer.start(30)
+        self.preloader.progress.connect(self._loading_step)
 
     def _init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -1027,31 +993,11 @@ class SplashScreen(QtWidgets.QWidget):
 
         layout.addWidget(container)
 
-    def _loading_step(self):
-     self.progressBar.setValue(self.counter)
-
-    # update loading text at milestones
-     if self.counter == int(self.n * 0.3):
-        self.labelLoading.setText("loading... [30%]")
-     elif self.counter == int(self.n * 0.6):
-        self.labelLoading.setText("loading... [60%]")
-
-    # once complete, stop the timer (but don't transition - that's handled by show_workspace)
-     if self.counter >= self.n:
-        self.timer.stop()
-        return
-
-     self.counter += 1
+    def _loading_step(self, done, label):
+        self.progressBar.setValue(done)
+        self.labelLoading.setText(f"{label}..." if done < self.n else label)
 
 # ------------------------- MainWindow (Main Application) -------------------------
-import random
-import numpy as np
-import seaborn as sns
-import matplotlib
-matplotlib.use("Qt5Agg")
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-
 class MainWindow(QtWidgets.QWidget):
     active_workspace = None
     def __init__(self, worker_id, full_name, role, main_window=None, parent=None):
@@ -1062,7 +1008,7 @@ class MainWindow(QtWidgets.QWidget):
         self.full_name = full_name
         self.role = role
         self.main_window = main_window  # QStackedWidget reference
-        self.background_pixmap = QtGui.QPixmap("resources/app3bg.jpg")
+        self.background_path = "resources/app3bg.jpg"
         self.setup_ui()
         self.showMaximized()
 
@@ -1163,16 +1109,10 @@ class MainWindow(QtWidgets.QWidget):
         When a workspace card is clicked, load the corresponding widget from its module.
         """
         MainWindow.active_workspace = workspace  # Set the active workspace
-        if workspace == "Patients Space":
-            widget = PatientWidget(self.worker_id, self.full_name, self.role, main_window=self.main_window)
-        elif workspace == "Data Dashboard":
-            widget = DiseaseStatsDashboard(self.worker_id, self.full_name, self.role, main_window=self.main_window)
-        elif workspace == "Worker Timing":
-            widget = WorkerTimingSpace(self.worker_id, self.full_name, self.role, main_window=self.main_window)
-        else:
+        if workspace not in WORKSPACES:
             return
-        self.main_window.addWidget(widget)
-        self.main_window.setCurrentWidget(widget)
+        # Reuse this worker's instance if it is still alive; it refreshes itself when stale
+        workspace_cache().open(workspace, self.main_window, self.worker_id, self.full_name, self.role)
 
     def logout(self):
     # Reset the login page before switching back
@@ -1203,6 +1143,10 @@ class MainWindow(QtWidgets.QWidget):
         
     # Return to the authentication page
      self.main_window.setCurrentIndex(0)
+    # Close this worker's workspaces and this window so they are not left in the stack
+     workspace_cache().evict_worker(self.worker_id)
+     self.main_window.removeWidget(self)
+     self.deleteLater()
 
     def create_user_info_card(self, worker_id, full_name, role):
         card = QtWidgets.QFrame(self)
@@ -1243,6 +1187,14 @@ class MainWindow(QtWidgets.QWidget):
         return card
 
     def create_activity_diagram(self):
+        # Imported here so the login page does not pay for matplotlib/seaborn
+        import numpy as np
+        import seaborn as sns
+        import matplotlib
+        matplotlib.use("Qt5Agg")
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
         sns.set_style("whitegrid")
         fig = Figure(figsize=(7, 4))
         ax = fig.add_subplot(111)
@@ -1315,9 +1267,13 @@ class MainWindow(QtWidgets.QWidget):
         return card
 
     def paintEvent(self, event):
-        painter = QtGui.QPainter(self)
-        if not self.background_pixmap.isNull():
-            painter.drawPixmap(self.rect(), self.background_pixmap)
+        # Blit a cached variant at the window size instead of stretching the full image
+        pixmap = image_service.scaled_pixmap(
+            self.background_path, self.size(), self.devicePixelRatioF(),
+            QtCore.Qt.IgnoreAspectRatio, on_ready=self.update)
+        if pixmap is not None:
+            painter = QtGui.QPainter(self)
+            painter.drawPixmap(self.rect(), pixmap)
         else:
             super().paintEvent(event)
 
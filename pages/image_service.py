@@ -0,0 +1,139 @@
+"""Decoded and pre-scaled images for background paints.
+
+Each image file is decoded once into a ``QImage``.  Scaled variants are
+produced off the GUI thread (``QImage.scaled`` is thread-safe, ``QPixmap``
+is not), converted to pixmaps on the GUI thread and kept in
+``QPixmapCache`` under a (path, size, device-pixel-ratio, mode) key within
+``CACHE_LIMIT_KB``.  Paint and resize handlers therefore only blit a
+cached pixmap.
+
+While a new size is being scaled, ``scaled_pixmap`` returns the last
+variant of the same image so the caller can stretch it for a frame or
+two.  Requests for one image are coalesced: during a drag-resize only the
+latest size is scaled once the running job finishes.
+"""
+import threading
+
+from PyQt5 import QtCore, QtGui
+
+from pages.query_executor import executor
+
+CACHE_LIMIT_KB = 48 * 1024  # byte budget for scaled pixmaps
+
+_images = {}                # path -> full-resolution QImage
+_images_lock = threading.Lock()
+_latest = {}                # (path, mode) -> cache key of the newest variant
+_running = set()            # (path, mode, dpr) groups with a scaling job in flight
+_queued = {}                # (path, mode, dpr) -> (key, width, height) waiting for the running job
+_callbacks = {}             # (path, mode, dpr) -> callables to run when a variant lands
+_configured = False
+
+
+def original(path):
+    """Full-resolution QImage for ``path``, decoded on first use (any thread)."""
+    with _images_lock:
+        image = _images.get(path)
+        if image is None:
+            image = _images[path] = QtGui.QImage(path)
+            if image.isNull():
+                print(f"Warning: Failed to load image from {path}")
+        return image
+
+
+def available(path):
+    """Whether ``path`` is a readable image; checks the header only, without decoding."""
+    if QtGui.QImageReader(path).canRead():
+        return True
+    print(f"Warning: Failed to load image from {path}")
+    return False
+
+
+def _find(key):
+    pixmap = QtGui.QPixmapCache.find(key)
+    return pixmap if pixmap is not None and not pixmap.isNull() else None
+
+
+def scaled_pixmap(path, size, device_pixel_ratio=1.0, mode=QtCore.Qt.KeepAspectRatioByExpanding,
+                  on_ready=None):
+    """``path`` scaled to ``size`` (logical pixels), or a stand-in while it is being scaled.
+
+    Returns the cached pixmap when there is one.  Otherwise scaling starts
+    in the background, ``on_ready()`` is called on the GUI thread when it
+    is done, and the newest other variant of the image (or None) is returned.
+    """
+    global _configured
+    if not _configured:
+        QtGui.QPixmapCache.setCacheLimit(CACHE_LIMIT_KB)
+        _configured = True
+
+    width = max(1, round(size.width() * device_pixel_ratio))
+    height = max(1, round(size.height() * device_pixel_ratio))
+    key = f"{path}|{width}x{height}|{device_pixel_ratio}|{int(mode)}"
+    pixmap = _find(key)
+    if pixmap is not None:
+        return pixmap
+
+    group = (path, int(mode), device_pixel_ratio)
+    callbacks = _callbacks.setdefault(group, [])
+    if on_ready is not None and on_ready not in callbacks:
+        callbacks.append(on_ready)
+    if group in _running:
+        _queued[group] = (key, width, height)
+    else:
+        _start(group, key, width, height)
+    latest = _latest.get((path, int(mode)))
+    return _find(latest) if latest else None
+
+
+def _start(group, key, width, height):
+    path, mode, dpr = group
+    _running.add(group)
+    executor().submit(
+        lambda: original(path).scaled(width, height, QtCore.Qt.AspectRatioMode(mode),
+                                      QtCore.Qt.SmoothTransformation),
+        lambda image: _scaled(group, key, image),
+        lambda error: _failed(group, error),
+        busy=False, needs_connection=False,
+    )
+
+
+def _scaled(group, key, image):
+    path, mode, dpr = group
+    if not image.isNull():
+        pixmap = QtGui.QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        QtGui.QPixmapCache.insert(key, pixmap)
+        _latest[(path, mode)] = key
+    _next(group)
+    for callback in _callbacks.pop(group, ()):
+        try:
+            callback()
+        except RuntimeError:
+            pass  # the widget that asked was deleted in the meantime
+
+
+def _failed(group, error):
+    print(f"Error scaling {group[0]}: {error}")
+    _callbacks.pop(group, None)
+    _next(group)
+
+
+def _next(group):
+    _running.discard(group)
+    queued = _queued.pop(group, None)
+    if queued is not None and _find(queued[0]) is None:
+        _start(group, *queued)
+
+
+def draw_cover(painter, rect, pixmap):
+    """Draw ``pixmap`` centered over ``rect``, cropping whatever overflows."""
+    dpr = pixmap.devicePixelRatio()
+    width, height = pixmap.width() / dpr, pixmap.height() / dpr
+    scale = max(rect.width() / width, rect.height() / height)
+    if abs(scale - 1.0) < 0.01:
+        target = QtCore.QRectF(0, 0, width, height)
+    else:
+        # A stand-in of another size: stretch it until the exact variant lands
+        target = QtCore.QRectF(0, 0, width * scale, height * scale)
+    target.moveCenter(QtCore.QRectF(rect).center())
+    painter.drawPixmap(target, pixmap, QtCore.QRectF(pixmap.rect()))
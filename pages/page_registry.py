@@ -0,0 +1,95 @@
+"""On-demand construction of the sidebar pages.
+
+Every page gets a cheap placeholder at its fixed index in the stacked
+widget, so index-based navigation (``setCurrentIndex(0)`` on logout, the
+exit page's "back", ...) keeps working.  The real page is built the first
+time its index becomes current and swapped in for the placeholder.
+``prebuild_when_idle`` builds the remaining pages one per event-loop
+pass after the first paint.  Construction time of each page is kept in
+``timings``.
+"""
+import time
+
+from PyQt5 import QtCore, QtWidgets
+
+
+class PageRegistry(QtCore.QObject):
+    """Owns the fixed pages of a QStackedWidget and builds them lazily."""
+    def __init__(self, stacked, parent=None):
+        super().__init__(parent)
+        self.stacked = stacked
+        self._names = []          # index -> page name
+        self._factories = {}      # name -> callable returning the page widget
+        self._pages = {}          # name -> built page
+        self._placeholders = {}   # name -> placeholder still in the stack
+        self._idle_queue = []
+        self.timings = {}         # name -> seconds spent constructing the page
+        stacked.currentChanged.connect(self._on_current_changed)
+
+    def register(self, name, factory):
+        """Reserve the next index for a page built by ``factory()``; returns the index."""
+        placeholder = QtWidgets.QWidget()
+        index = self.stacked.addWidget(placeholder)
+        self._names.append(name)
+        self._factories[name] = factory
+        self._placeholders[name] = placeholder
+        return index
+
+    def index_of(self, name):
+        return self._names.index(name)
+
+    def is_built(self, name):
+        return name in self._pages
+
+    def page(self, name):
+        """The page widget, constructing it now if needed."""
+        if name not in self._pages:
+            self._build(name)
+        return self._pages[name]
+
+    def show(self, name):
+        self.page(name)
+        self.stacked.setCurrentIndex(self.index_of(name))
+
+    def _build(self, name):
+        index = self.index_of(name)
+        start = time.perf_counter()
+        page = self._factories[name]()
+        self.timings[name] = time.perf_counter() - start
+        self._pages[name] = page
+
+        placeholder = self._placeholders.pop(name)
+        was_current = self.stacked.currentWidget() is placeholder
+        self.stacked.insertWidget(index, page)
+        if was_current:
+            self.stacked.setCurrentIndex(index)
+        self.stacked.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+    def _on_current_changed(self, index):
+        # Direct setCurrentIndex() calls land on the placeholder: build the page
+        if 0 <= index < len(self._names):
+            name = self._names[index]
+            if name not in self._pages and self.stacked.widget(index) is self._placeholders.get(name):
+                self._build(name)
+
+    def prebuild_when_idle(self, names=None):
+        """Build the pages not yet built, one per event-loop pass."""
+        self._idle_queue = [n for n in (names or self._names) if n not in self._pages]
+        QtCore.QTimer.singleShot(0, self._build_next_idle)
+
+    def _build_next_idle(self):
+        while self._idle_queue:
+            name = self._idle_queue.pop(0)
+            if name not in self._pages:
+                self._build(name)
+                break
+        if self._idle_queue:
+            QtCore.QTimer.singleShot(0, self._build_next_idle)
+
+    def construction_report(self):
+        """'name: ms' lines for every page built so far, slowest first."""
+        return "\n".join(
+            f"{name}: {seconds * 1000:.1f} ms"
+            for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1])
+        )
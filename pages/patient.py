@@ -1,8 +1,13 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
-import oracledb
 import os
 import sys
 
+from pages import database, image_service, patient_store
+from pages.admission_client import admission_client
+from pages.query_executor import describe_error, executor
+from pages.patient_model import PatientFilterProxy, PatientTableModel
+from pages.patient_search import search_index
+
 class PatientDetailsFrame(QtWidgets.QFrame):
     """Frame for displaying detailed patient information with a clean, modern design."""
     def __init__(self, patient_data=None, parent=None):
@@ -304,13 +309,13 @@ class PatientDetailsFrame(QtWidgets.QFrame):
         self.bg_label = QtWidgets.QLabel(self)
         self.bg_label.setGeometry(0, 0, self.width(), self.height())
         
-        # Load and set the image
-        pixmap = QtGui.QPixmap(image_path)
-        self.bg_label.setPixmap(pixmap.scaled(
-            self.width(), self.height(),
-            QtCore.Qt.KeepAspectRatioByExpanding,
-            QtCore.Qt.SmoothTransformation
-        ))
+        # Show a cached variant of the image at the frame's size (scaled off the GUI thread)
+        def update_background():
+            pixmap = image_service.scaled_pixmap(
+                image_path, self.size(), self.devicePixelRatioF(), on_ready=update_background)
+            if pixmap is not None:
+                self.bg_label.setPixmap(pixmap)
+        update_background()
         
         # Make sure the background stays behind other widgets
         self.bg_label.lower()
@@ -327,11 +332,7 @@ class PatientDetailsFrame(QtWidgets.QFrame):
         def new_resize_event(event):
             # Update background size
             self.bg_label.setGeometry(0, 0, self.width(), self.height())
-            self.bg_label.setPixmap(pixmap.scaled(
-                self.width(), self.height(),
-                QtCore.Qt.KeepAspectRatioByExpanding,
-                QtCore.Qt.SmoothTransformation
-            ))
+            update_background()
             
             # Update overlay size
             self.overlay.setGeometry(0, 0, self.width(), self.height())
@@ -490,13 +491,13 @@ class PatientNotFoundFrame(QtWidgets.QFrame):
         self.bg_label = QtWidgets.QLabel(self)
         self.bg_label.setGeometry(0, 0, self.width(), self.height())
         
-        # Load and set the image
-        pixmap = QtGui.QPixmap(image_path)
-        self.bg_label.setPixmap(pixmap.scaled(
-            self.width(), self.height(),
-            QtCore.Qt.KeepAspectRatioByExpanding,
-            QtCore.Qt.SmoothTransformation
-        ))
+        # Show a cached variant of the image at the frame's size (scaled off the GUI thread)
+        def update_background():
+            pixmap = image_service.scaled_pixmap(
+                image_path, self.size(), self.devicePixelRatioF(), on_ready=update_background)
+            if pixmap is not None:
+                self.bg_label.setPixmap(pixmap)
+        update_background()
         
         # Make sure the background stays behind other widgets
         self.bg_label.lower()
@@ -513,11 +514,7 @@ class PatientNotFoundFrame(QtWidgets.QFrame):
         def new_resize_event(event):
             # Update background size
             self.bg_label.setGeometry(0, 0, self.width(), self.height())
-            self.bg_label.setPixmap(pixmap.scaled(
-                self.width(), self.height(),
-                QtCore.Qt.KeepAspectRatioByExpanding,
-                QtCore.Qt.SmoothTransformation
-            ))
+            update_background()
             
             # Update overlay size
             self.overlay.setGeometry(0, 0, self.width(), self.height())
@@ -531,11 +528,13 @@ class PatientNotFoundFrame(QtWidgets.QFrame):
         print(f"Background image not found: {image_path}")
 
 class SearchDialog(QtWidgets.QDialog):
-    """Dialog for searching patients by name."""
+    """Search-as-you-type dialog over patient names, IDs and diseases."""
+    DEBOUNCE_MS = 150
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Search Patient")
-        self.setFixedSize(450, 220)
+        self.setFixedSize(450, 460)
         self.setStyleSheet("""
             QDialog {
                 background-color: #f0f7ff;
@@ -590,7 +589,7 @@ class SearchDialog(QtWidgets.QDialog):
         layout.addWidget(line)
         
         # Search instruction
-        search_label = QtWidgets.QLabel("Enter patient's full name:")
+        search_label = QtWidgets.QLabel("Enter a name, patient ID or disease:")
         layout.addWidget(search_label)
         
         # Search input with icon - improved
@@ -608,6 +607,28 @@ class SearchDialog(QtWidgets.QDialog):
         input_layout.addWidget(search_icon)
         input_layout.addWidget(self.search_input)
         layout.addLayout(input_layout)
+
+        # Ranked matches, updated as the user types
+        self.results_list = QtWidgets.QListWidget()
+        self.results_list.setStyleSheet("""
+            QListWidget {
+                border: 1px solid #bdc3c7;
+                border-radius: 8px;
+                background-color: white;
+                font-size: 14px;
+            }
+            QListWidget::item { padding: 6px; }
+            QListWidget::item:selected { background-color: #cce8ff; color: #2c3e50; }
+        """)
+        self.results_list.itemDoubleClicked.connect(self.accept)
+        layout.addWidget(self.results_list, stretch=1)
+
+        # Debounce keystrokes so fast typing only searches once
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
         
         # Add some space
         layout.addSpacing(5)
@@ -652,6 +673,9 @@ class SearchDialog(QtWidgets.QDialog):
         
         # Set focus to the search input
         self.search_input.setFocus()
+
+        # Pick up patients added since the index was last refreshed
+        search_index().refresh(on_done=lambda: self.isVisible() and self.run_search())
         
         # Add shadow effect to the dialog
         shadow = QtWidgets.QGraphicsDropShadowEffect()
@@ -663,6 +687,60 @@ class SearchDialog(QtWidgets.QDialog):
     def get_search_text(self):
         return self.search_input.text().strip()
 
+    def run_search(self):
+        """Fill the results list from the in-memory index."""
+        self.results_list.clear()
+        for result in search_index().search(self.get_search_text()):
+            label = f"{result.name}  (ID {result.patient_id})"
+            if result.diseases:
+                label += f" - {', '.join(result.diseases)}"
+            item = QtWidgets.QListWidgetItem(label)
+            item.setData(QtCore.Qt.UserRole, result.patient_id)
+            self.results_list.addItem(item)
+        if self.results_list.count():
+            self.results_list.setCurrentRow(0)
+
+    def selected_patient_id(self):
+        """ID of the highlighted match, or None if nothing matched."""
+        if self.search_timer.isActive():
+            # Accepted before the debounce fired: search the final text now
+            self.search_timer.stop()
+            self.run_search()
+        item = self.results_list.currentItem()
+        return item.data(QtCore.Qt.UserRole) if item is not None else None
+
+
+def fetch_patient_detail(connection, where_clause, params):
+    """Fetch one patient with diseases and symptoms (runs on a worker thread)."""
+    cursor = connection.cursor()
+    try:
+        query = """
+        SELECT 
+            p.patient_id, 
+            p.name, 
+            TO_CHAR(p.birth_date, 'YYYY-MM-DD') AS birth_date,
+            p.status,
+            TO_CHAR(p.admission_date, 'YYYY-MM-DD') AS admission_date,
+            p.notes,
+            LISTAGG(d.disease_name, ', ') WITHIN GROUP (ORDER BY d.disease_name) AS diseases,
+            (SELECT LISTAGG(s.symptom_name || ' (' || s.severity || ')', ', ') 
+             WITHIN GROUP (ORDER BY s.symptom_name)
+             FROM symptoms s 
+             WHERE s.patient_id = p.patient_id) AS symptoms
+        FROM 
+            patient p
+        LEFT JOIN 
+            disease d ON p.patient_id = d.patient_id
+        WHERE 
+            {where_clause}
+        GROUP BY 
+            p.patient_id, p.name, p.birth_date, p.status, p.admission_date, p.notes
+        """.format(where_clause=where_clause)
+        cursor.execute(query, params)
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
 
 class PatientWidget(QtWidgets.QWidget):
     def __init__(self, worker_id=None, full_name=None, role=None, main_window=None, parent=None):
@@ -716,6 +794,25 @@ class PatientWidget(QtWidgets.QWidget):
             }
         """)
         button_layout.addWidget(self.add_button, stretch=1)
+
+        # "Import" button for bulk admissions from a CSV/JSON file
+        self.import_button = QtWidgets.QPushButton("Import")
+        self.import_button.setFixedHeight(50)
+        self.import_button.setToolTip("Import patients from a CSV or JSON file")
+        self.import_button.setStyleSheet("""
+            QPushButton {
+                background-color: #2E8B57;
+                color: white;
+                font-size: 18px;
+                border-radius: 10px;
+                padding-left: 15px;
+                padding-right: 15px;
+            }
+            QPushButton:hover {
+                background-color: #26734A;
+            }
+        """)
+        button_layout.addWidget(self.import_button)
         
         # Search bar and button layout
         search_layout = QtWidgets.QHBoxLayout()
@@ -765,18 +862,31 @@ class PatientWidget(QtWidgets.QWidget):
         button_layout.addWidget(self.adjustify_button, stretch=1)
         main_content_layout.addLayout(button_layout)
         
-        # Table to display patient data
-        self.patient_table = QtWidgets.QTableWidget()
-        self.patient_table.setColumnCount(6)  # Updated column count
-        self.patient_table.setHorizontalHeaderLabels([
-            "Patient ID", "Patient Name", "Birth Date", "Status", 
-            "Admission Date", "Notes"
-        ])
+        # Quick filter over the loaded patients (by ID or name)
+        self.filter_edit = QtWidgets.QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by patient ID or name...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setStyleSheet("font-size: 14px; padding: 6px; border: 1px solid #dcdcdc; border-radius: 5px;")
+        main_content_layout.addWidget(self.filter_edit)
+
+        # Table to display patient data; rows come from a model, only visible cells are drawn
+        self.patient_model = PatientTableModel(self)
+        self.patient_proxy = PatientFilterProxy(self)
+        self.patient_proxy.setSourceModel(self.patient_model)
+
+        self.patient_table = QtWidgets.QTableView()
+        self.patient_table.setModel(self.patient_proxy)
+        self.patient_table.setSortingEnabled(True)
+        self.patient_table.sortByColumn(0, QtCore.Qt.AscendingOrder)
         self.patient_table.horizontalHeader().setStretchLastSection(True)
         self.patient_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.patient_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        # Fixed row height: no per-row measuring when the model grows
+        self.patient_table.setWordWrap(False)
+        self.patient_table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.patient_table.verticalHeader().setDefaultSectionSize(32)
         self.patient_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 font-size: 14px;
                 border: 1px solid #dcdcdc;
                 gridline-color: #e0e0e0;
@@ -787,7 +897,7 @@ class PatientWidget(QtWidgets.QWidget):
                 font-weight: bold;
                 border: 1px solid #dcdcdc;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #cce8ff;
             }
         """)
@@ -850,8 +960,13 @@ class PatientWidget(QtWidgets.QWidget):
         """Connect UI element signals to slots."""
         self.search_button.clicked.connect(self.show_search_dialog)
         self.add_button.clicked.connect(self.show_add_patient)
+        self.import_button.clicked.connect(self.show_import_patients)
         self.adjustify_button.clicked.connect(self.adjustify_patient)
         self.patient_table.doubleClicked.connect(self.show_patient_details)
+        self.filter_edit.textChanged.connect(self.patient_proxy.set_filter_text)
+        self.patient_model.fetch_failed.connect(self.patient_load_failed)
+        admission_client().delivered.connect(self.refresh_workspace)
+        admission_client().rejected.connect(self.show_rejected_admission)
         self.back_button.clicked.connect(self.go_back_to_workspaces)
     
     def go_back_to_workspaces(self):
@@ -867,83 +982,44 @@ class PatientWidget(QtWidgets.QWidget):
 
     def show_patient_details(self, index):
         """Show detailed information for the selected patient."""
-        row = index.row()
-        patient_id = int(self.patient_table.item(row, 0).text())
+        patient_id, _ = self.patient_proxy.patient_at(index.row())
         self.fetch_and_display_patient_detail(patient_id)
         
     def fetch_and_display_patient_detail(self, patient_id):
-        """Fetch detailed patient information and display it."""
-        connection = None
-        cursor = None
-        try:
-            # Connect to database
-            connection = oracledb.connect(
-                # user="system", 
-                # password="Abdo2004@", 
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
+        """Fetch detailed patient information in the background and display it."""
+        executor().submit(
+            lambda connection: fetch_patient_detail(connection, "p.patient_id = :id", {"id": patient_id}),
+            lambda result: self.display_patient_detail(result, patient_id),
+            lambda e: self.show_query_error(e, "Error fetching patient details", "Error retrieving patient details"),
+            owner=self,
+        )
 
-            # Query to find patient by ID with all related information
-            query = """
-            SELECT 
-                p.patient_id, 
-                p.name, 
-                TO_CHAR(p.birth_date, 'YYYY-MM-DD') AS birth_date,
-                p.status,
-                TO_CHAR(p.admission_date, 'YYYY-MM-DD') AS admission_date,
-                p.notes,
-                LISTAGG(d.disease_name, ', ') WITHIN GROUP (ORDER BY d.disease_name) AS diseases,
-                (SELECT LISTAGG(s.symptom_name || ' (' || s.severity || ')', ', ') 
-                 WITHIN GROUP (ORDER BY s.symptom_name)
-                 FROM symptoms s 
-                 WHERE s.patient_id = p.patient_id) AS symptoms
-            FROM 
-                patient p
-            LEFT JOIN 
-                disease d ON p.patient_id = d.patient_id
-            WHERE 
-                p.patient_id = :id
-            GROUP BY 
-                p.patient_id, p.name, p.birth_date, p.status, p.admission_date, p.notes
-            """
+    def display_patient_detail(self, result, patient_id):
+        """Show the detail frame for a fetched patient row."""
+        # Remove current detail frame if it exists
+        self.clear_current_frame()
 
-            cursor.execute(query, id=patient_id)
-            result = cursor.fetchone()
-            
-            # Remove current detail frame if it exists
-            if self.current_frame is not None:
-                self.content_stack.removeWidget(self.current_frame)
-                self.current_frame.deleteLater()
-                self.current_frame = None
-            
-            if result:
-                # Patient found - show details
-                self.current_frame = PatientDetailsFrame(result, self)
-                self.current_frame.back_button.clicked.connect(self.return_to_main_view)
-                self.content_stack.addWidget(self.current_frame)
-                self.content_stack.setCurrentWidget(self.current_frame)
-            else:
-                # Patient not found - show error
-                QtWidgets.QMessageBox.warning(self, "Error", f"Patient with ID {patient_id} not found.")
+        if result:
+            # Patient found - show details
+            self.current_frame = PatientDetailsFrame(result, self)
+            self.current_frame.back_button.clicked.connect(self.return_to_main_view)
+            self.content_stack.addWidget(self.current_frame)
+            self.content_stack.setCurrentWidget(self.current_frame)
+        else:
+            # Patient not found - show error
+            QtWidgets.QMessageBox.warning(self, "Error", f"Patient with ID {patient_id} not found.")
 
-        except Exception as e:
-            print(f"Error fetching patient details: {e}")
-            QtWidgets.QMessageBox.critical(self, "Database Error", f"Error retrieving patient details: {str(e)}")
-        finally:
-            if cursor:
-                try:
-                    cursor.close()
-                except Exception:
-                    pass
-            if connection:
-                try:
-                    connection.close()
-                except Exception:
-                    pass
+    def clear_current_frame(self):
+        """Remove the detail/not-found frame currently in the content stack."""
+        if self.current_frame is not None:
+            self.content_stack.removeWidget(self.current_frame)
+            self.current_frame.deleteLater()
+            self.current_frame = None
+
+    def show_query_error(self, error, log_prefix, message_prefix, title="Database Error"):
+        """Report a failed background query."""
+        print(f"{log_prefix}: {error}")
+        QtWidgets.QMessageBox.critical(self, title, f"{message_prefix}:\n{describe_error(error)}")
     
     def show_search_dialog(self):
         """Show search dialog and process the search query."""
@@ -952,89 +1028,48 @@ class PatientWidget(QtWidgets.QWidget):
         
         if result == QtWidgets.QDialog.Accepted:
             search_text = dialog.get_search_text()
-            if search_text:
+            patient_id = dialog.selected_patient_id()
+            if patient_id is not None:
+                self.show_search_match(patient_id, search_text)
+            elif search_text:
                 self.search_patient(search_text)
     
     def search_patient(self, patient_name):
-        """Search for patient by name and display results."""
-        connection = None
-        cursor = None
-        try:
-            # Connect to database
-            connection = oracledb.connect(
-                # user="system", 
-                # password="Abdo2004@", 
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
+        """Show the best indexed match for a name, ID or disease."""
+        matches = search_index().search(patient_name, limit=1)
+        if matches:
+            self.show_search_match(matches[0].patient_id, patient_name)
+        else:
+            self.display_search_result(None, patient_name)
 
-            # Query to find patient by name
-            query = """
-            SELECT 
-                p.patient_id, 
-                p.name, 
-                TO_CHAR(p.birth_date, 'YYYY-MM-DD') AS birth_date,
-                p.status,
-                TO_CHAR(p.admission_date, 'YYYY-MM-DD') AS admission_date,
-                p.notes,
-                LISTAGG(d.disease_name, ', ') WITHIN GROUP (ORDER BY d.disease_name) AS diseases,
-                (SELECT LISTAGG(s.symptom_name || ' (' || s.severity || ')', ', ') 
-                 WITHIN GROUP (ORDER BY s.symptom_name)
-                 FROM symptoms s 
-                 WHERE s.patient_id = p.patient_id) AS symptoms
-            FROM 
-                patient p
-            LEFT JOIN 
-                disease d ON p.patient_id = d.patient_id
-            WHERE 
-                UPPER(p.name) = UPPER(:name)
-            GROUP BY 
-                p.patient_id, p.name, p.birth_date, p.status, p.admission_date, p.notes
-            """
+    def show_search_match(self, patient_id, search_text):
+        """Fetch the chosen match's details in the background and display them."""
+        executor().submit(
+            lambda connection: fetch_patient_detail(connection, "p.patient_id = :id", {"id": patient_id}),
+            lambda result: self.display_search_result(result, search_text),
+            lambda e: self.show_query_error(e, "Error searching for patient", "Error connecting to database"),
+            owner=self,
+        )
 
-            cursor.execute(query, name=patient_name)
-            result = cursor.fetchone()
-            
-            # Remove current detail frame if it exists
-            if self.current_frame is not None:
-                self.content_stack.removeWidget(self.current_frame)
-                self.current_frame.deleteLater()
-                self.current_frame = None
-            
-            if result:
-                # Patient found - show details
-                self.current_frame = PatientDetailsFrame(result, self)
-                self.current_frame.set_background_image("resources/app3bg.jpg")
-                self.current_frame.back_button.clicked.connect(self.return_to_main_view)
-                self.content_stack.addWidget(self.current_frame)
-                self.content_stack.setCurrentWidget(self.current_frame)
-            else:
-                # Patient not found - show error
-                self.current_frame = PatientNotFoundFrame(patient_name, self)
-                self.current_frame.back_button.clicked.connect(self.return_to_main_view)
-                self.content_stack.addWidget(self.current_frame)
-                self.content_stack.setCurrentWidget(self.current_frame)
+    def display_search_result(self, result, patient_name):
+        """Show the search result, or the not-found frame."""
+        # Remove current detail frame if it exists
+        self.clear_current_frame()
+
+        if result:
+            # Patient found - show details
+            self.current_frame = PatientDetailsFrame(result, self)
+            self.current_frame.set_background_image("resources/app3bg.jpg")
+        else:
+            # Patient not found - show error
+            self.current_frame = PatientNotFoundFrame(patient_name, self)
+        self.current_frame.back_button.clicked.connect(self.return_to_main_view)
+        self.content_stack.addWidget(self.current_frame)
+        self.content_stack.setCurrentWidget(self.current_frame)
 
-        except Exception as e:
-            print(f"Error searching for patient: {e}")
-            QtWidgets.QMessageBox.critical(self, "Database Error", f"Error connecting to database: {str(e)}")
-        finally:
-            if cursor:
-                try:
-                    cursor.close
-                except Exception:
-                    pass
-            if connection:
-                try:
-                    connection.close()
-                except Exception:
-                    pass
     def adjustify_patient(self):
     
-     selected_row = self.patient_table.currentRow()
+     selected_row = self.patient_table.currentIndex().row()
     
      if selected_row == -1:
         QtWidgets.QMessageBox.warning(
@@ -1045,8 +1080,7 @@ class PatientWidget(QtWidgets.QWidget):
         )
         return
     
-     patient_id = int(self.patient_table.item(selected_row, 0).text())
-     patient_name = self.patient_table.item(selected_row, 1).text()
+     patient_id, patient_name = self.patient_proxy.patient_at(selected_row)
     
      try:
         from pages.adjustify_patient import AdjustPatientDialog
@@ -1084,94 +1118,44 @@ class PatientWidget(QtWidgets.QWidget):
     def save_adjustment(self):
    
      connection = None
-     cursor = None
      try:
         # Establish database connection
-        connection = oracledb.connect(
-            # user="system",
-            # password="Abdo2004@",
-            # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-        )
-        cursor = connection.cursor()
+        connection = database.acquire()
 
         # Start transaction
         connection.begin()
 
-        # 1. Update basic patient information
-        update_patient = """
-        UPDATE patient
-        SET status = :status,
-            notes = :notes,
-            last_updated = SYSDATE
-        WHERE patient_id = :id
-        """
-        cursor.execute(update_patient, {
-            'status': self.status_combo.currentText(),
-            'notes': self.notes_edit.toPlainText(),
-            'id': self.patient_id
-        })
-
-        # 2. Handle diseases (full replacement)
+        # Diseases are comma separated, symptoms one "Symptom (Severity)" per line
         diseases = [d.strip() for d in self.disease_edit.text().split(',') if d.strip()]
-        
-        # Delete existing diseases
-        cursor.execute("DELETE FROM disease WHERE patient_id = :id", {'id': self.patient_id})
-        
-        # Insert new diseases
-        for disease in diseases:
-            cursor.execute(
-                "INSERT INTO disease (patient_id, disease_name) VALUES (:id, :disease)",
-                {'id': self.patient_id, 'disease': disease}
-            )
+        symptoms = patient_store.parse_symptoms(self.symptoms_edit.toPlainText())
 
-        # 3. Handle symptoms (full replacement)
-        symptoms_text = self.symptoms_edit.toPlainText()
-        symptoms = []
-        
-        # Parse symptoms with severity (format: "Symptom (Severity)")
-        for line in symptoms_text.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            if '(' in line and ')' in line:
-                name = line[:line.index('(')].strip()
-                severity = line[line.index('(')+1:line.index(')')].strip()
-            else:
-                name = line
-                severity = 'Medium'  # Default severity
-            
-            symptoms.append((name, severity))
-        
-        # Delete existing symptoms
-        cursor.execute("DELETE FROM symptoms WHERE patient_id = :id", {'id': self.patient_id})
-        
-        # Insert new symptoms
-        for symptom, severity in symptoms:
-            cursor.execute(
-                """INSERT INTO symptoms (patient_id, symptom_name, severity) 
-                VALUES (:id, :symptom, :severity)""",
-                {'id': self.patient_id, 'symptom': symptom, 'severity': severity}
-            )
+        # Only the rows that changed are written, in a fixed number of round trips
+        patient_store.save_adjustment(
+            connection,
+            self.patient_id,
+            self.status_combo.currentText(),
+            self.notes_edit.toPlainText(),
+            diseases,
+            symptoms,
+        )
 
         # Commit transaction
         connection.commit()
         
         # Log successful update
         print(f"Successfully updated patient ID {self.patient_id}")
+        index = search_index()
+        index.upsert(self.patient_id, index.name_of(self.patient_id), diseases)
         return True
 
-     except oracledb.DatabaseError as e:
-        error, = e.args
-        print(f"Oracle Error {error.code}: {error.message}")
+     except database.DatabaseError as e:
+        print(f"Database error saving adjustments: {database.describe_error(e)}")
         if connection:
             connection.rollback()
         QtWidgets.QMessageBox.critical(
             self,
             "Database Error",
-            f"Failed to save adjustments:\nError {error.code}: {error.message}"
+            f"Failed to save adjustments:\n{database.describe_error(e)}"
         )
         return False
 
@@ -1187,8 +1171,6 @@ class PatientWidget(QtWidgets.QWidget):
         return False
 
      finally:
-        if cursor:
-            cursor.close()
         if connection:
             connection.close()
     def return_to_main_view(self):
@@ -1197,96 +1179,33 @@ class PatientWidget(QtWidgets.QWidget):
         self.load_data_from_db()  # Refresh data when returning to main view
     
     def load_data_from_db(self):
-        """Load patient data from the database with all required fields."""
-        connection = None
-        cursor = None
-        try:
-            # Connect to database
-            connection = oracledb.connect(
-                # user="system", 
-                # password="Abdo2004@", 
-                # dsn="localhost:1521/FREE"
-                user="system", 
-                password="s2004b22", 
-                dsn="192.168.21.1:1521/FREE"
-            )
-            cursor = connection.cursor()
-
-            # Updated query to match your table structure
-            query = """
-            SELECT 
-                p.patient_id, 
-                p.name, 
-                TO_CHAR(p.birth_date, 'YYYY-MM-DD') AS birth_date,
-                p.status,
-                TO_CHAR(p.admission_date, 'YYYY-MM-DD') AS admission_date,
-                p.notes,
-                COALESCE(LISTAGG(s.symptom_name, ', ') WITHIN GROUP (ORDER BY s.symptom_name), 'No symptoms') AS symptoms
-            FROM 
-                patient p
-            LEFT JOIN 
-                symptoms s ON p.patient_id = s.patient_id
-            GROUP BY 
-                p.patient_id, p.name, p.birth_date, p.status, p.admission_date, p.notes
-            ORDER BY 
-                p.patient_id
-            """
+        """Load the first page of patients; the table fetches more as it scrolls."""
+        self.patient_model.reload()
+        # Keep the search index current with newly added patients
+        search_index().refresh()
 
-            cursor.execute(query)
-            data = cursor.fetchall()
-            
-            # Configure table if not already configured
-            if self.patient_table.columnCount() == 0:
-                self.patient_table.setColumnCount(6)
-                self.patient_table.setHorizontalHeaderLabels([
-                    "Patient ID", "Patient Name", "Birth Date", 
-                    "Status", "Admission Date", "Notes"
-                ])
-                # Set column widths
-                self.patient_table.setColumnWidth(0, 80)   # ID
-                self.patient_table.setColumnWidth(1, 200)  # Name
-                self.patient_table.setColumnWidth(2, 100)  # Birth Date
-                self.patient_table.setColumnWidth(3, 100)  # Status
-                self.patient_table.setColumnWidth(4, 120)  # Admission Date
-                # Notes column will auto-expand
+    def refresh_workspace(self):
+        """Pick up patients added while this workspace was hidden (see workspace_cache)."""
+        self.patient_model.fetch_new()
+        search_index().refresh()
 
-            self.patient_table.setRowCount(len(data))
+    def needs_refresh(self):
+        return self.patient_model.interrupted
 
-            for row_index, row_data in enumerate(data):
-                for col_index, value in enumerate(row_data[:6]):  # Only show first 6 columns in table
-                    item = QtWidgets.QTableWidgetItem(str(value if value is not None else ""))
-                    
-                    # Center align all columns except notes
-                    if col_index != 5:
-                        item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    else:
-                        item.setTextAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
-                    
-                    self.patient_table.setItem(row_index, col_index, item)
+    def patient_load_failed(self, error):
+        self.show_query_error(error, "Error loading data from database", "Could not load patient data")
 
-            # Resize rows to fit content
-            self.patient_table.resizeRowsToContents()
-
-        except oracledb.DatabaseError as e:
-            error, = e.args
-            print(f"Oracle Database Error {error.code}: {error.message}")
-            QtWidgets.QMessageBox.critical(
-                self, 
-                "Database Error", 
-                f"Could not load patient data:\nError {error.code}: {error.message}"
-            )
-        except Exception as e:
-            print(f"Error loading data from database: {e}")
-            QtWidgets.QMessageBox.critical(
-                self, 
-                "Error", 
-                f"An unexpected error occurred:\n{str(e)}"
-            )
-        finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                connection.close()
+    def show_rejected_admission(self, admission, reason):
+        """An admission saved offline was refused by the server: it was never saved."""
+        QtWidgets.QMessageBox.warning(
+            self,
+            "Admission Not Saved",
+            f"The admission of {admission.get('name') or 'a patient'} "
+            f"({admission.get('admission_date') or 'unknown date'}) was saved offline, "
+            f"but the patient server refused it, so the patient was NOT added.\n\n"
+            f"Reason: {reason}\n\nPlease enter the patient again.",
+            QtWidgets.QMessageBox.Ok
+        )
 
     def show_add_patient(self):
         """Show the Add Patient dialog and refresh data if a patient was added."""
@@ -1299,7 +1218,16 @@ class PatientWidget(QtWidgets.QWidget):
             result = dialog.exec_()
             
             # Refresh table if patient was added
-            if result == QtWidgets.QDialog.Accepted:
+            if result == QtWidgets.QDialog.Accepted and dialog.outcome == "queued":
+                # The table refreshes once the queued admission is delivered
+                QtWidgets.QMessageBox.information(
+                    self,
+                    "Saved Offline",
+                    "The patient server is unreachable. The admission has been saved on this "
+                    f"computer and will be sent automatically ({admission_client().pending()} waiting).",
+                    QtWidgets.QMessageBox.Ok
+                )
+            elif result == QtWidgets.QDialog.Accepted:
                 self.load_data_from_db()
                 QtWidgets.QMessageBox.information(
                     self,
@@ -1323,6 +1251,15 @@ class PatientWidget(QtWidgets.QWidget):
             )
 
 
+    def show_import_patients(self):
+        """Show the bulk import dialog and reload the table if anything was imported."""
+        from pages.patient_import import ImportPatientsDialog
+
+        dialog = ImportPatientsDialog(self)
+        if dialog.exec_() == QtWidgets.QDialog.Accepted:
+            self.load_data_from_db()
+
+
 if __name__ == "__main__":
     import sys
     app = QtWidgets.QApplication(sys.argv)
@@ -0,0 +1,173 @@
+"""Patient write service: a local replacement for addpatient.php.
+
+The PHP script opened a new Oracle connection for every request and parsed
+the symptom insert once per symptom.  This service keeps the shared
+session pool (pages/database.py) open for its whole life, sends the same
+statement texts every time so each session's statement cache keeps them
+parsed, and inserts all symptoms of an admission in one array bind
+(patient_store.add_patient).
+
+It answers on the same path with the same JSON as the PHP script, so the
+desktop client only needs HOSPITAL_API_URL pointed here (see API_URL in
+pages/admission_client.py).
+Replays of an admission carrying an already-seen ``request_id`` get the
+original answer instead of a second patient.
+
+    python -m pages.patient_api --port 8080
+    python -m pages.patient_api --sqlite standin.sqlite3   # offline stand-in
+"""
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pages import database, patient_store
+
+PATHS = ("/patient_api/add_patient.php", "/add_patient")
+DEFAULT_PORT = 8080
+MAX_BODY_BYTES = 1024 * 1024
+REQUIRED_FIELDS = ("name", "disease_name", "birth_date", "admission_date")
+REPLAY_CACHE_SIZE = 4096
+LISTEN_BACKLOG = 256
+
+_replies = OrderedDict()    # request_id -> patient_id of admissions already saved
+_replies_lock = threading.Lock()
+_request_locks = {}         # request_id -> [lock, users]; one insert at a time per request_id
+
+
+def _seen(request_id):
+    with _replies_lock:
+        return _replies.get(request_id)
+
+
+def _remember(request_id, patient_id):
+    with _replies_lock:
+        _replies[request_id] = patient_id
+        while len(_replies) > REPLAY_CACHE_SIZE:
+            _replies.popitem(last=False)
+
+
+@contextmanager
+def _request_lock(request_id):
+    """Serialize replays of one request_id so check-and-insert is atomic."""
+    if not request_id:
+        yield
+        return
+    with _replies_lock:
+        entry = _request_locks.setdefault(request_id, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _replies_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _request_locks[request_id]
+
+
+def save_admission(admission):
+    """Insert one admission on a pooled session; returns (status code, reply)."""
+    if any(not admission.get(field) for field in REQUIRED_FIELDS):
+        return 400, {"success": False, "message": "Missing required fields"}
+    problem = patient_store.validate_admission(admission)
+    if problem is not None:
+        return 400, {"success": False, "message": problem[1], "field": problem[0]}
+
+    request_id = admission.get("request_id")
+    with _request_lock(request_id):
+        return _save_once(admission, request_id)
+
+
+def _save_once(admission, request_id):
+    previous = _seen(request_id) if request_id else None
+    if previous is not None:
+        return 200, {"success": True, "message": "Patient already added", "patient_id": previous}
+
+    connection = database.acquire()
+    try:
+        patient_id = patient_store.add_patient(connection, admission)
+        connection.commit()
+    except (database.DatabaseError, patient_store.BatchWriteError) as e:
+        connection.rollback()
+        print(f"Patient API error: {e}")
+        return 500, {"success": False, "message": str(e)}
+    finally:
+        database.release(connection)
+
+    if request_id:
+        _remember(request_id, patient_id)
+    return 200, {"success": True, "message": "Patient added successfully", "patient_id": patient_id}
+
+
+class PatientApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients reuse their connection
+
+    def do_POST(self):
+        if self.path not in PATHS:
+            return self.reply(404, {"success": False, "message": "Not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            return self.reply(413, {"success": False, "message": "Request too large"})
+        try:
+            admission = json.loads(self.rfile.read(length))
+        except ValueError:
+            return self.reply(400, {"success": False, "message": "Invalid JSON data"})
+        if not isinstance(admission, dict):
+            return self.reply(400, {"success": False, "message": "Invalid JSON data"})
+        self.reply(*save_admission(admission))
+
+    def do_OPTIONS(self):
+        self.reply(200, None)
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "POST")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # one line per admission would drown the errors
+
+
+class PatientApiServer(ThreadingHTTPServer):
+    """Handles each connection on its own thread; sessions come from the pool."""
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG  # the default of 5 refuses bursts of intake desks
+
+
+def create_server(host="127.0.0.1", port=DEFAULT_PORT):
+    return PatientApiServer((host, port), PatientApiHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Patient write service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--sqlite", metavar="PATH", help="use a SQLite stand-in file instead of Oracle")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        database.use_sqlite(args.sqlite)
+    database.get_pool()  # open the pool before the first admission arrives
+    server = create_server(args.host, args.port)
+    print(f"Patient API listening on http://{args.host}:{server.server_port}{PATHS[0]} "
+          f"({database.backend()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        database.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Bulk patient import from CSV or JSON (transfers, mass-casualty drills).
+
+Rows are checked with the same rules as the Add Patient form
+(patient_store.validate_admission) before anything is written.  Valid
+rows are then written CHUNK_SIZE at a time, each chunk in its own
+transaction with array DML (patient_store.add_patients), so an import of
+hundreds of patients costs a few round trips per chunk instead of several
+per patient.  If a chunk is refused by the database it is rolled back and
+replayed one row at a time, so only the offending rows end up in the error
+report.
+
+CSV files have a header row with the columns
+``name, disease_name, birth_date, admission_date, status, notes, symptoms``;
+dates are YYYY-MM-DD and symptoms read ``Cough:Mild; Fever:Severe``.
+JSON files hold a list of objects shaped like the Add Patient payload
+(``symptoms`` as [name, severity] pairs), optionally under "patients".
+"""
+import csv
+import json
+import threading
+
+from PyQt5 import QtCore, QtWidgets
+
+from pages import database, patient_store
+from pages.query_executor import describe_error, executor
+
+CHUNK_SIZE = 200
+COLUMNS = ('name', 'disease_name', 'birth_date', 'admission_date', 'status', 'notes', 'symptoms')
+REQUIRED_COLUMNS = ('name', 'disease_name', 'birth_date', 'admission_date')
+
+
+class ImportFileError(Exception):
+    """The file as a whole cannot be read."""
+
+
+def parse_symptom_cell(text):
+    """'Cough:Mild; Fever' -> [['Cough', 'Mild'], ['Fever', default severity]]."""
+    symptoms = []
+    for part in (text or '').split(';'):
+        if not part.strip():
+            continue
+        name, _, severity = part.partition(':')
+        symptoms.append([name.strip(), severity.strip() or patient_store.DEFAULT_ADMISSION_SEVERITY])
+    return symptoms
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        header = [column.strip().lower() for column in reader.fieldnames or ()]
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ImportFileError(f"Missing column(s): {', '.join(missing)}")
+        reader.fieldnames = header
+        rows = []
+        for record in reader:
+            admission = {column: (record.get(column) or '').strip() for column in COLUMNS}
+            admission['symptoms'] = parse_symptom_cell(admission['symptoms'])
+            rows.append((reader.line_num, admission))
+    return rows
+
+
+def read_json(path):
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ImportFileError(f"Invalid JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get('patients')
+    if not isinstance(data, list):
+        raise ImportFileError("Expected a list of patients")
+    return [(n, record if isinstance(record, dict) else {}) for n, record in enumerate(data, start=1)]
+
+
+def read_admissions(path):
+    """[(line or record number, admission)] from a CSV or JSON file."""
+    try:
+        return read_json(path) if path.lower().endswith('.json') else read_csv(path)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(str(e))
+
+
+def validate(rows):
+    """Split rows into (valid rows, errors); errors are (line, name, message)."""
+    valid, errors = [], []
+    for line, admission in rows:
+        problem = patient_store.validate_admission(admission)
+        if problem is None:
+            valid.append((line, admission))
+        else:
+            errors.append((line, str(admission.get('name') or ''), problem[1]))
+    return valid, errors
+
+
+class PatientImport(QtCore.QObject):
+    """Writes validated rows in chunks (worker thread); ``progress(done, total)`` per chunk."""
+    progress = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, rows, chunk_size=CHUNK_SIZE, parent=None):
+        super().__init__(parent)
+        self.rows = rows
+        self.chunk_size = chunk_size
+        self.imported = 0
+        self.errors = []
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop after the chunk being written; committed chunks stay."""
+        self._cancelled.set()
+
+    def run(self, connection):
+        total = len(self.rows)
+        for start in range(0, total, self.chunk_size):
+            if self._cancelled.is_set():
+                break
+            self._write_chunk(connection, self.rows[start:start + self.chunk_size])
+            self.progress.emit(min(start + self.chunk_size, total), total)
+        return self
+
+    def _write_chunk(self, connection, chunk):
+        try:
+            patient_store.add_patients(connection, [admission for _, admission in chunk])
+            connection.commit()
+            self.imported += len(chunk)
+            return
+        except (database.DatabaseError, patient_store.BatchWriteError) as e:
+            connection.rollback()
+            print(f"Import chunk rejected ({e}); retrying its rows one by one")
+
+        for line, admission in chunk:
+            try:
+                patient_store.add_patient(connection, admission)
+                connection.commit()
+                self.imported += 1
+            except (database.DatabaseError, patient_store.BatchWriteError) as e:
+                connection.rollback()
+                self.errors.append((line, admission['name'], describe_error(e)))
+
+
+def write_report(path, errors):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(('line', 'name', 'problem'))
+        writer.writerows(errors)
+
+
+class ImportPatientsDialog(QtWidgets.QDialog):
+    """Pick a file, review the rows that fail validation, import the rest."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Import Patients")
+        self.setMinimumSize(700, 500)
+        self.rows = []
+        self.errors = []
+        self.imported = 0
+        self.job = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #f0f7ff; }
+            QLabel { font-size: 14px; color: #2c3e50; }
+            QPushButton {
+                background-color: #3498db; color: white; border-radius: 5px;
+                padding: 8px 16px; font-size: 14px;
+            }
+            QPushButton:hover { background-color: #2980b9; }
+            QPushButton:disabled { background-color: #CCCCCC; color: #666666; }
+        """)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setSpacing(12)
+
+        file_layout = QtWidgets.QHBoxLayout()
+        self.file_input = QtWidgets.QLineEdit()
+        self.file_input.setReadOnly(True)
+        self.file_input.setPlaceholderText("CSV or JSON file...")
+        self.browse_button = QtWidgets.QPushButton("Browse...")
+        self.browse_button.clicked.connect(self.choose_file)
+        file_layout.addWidget(self.file_input)
+        file_layout.addWidget(self.browse_button)
+        layout.addLayout(file_layout)
+
+        self.summary_label = QtWidgets.QLabel("Choose a file to import.")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.error_table = QtWidgets.QTableWidget(0, 3)
+        self.error_table.setHorizontalHeaderLabels(["Line", "Patient", "Problem"])
+        self.error_table.horizontalHeader().setSectionResizeMode(2, QtWidgets.QHeaderView.Stretch)
+        self.error_table.verticalHeader().setVisible(False)
+        self.error_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.error_table)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        self.report_button = QtWidgets.QPushButton("Save Error Report")
+        self.report_button.setEnabled(False)
+        self.report_button.clicked.connect(self.save_report)
+        self.import_button = QtWidgets.QPushButton("Import")
+        self.import_button.setEnabled(False)
+        self.import_button.clicked.connect(self.start_import)
+        self.close_button = QtWidgets.QPushButton("Close")
+        self.close_button.clicked.connect(self.close_or_cancel)
+        button_layout.addWidget(self.report_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.import_button)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+    def choose_file(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Import Patients", "", "Patient files (*.csv *.json);;All files (*)")
+        if not path:
+            return
+        self.file_input.setText(path)
+        self.summary_label.setText("Reading file...")
+        self.import_button.setEnabled(False)
+        executor().submit(lambda: validate(read_admissions(path)), self.file_checked,
+                          self.file_failed, owner=self, needs_connection=False)
+
+    def file_checked(self, result):
+        self.rows, self.errors = result
+        self.show_errors()
+        self.progress_bar.setRange(0, max(len(self.rows), 1))
+        self.progress_bar.setValue(0)
+        self.summary_label.setText(
+            f"{len(self.rows)} patient(s) ready to import, {len(self.errors)} row(s) with problems.")
+        self.import_button.setEnabled(bool(self.rows))
+
+    def file_failed(self, error):
+        self.rows, self.errors = [], []
+        self.show_errors()
+        self.summary_label.setText(f"Could not read the file: {error}")
+
+    def show_errors(self):
+        self.error_table.setRowCount(len(self.errors))
+        for row, error in enumerate(self.errors):
+            for column, value in enumerate(error):
+                self.error_table.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+        self.report_button.setEnabled(bool(self.errors))
+
+    def start_import(self):
+        self.job = PatientImport(self.rows, parent=self)
+        self.job.progress.connect(self.show_progress)
+        self.import_button.setEnabled(False)
+        self.browse_button.setEnabled(False)
+        self.close_button.setText("Cancel")
+        self.summary_label.setText(f"Importing {len(self.rows)} patient(s)...")
+        executor().submit(self.job.run, self.import_finished, self.import_failed, owner=self, busy=False)
+
+    def show_progress(self, done, total):
+        self.progress_bar.setValue(done)
+        self.summary_label.setText(f"Imported {self.job.imported} of {total} patient(s)...")
+
+    def import_finished(self, job):
+        self.job = None
+        self.imported += job.imported
+        self.errors.extend(job.errors)
+        self.rows = []
+        self.show_errors()
+        self.browse_button.setEnabled(True)
+        self.close_button.setText("Close")
+        self.summary_label.setText(
+            f"Imported {job.imported} patient(s); {len(self.errors)} row(s) not imported.")
+
+    def import_failed(self, error):
+        # Chunks committed before the failure stay imported
+        job, self.job = self.job, None
+        self.imported += job.imported
+        self.browse_button.setEnabled(True)
+        self.close_button.setText("Close")
+        self.summary_label.setText(
+            f"Import stopped after {job.imported} patient(s): {describe_error(error)}")
+
+    def close_or_cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.summary_label.setText("Stopping after the current chunk...")
+        else:
+            self.reject()
+
+    def reject(self):
+        # Escape must not abandon a running import; Accepted tells the caller to reload
+        if self.job is None:
+            self.done(QtWidgets.QDialog.Accepted if self.imported else QtWidgets.QDialog.Rejected)
+
+    def save_report(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Error Report", "import_errors.csv", "CSV files (*.csv)")
+        if path:
+            try:
+                write_report(path, self.errors)
+            except OSError as e:
+                QtWidgets.QMessageBox.critical(self, "Error", f"Could not save the report:\n{e}")
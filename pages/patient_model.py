@@ -0,0 +1,217 @@
+"""Table model behind the patient list.
+
+Rows are stored column by column (patient ids in a compact integer array,
+text columns in plain lists) and the view only asks for the cells it is
+about to paint, so the list stays cheap however many patients there are.
+Sorting and filtering go through ``PatientFilterProxy``, which keeps an
+index mapping instead of copying rows.
+
+Patients are fetched a page at a time with keyset pagination on
+``patient_id``: the first page is requested when the list is (re)loaded
+and the next one whenever the view scrolls near the end of what is loaded.
+"""
+from array import array
+
+from PyQt5 import QtCore
+
+from pages import preloader
+from pages.query_executor import executor
+
+FIRST_PAGE_SIZE = 100  # enough for the first screen, returned in constant time
+PAGE_SIZE = 500        # rows per page fetched while scrolling
+
+HEADERS = ["Patient ID", "Patient Name", "Birth Date", "Status", "Admission Date", "Notes"]
+ID_COLUMN, NAME_COLUMN, NOTES_COLUMN = 0, 1, 5
+
+# Raw (unformatted) value of a cell, used for sorting
+SORT_ROLE = QtCore.Qt.UserRole
+
+
+def fetch_patient_page(connection, after_id, page_size):
+    """Next ``page_size`` patients with an id above ``after_id`` (worker thread)."""
+    cursor = connection.cursor()
+    try:
+        # One round trip per page: fetch the whole page and peek past its end
+        cursor.arraysize = page_size
+        cursor.prefetchrows = page_size + 1
+        query = """
+        SELECT 
+            patient_id, 
+            name, 
+            TO_CHAR(birth_date, 'YYYY-MM-DD') AS birth_date,
+            status,
+            TO_CHAR(admission_date, 'YYYY-MM-DD') AS admission_date,
+            notes
+        FROM 
+            patient
+        {where_clause}
+        ORDER BY 
+            patient_id
+        FETCH FIRST :page_size ROWS ONLY
+        """.format(where_clause="WHERE patient_id > :after_id" if after_id is not None else "")
+        params = {"page_size": page_size}
+        if after_id is not None:
+            params["after_id"] = after_id
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class PatientTableModel(QtCore.QAbstractTableModel):
+    """Read-only model over patient rows (id, name, birth, status, admission, notes).
+
+    ``parent`` is the page that owns the model; page fetches run on the
+    query executor on its behalf.
+    """
+    fetch_failed = QtCore.pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = array("q")
+        self._text_columns = [[] for _ in HEADERS[1:]]
+        self._exhausted = True
+        self._fetching = False
+        self.interrupted = False  # a page fetch was cancelled by leaving the page
+        self._generation = 0  # bumped on reload so late pages are dropped
+
+    def reload(self):
+        """Forget the loaded rows and fetch the first page again."""
+        self._generation += 1
+        self.set_rows([])
+        self._exhausted = False
+        self._fetching = False
+        self.interrupted = False
+        rows = preloader.take("patients")
+        if rows is not None:
+            # First page already fetched behind the splash screen
+            self._page_loaded(rows, FIRST_PAGE_SIZE, self._generation)
+            return
+        self._request_page(FIRST_PAGE_SIZE)
+
+    def fetch_new(self):
+        """Append patients added since the last page, once everything loaded has been paged.
+
+        A page fetch that was cancelled is issued again.
+        """
+        if (self._exhausted or self.interrupted) and not self._fetching:
+            self._exhausted = False
+            self.interrupted = False
+            self._request_page(PAGE_SIZE)
+
+    def set_rows(self, rows):
+        """Replace the contents with the given rows (no further paging)."""
+        self.beginResetModel()
+        self._ids = array("q")
+        self._text_columns = [[] for _ in HEADERS[1:]]
+        self._append(rows)
+        self._exhausted = True
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if self.canFetchMore(parent):
+            self._request_page(PAGE_SIZE)
+
+    def _request_page(self, page_size):
+        self._fetching = True
+        after_id = self._ids[-1] if self._ids else None
+        generation = self._generation
+        executor().submit(
+            lambda connection: fetch_patient_page(connection, after_id, page_size),
+            lambda rows: self._page_loaded(rows, page_size, generation),
+            lambda error: self._page_failed(error, generation),
+            owner=self.parent(),
+            on_cancel=lambda: self._page_cancelled(generation),
+        )
+
+    def _page_cancelled(self, generation):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self.interrupted = True
+
+    def _page_loaded(self, rows, page_size, generation):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self._exhausted = len(rows) < page_size
+        if rows:
+            first = len(self._ids)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+            self._append(rows)
+            self.endInsertRows()
+
+    def _page_failed(self, error, generation):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self._exhausted = True
+        self.fetch_failed.emit(error)
+
+    def _append(self, rows):
+        for row in rows:
+            self._ids.append(int(row[ID_COLUMN]))
+            for column, value in zip(self._text_columns, row[1:len(HEADERS)]):
+                column.append("" if value is None else str(value))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == QtCore.Qt.DisplayRole:
+            if column == ID_COLUMN:
+                return str(self._ids[row])
+            return self._text_columns[column - 1][row]
+        if role == SORT_ROLE:
+            if column == ID_COLUMN:
+                return self._ids[row]
+            return self._text_columns[column - 1][row]
+        if role == QtCore.Qt.TextAlignmentRole:
+            # Center align all columns except notes
+            if column == NOTES_COLUMN:
+                return QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter
+            return QtCore.Qt.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def patient_at(self, row):
+        """(patient_id, name) for a source row."""
+        return self._ids[row], self._text_columns[NAME_COLUMN - 1][row]
+
+
+class PatientFilterProxy(QtCore.QSortFilterProxyModel):
+    """Sorts on raw values and filters on patient id or name."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self._needle = ""
+
+    def set_filter_text(self, text):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        model = self.sourceModel()
+        patient_id, name = model.patient_at(source_row)
+        return self._needle in name.lower() or self._needle == str(patient_id)
+
+    def patient_at(self, proxy_row):
+        """(patient_id, name) for a row as currently shown in the view."""
+        source = self.mapToSource(self.index(proxy_row, 0))
+        return self.sourceModel().patient_at(source.row())
@@ -0,0 +1,268 @@
+"""In-process search index for search-as-you-type in the patient search dialog.
+
+The index holds every patient's id, name and diagnosed diseases.  Lookups
+combine case-insensitive prefix matching (bisect over a sorted token list)
+with trigram similarity for misspellings, so a keystroke never touches the
+database.  The index is loaded once and then topped up with patients newer
+than the last indexed id; pages that edit a patient ``upsert`` it.  Fetched
+rows are turned into sorted index entries on the worker thread, so even the
+first load only merges them into the index on the GUI thread.
+"""
+from bisect import bisect_left, insort
+from collections import Counter
+
+from pages.query_executor import executor
+
+MAX_RESULTS = 20
+MIN_SIMILARITY = 0.5   # share of the query's trigrams a fuzzy hit must contain
+MIN_FUZZY_LENGTH = 3   # shorter queries are served by prefix matching alone
+
+# Ranking weights, highest first
+SCORE_EXACT_ID = 100
+SCORE_EXACT_NAME = 90
+SCORE_ID_PREFIX = 80
+SCORE_NAME_PREFIX = 75
+SCORE_TOKEN_PREFIX = 70
+SCORE_DISEASE_PREFIX = 50
+SCORE_FUZZY = 40       # multiplied by the similarity
+
+
+def normalize(text):
+    return " ".join(str(text or "").lower().split())
+
+
+def trigrams(text):
+    """Trigrams of a normalized string, padded so short words still get some."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fetch_search_rows(connection, after_id=None):
+    """(patient_id, name, diseases) for patients above ``after_id`` (worker thread)."""
+    cursor = connection.cursor()
+    try:
+        cursor.arraysize = 1000
+        query = """
+        SELECT
+            p.patient_id,
+            p.name,
+            LISTAGG(d.disease_name, '|') WITHIN GROUP (ORDER BY d.disease_name) AS diseases
+        FROM
+            patient p
+        LEFT JOIN
+            disease d ON p.patient_id = d.patient_id
+        {where_clause}
+        GROUP BY
+            p.patient_id, p.name
+        ORDER BY
+            p.patient_id
+        """.format(where_clause="WHERE p.patient_id > :after_id" if after_id is not None else "")
+        cursor.execute(query, {"after_id": after_id} if after_id is not None else {})
+        return [(pid, name, diseases.split("|") if diseases else []) for pid, name, diseases in cursor]
+    finally:
+        cursor.close()
+
+
+def index_keys(patient_id, norm_name, diseases):
+    """Prefix-searchable (token, kind) pairs for one patient."""
+    keys = [(str(patient_id), "id")]
+    keys += [(token, "name") for token in set(norm_name.split()) | {norm_name}]
+    keys += [(disease, "disease") for disease in {normalize(d) for d in diseases}]
+    return keys
+
+
+def _entry(name, diseases):
+    return str(name or ""), [str(d) for d in dict.fromkeys(diseases) if d]
+
+
+def prepare_rows(rows):
+    """Index entries for ``fetch_search_rows`` rows (worker thread).
+
+    Returns ({patient_id: (name, diseases)}, sorted tokens, {trigram: ids}).
+    """
+    patients, tokens, grams = {}, [], {}
+    for patient_id, name, diseases in rows:
+        name, diseases = patients[patient_id] = _entry(name, diseases)
+        norm = normalize(name)
+        tokens += [(token, kind, patient_id) for token, kind in index_keys(patient_id, norm, diseases)]
+        for gram in trigrams(norm):
+            grams.setdefault(gram, set()).add(patient_id)
+    tokens.sort()
+    return patients, tokens, grams
+
+
+class SearchResult:
+    """One ranked hit."""
+    __slots__ = ("patient_id", "name", "diseases", "score")
+
+    def __init__(self, patient_id, name, diseases, score):
+        self.patient_id = patient_id
+        self.name = name
+        self.diseases = diseases
+        self.score = score
+
+
+class PatientSearchIndex:
+    """Prefix + trigram index over patient id, name and diseases.
+
+    Mutated and queried on the GUI thread only; rows are fetched on the
+    query executor and applied when they arrive.
+    """
+    def __init__(self):
+        self._patients = {}      # patient_id -> (name, diseases)
+        self._tokens = []        # sorted (token, kind, patient_id); kind is "id", "name" or "disease"
+        self._trigrams = {}      # trigram -> set of patient ids (names only)
+        self.last_id = None
+        self.loaded = False
+        self._refreshing = False
+        self._refresh_again = False
+        self._callbacks = []     # on_done callbacks waiting for the refresh in flight
+
+    def __len__(self):
+        return len(self._patients)
+
+    # ---------------- maintenance ----------------
+    def upsert(self, patient_id, name, diseases=()):
+        """Add a patient or replace what is indexed for it."""
+        if patient_id in self._patients:
+            self.remove(patient_id)
+        name, diseases = self._patients[patient_id] = _entry(name, diseases)
+
+        norm = normalize(name)
+        for token, kind in index_keys(patient_id, norm, diseases):
+            insort(self._tokens, (token, kind, patient_id))
+        for gram in trigrams(norm):
+            self._trigrams.setdefault(gram, set()).add(patient_id)
+
+        if self.last_id is None or patient_id > self.last_id:
+            self.last_id = patient_id
+
+    def name_of(self, patient_id):
+        entry = self._patients.get(patient_id)
+        return entry[0] if entry is not None else None
+
+    def remove(self, patient_id):
+        entry = self._patients.pop(patient_id, None)
+        if entry is None:
+            return
+        name, diseases = entry
+        norm = normalize(name)
+        for token, kind in index_keys(patient_id, norm, diseases):
+            i = bisect_left(self._tokens, (token, kind, patient_id))
+            if i < len(self._tokens) and self._tokens[i] == (token, kind, patient_id):
+                del self._tokens[i]
+        for gram in trigrams(norm):
+            ids = self._trigrams.get(gram)
+            if ids is not None:
+                ids.discard(patient_id)
+                if not ids:
+                    del self._trigrams[gram]
+
+    def apply_rows(self, prepared):
+        """Merge entries from ``prepare_rows`` into the index."""
+        patients, tokens, grams = prepared
+        for patient_id in patients:
+            self.remove(patient_id)  # only re-fetched patients are already indexed
+        self._patients.update(patients)
+        # Two sorted runs: the sort merges them in linear time
+        self._tokens += tokens
+        self._tokens.sort()
+        for gram, ids in grams.items():
+            self._trigrams.setdefault(gram, set()).update(ids)
+        if patients:
+            newest = max(patients)
+            if self.last_id is None or newest > self.last_id:
+                self.last_id = newest
+        self.loaded = True
+
+    def refresh(self, on_done=None):
+        """Fetch patients added since the last refresh in the background.
+
+        A refresh asked for while one is in flight runs once that one is
+        applied; ``on_done`` is called after the index is up to date.
+        """
+        if on_done is not None:
+            self._callbacks.append(on_done)
+        if self._refreshing:
+            self._refresh_again = True
+            return
+        self._refreshing = True
+        self._refresh_again = False
+        after_id = self.last_id if self.loaded else None
+
+        def applied(prepared):
+            self._refreshing = False
+            self.apply_rows(prepared)
+            if self._refresh_again:
+                self.refresh()  # callbacks wait for the newer rows
+                return
+            callbacks, self._callbacks = self._callbacks, []
+            for callback in callbacks:
+                callback()
+
+        def failed(error):
+            self._refreshing = False
+            self._callbacks = []
+            print(f"Error refreshing patient search index: {error}")
+
+        executor().submit(
+            lambda connection: prepare_rows(fetch_search_rows(connection, after_id)),
+            applied, failed, busy=False,
+        )
+
+    # ---------------- lookup ----------------
+    def search(self, text, limit=MAX_RESULTS):
+        """Ranked results for ``text`` (best first)."""
+        query = normalize(text)
+        if not query:
+            return []
+        scores = {}
+
+        def hit(patient_id, score):
+            if score > scores.get(patient_id, 0):
+                scores[patient_id] = score
+
+        # ID, name and disease tokens starting with the query
+        i = bisect_left(self._tokens, (query,))
+        while i < len(self._tokens) and self._tokens[i][0].startswith(query):
+            token, kind, patient_id = self._tokens[i]
+            if kind == "id":
+                hit(patient_id, SCORE_EXACT_ID if token == query else SCORE_ID_PREFIX)
+            elif kind == "disease":
+                hit(patient_id, SCORE_DISEASE_PREFIX)
+            elif token == query and token == normalize(self._patients[patient_id][0]):
+                hit(patient_id, SCORE_EXACT_NAME)
+            elif token == normalize(self._patients[patient_id][0]):
+                hit(patient_id, SCORE_NAME_PREFIX)
+            else:
+                hit(patient_id, SCORE_TOKEN_PREFIX)
+            i += 1
+
+        # Fuzzy: how many of the query's trigrams the name contains
+        if len(query) >= MIN_FUZZY_LENGTH and not query.isdigit():
+            query_grams = trigrams(query)
+            shared = Counter()
+            for gram in query_grams:
+                for patient_id in self._trigrams.get(gram, ()):
+                    shared[patient_id] += 1
+            for patient_id, common in shared.items():
+                similarity = common / len(query_grams)
+                if similarity >= MIN_SIMILARITY:
+                    hit(patient_id, SCORE_FUZZY * similarity)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._patients[item[0]][0].lower()))
+        return [
+            SearchResult(patient_id, *self._patients[patient_id], score)
+            for patient_id, score in ranked[:limit]
+        ]
+
+
+_index = None
+
+
+def search_index():
+    """Return the process-wide patient search index."""
+    global _index
+    if _index is None:
+        _index = PatientSearchIndex()
+    return _index
@@ -0,0 +1,306 @@
+"""Patient write operations shared by the patient pages.
+
+Writes are set-based: the current rows are read once, diffed against what
+the user entered, and only the changed rows are sent, each kind in a single
+``executemany`` array bind.  An adjustment therefore costs the same number
+of round trips however many diseases or symptoms a patient has.
+"""
+from datetime import date
+
+from pages import database
+
+DEFAULT_SEVERITY = "Medium"
+
+# One MERGE per symptom row, all rows sent in a single array bind
+MERGE_SYMPTOM = """
+MERGE INTO symptoms s
+USING (SELECT :patient_id AS patient_id, :symptom_name AS symptom_name, :severity AS severity FROM dual) src
+ON (s.patient_id = src.patient_id AND s.symptom_name = src.symptom_name)
+WHEN MATCHED THEN
+    UPDATE SET s.severity = src.severity
+WHEN NOT MATCHED THEN
+    INSERT (patient_id, symptom_name, severity)
+    VALUES (src.patient_id, src.symptom_name, src.severity)
+"""
+
+# The SQLite stand-in has no MERGE: update the existing rows, then insert the rest
+UPDATE_SYMPTOM = """
+UPDATE symptoms SET severity = :severity
+WHERE patient_id = :patient_id AND symptom_name = :symptom_name
+"""
+INSERT_MISSING_SYMPTOM = """
+INSERT INTO symptoms (patient_id, symptom_name, severity)
+SELECT :patient_id, :symptom_name, :severity
+WHERE NOT EXISTS (
+    SELECT 1 FROM symptoms WHERE patient_id = :patient_id AND symptom_name = :symptom_name
+)
+"""
+
+# New admissions; the texts never change, so each pooled session parses them once
+INSERT_PATIENT = """
+INSERT INTO patient (name, birth_date, admission_date, status, notes)
+VALUES (:name, TO_DATE(:birth_date, 'YYYY-MM-DD'), TO_DATE(:admission_date, 'YYYY-MM-DD'), :status, :notes)
+"""
+INSERT_PATIENT_RETURNING = INSERT_PATIENT.rstrip() + " RETURNING patient_id INTO :patient_id\n"
+INSERT_DISEASE = "INSERT INTO disease (patient_id, disease_name) VALUES (:patient_id, :disease_name)"
+INSERT_SYMPTOM = """
+INSERT INTO symptoms (patient_id, symptom_name, severity)
+VALUES (:patient_id, :symptom_name, :severity)
+"""
+DEFAULT_STATUS = "STABLE"
+DEFAULT_ADMISSION_SEVERITY = "Mild"
+STATUSES = ('STABLE', 'CRITICAL', 'URGENT', 'GOOD', 'RECOVERING')
+SEVERITIES = ('Mild', 'Moderate', 'Severe', 'Critical')
+
+# Checked in this order by the Add Patient form and the bulk import alike
+ADMISSION_RULES = (
+    ('name', "Please enter the patient's name."),
+    ('disease_name', "Please enter the patient's disease."),
+)
+
+
+class BatchWriteError(Exception):
+    """Raised when rows of an ``executemany`` batch were rejected."""
+    def __init__(self, statement, errors):
+        self.errors = errors
+        details = "; ".join(f"row {e.offset}: {e.message}" for e in errors)
+        super().__init__(f"{len(errors)} row(s) failed in {statement.split()[0]}: {details}")
+
+
+def execute_batch(cursor, statement, rows):
+    """``executemany`` with batch errors; skips empty batches."""
+    if not rows:
+        return
+    cursor.executemany(statement, rows, batcherrors=True)
+    errors = cursor.getbatcherrors()
+    if errors:
+        raise BatchWriteError(statement, errors)
+
+
+def parse_symptoms(text):
+    """Parse "Symptom (Severity)" lines into {symptom: severity}."""
+    symptoms = {}
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if '(' in line and ')' in line:
+            name = line[:line.index('(')].strip()
+            severity = line[line.index('(')+1:line.index(')')].strip()
+        else:
+            name = line
+            severity = DEFAULT_SEVERITY
+        symptoms[name] = severity
+    return symptoms
+
+
+def parse_symptom_updates(text):
+    """Parse "symptom: severity" lines into {symptom: severity}; other lines are ignored."""
+    updates = {}
+    for line in text.strip().split('\n'):
+        if ':' in line:
+            symptom_name, severity = line.split(':', 1)
+            updates[symptom_name.strip()] = severity.strip()
+    return updates
+
+
+def upsert_symptoms(cursor, patient_id, symptoms):
+    """Insert or update ``symptoms`` ({name: severity}) for a patient in one array bind."""
+    rows = [
+        {'patient_id': patient_id, 'symptom_name': name, 'severity': severity}
+        for name, severity in symptoms.items()
+    ]
+    if database.backend() == "oracle":
+        execute_batch(cursor, MERGE_SYMPTOM, rows)
+    else:
+        execute_batch(cursor, UPDATE_SYMPTOM, rows)
+        execute_batch(cursor, INSERT_MISSING_SYMPTOM, rows)
+
+
+def fetch_conditions(cursor, patient_id):
+    """Current diseases (set) and symptoms ({name: severity}) in one query."""
+    cursor.execute("""
+        SELECT 'D', disease_name, NULL FROM disease WHERE patient_id = :id
+        UNION ALL
+        SELECT 'S', symptom_name, severity FROM symptoms WHERE patient_id = :id
+    """, {'id': patient_id})
+    diseases, symptoms = set(), {}
+    for kind, name, severity in cursor:
+        if kind == 'D':
+            diseases.add(name)
+        else:
+            symptoms[name] = severity
+    return diseases, symptoms
+
+
+def save_adjustment(connection, patient_id, status, notes, diseases, symptoms):
+    """Update a patient and bring its diseases/symptoms in line with the given sets.
+
+    ``diseases`` is an iterable of names, ``symptoms`` a {name: severity}
+    mapping.  Runs in the caller's transaction; the caller commits.
+    """
+    cursor = connection.cursor()
+    try:
+        # 1. Update basic patient information
+        cursor.execute("""
+        UPDATE patient
+        SET status = :status,
+            notes = :notes,
+            last_updated = SYSDATE
+        WHERE patient_id = :id
+        """, {'status': status, 'notes': notes, 'id': patient_id})
+
+        # 2. Diff against what is stored now
+        old_diseases, old_symptoms = fetch_conditions(cursor, patient_id)
+        new_diseases = set(diseases)
+
+        removed_diseases = [{'id': patient_id, 'disease': d} for d in old_diseases - new_diseases]
+        added_diseases = [{'id': patient_id, 'disease': d} for d in new_diseases - old_diseases]
+        removed_symptoms = [{'id': patient_id, 'symptom': s} for s in old_symptoms.keys() - symptoms.keys()]
+        added_symptoms = [
+            {'id': patient_id, 'symptom': s, 'severity': sev}
+            for s, sev in symptoms.items() if s not in old_symptoms
+        ]
+        changed_symptoms = [
+            {'id': patient_id, 'symptom': s, 'severity': sev}
+            for s, sev in symptoms.items() if s in old_symptoms and old_symptoms[s] != sev
+        ]
+
+        # 3. Send only the changes, one array bind per kind
+        execute_batch(cursor, "DELETE FROM disease WHERE patient_id = :id AND disease_name = :disease",
+                      removed_diseases)
+        execute_batch(cursor, "INSERT INTO disease (patient_id, disease_name) VALUES (:id, :disease)",
+                      added_diseases)
+        execute_batch(cursor, "DELETE FROM symptoms WHERE patient_id = :id AND symptom_name = :symptom",
+                      removed_symptoms)
+        execute_batch(cursor, """INSERT INTO symptoms (patient_id, symptom_name, severity)
+                VALUES (:id, :symptom, :severity)""", added_symptoms)
+        execute_batch(cursor, """UPDATE symptoms SET severity = :severity
+                WHERE patient_id = :id AND symptom_name = :symptom""", changed_symptoms)
+    finally:
+        cursor.close()
+
+
+def validate_admission(admission):
+    """(field, message) of the first problem with an admission, or None.
+
+    Applies ADMISSION_RULES plus the constraints the Add Patient form's
+    widgets enforce by themselves (dates, birth date not in the future,
+    status and severity choices), so imported rows meet the same bar.
+    """
+    for field, message in ADMISSION_RULES:
+        if not str(admission.get(field) or '').strip():
+            return field, message
+
+    dates = {}
+    for field in ('birth_date', 'admission_date'):
+        try:
+            dates[field] = date.fromisoformat(str(admission.get(field) or ''))
+        except ValueError:
+            return field, f"{field.replace('_', ' ').capitalize()} must be a date (YYYY-MM-DD)."
+    if dates['birth_date'] > date.today():
+        return 'birth_date', "Birth date cannot be in the future."
+
+    status = admission.get('status') or DEFAULT_STATUS
+    if status not in STATUSES:
+        return 'status', f"Unknown status '{status}' (expected one of {', '.join(STATUSES)})."
+    if not isinstance(admission.get('symptoms') or [], (list, tuple)):
+        return 'symptoms', "Symptoms must be a list."
+    for symptom in admission.get('symptoms') or ():
+        if isinstance(symptom, (list, tuple)):
+            if len(symptom) != 2:
+                return 'symptoms', f"Symptom {list(symptom)!r} must be a [name, severity] pair."
+        elif not isinstance(symptom, str):
+            return 'symptoms', f"Symptom {symptom!r} must be a name or a [name, severity] pair."
+    for row in symptom_rows(None, admission.get('symptoms')):
+        if not str(row['symptom_name'] or '').strip():
+            return 'symptoms', "Symptom names cannot be empty."
+        if row['severity'] not in SEVERITIES:
+            return 'symptoms', f"Unknown severity '{row['severity']}' for symptom '{row['symptom_name']}'."
+    return None
+
+
+def symptom_rows(patient_id, symptoms):
+    """Bind rows for ``symptoms``: [name, severity] pairs or bare names."""
+    rows = []
+    for symptom in symptoms or ():
+        if isinstance(symptom, (list, tuple)):
+            name, severity = symptom[0], symptom[1]
+        else:
+            name, severity = symptom, DEFAULT_ADMISSION_SEVERITY
+        rows.append({'patient_id': patient_id, 'symptom_name': name, 'severity': severity})
+    return rows
+
+
+def add_patient(connection, admission):
+    """Insert a new patient with its disease and symptoms; returns the patient_id.
+
+    ``admission`` is the Add Patient payload (name, disease_name,
+    birth_date, admission_date as YYYY-MM-DD, status, notes, symptoms).
+    Three round trips whatever the number of symptoms.  Runs in the
+    caller's transaction; the caller commits.
+    """
+    params = {
+        'name': admission['name'],
+        'birth_date': admission['birth_date'],
+        'admission_date': admission['admission_date'],
+        'status': admission.get('status') or DEFAULT_STATUS,
+        'notes': admission.get('notes') or '',
+    }
+    cursor = connection.cursor()
+    try:
+        if database.backend() == "oracle":
+            patient_id = cursor.var(int)
+            cursor.execute(INSERT_PATIENT_RETURNING, dict(params, patient_id=patient_id))
+            patient_id = patient_id.getvalue()[0]
+        else:
+            cursor.execute(INSERT_PATIENT, params)
+            patient_id = cursor.lastrowid
+
+        cursor.execute(INSERT_DISEASE, {'patient_id': patient_id, 'disease_name': admission['disease_name']})
+        execute_batch(cursor, INSERT_SYMPTOM, symptom_rows(patient_id, admission.get('symptoms')))
+    finally:
+        cursor.close()
+    return patient_id
+
+
+def add_patients(connection, admissions):
+    """Insert validated admissions with array DML; returns their patient_ids in order.
+
+    Three round trips for the whole batch: patients (ids come back through
+    RETURNING into an array variable), diseases and symptoms.  Runs in the
+    caller's transaction; the caller commits.
+    """
+    patients = [{
+        'name': admission['name'],
+        'birth_date': admission['birth_date'],
+        'admission_date': admission['admission_date'],
+        'status': admission.get('status') or DEFAULT_STATUS,
+        'notes': admission.get('notes') or '',
+    } for admission in admissions]
+    cursor = connection.cursor()
+    try:
+        if database.backend() == "oracle":
+            ids = cursor.var(int, arraysize=len(patients))
+            cursor.setinputsizes(patient_id=ids)
+            cursor.executemany(INSERT_PATIENT_RETURNING, patients)
+            patient_ids = [ids.getvalue(i)[0] for i in range(len(patients))]
+        else:
+            # The stand-in cannot return ids from an array insert; it is local, so go row by row
+            patient_ids = []
+            for params in patients:
+                cursor.execute(INSERT_PATIENT, params)
+                patient_ids.append(cursor.lastrowid)
+
+        execute_batch(cursor, INSERT_DISEASE, [
+            {'patient_id': patient_id, 'disease_name': admission['disease_name']}
+            for patient_id, admission in zip(patient_ids, admissions)
+        ])
+        execute_batch(cursor, INSERT_SYMPTOM, [
+            row
+            for patient_id, admission in zip(patient_ids, admissions)
+            for row in symptom_rows(patient_id, admission.get('symptoms'))
+        ])
+    finally:
+        cursor.close()
+    return patient_ids
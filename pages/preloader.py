@@ -0,0 +1,109 @@
+"""Work done behind the post-login splash screen.
+
+The preloader runs the steps below at the same time on the query executor:
+- warm the connection pool
+- finish importing the workspace modules
+- prefetch the first page of patients
+- prefetch the dashboard aggregates
+
+It reports each step as it completes, so the splash shows real progress
+and is dismissed as soon as everything is done.  A failed step is logged
+and counted as done; the workspace that needed it simply loads on its own
+later.
+
+Prefetched results are parked here and handed over once through ``take``
+to the first widget that asks for them, if they are still fresh.
+"""
+import time
+
+from PyQt5 import QtCore
+
+from pages import startup
+from pages.query_executor import describe_error, executor
+
+PREFETCH_MAX_AGE = 120  # seconds a prefetched result may be handed over
+
+_prefetched = {}  # name -> (monotonic time, value)
+
+
+def take(name, max_age=PREFETCH_MAX_AGE):
+    """Prefetched value for ``name`` (once), or None if missing or stale."""
+    stamped = _prefetched.pop(name, None)
+    if stamped is None or time.monotonic() - stamped[0] > max_age:
+        return None
+    return stamped[1]
+
+
+def _warm_pool(connection):
+    # Borrowing the session is the work: it creates the pool and opens its first session
+    return None
+
+
+def _import_workspaces():
+    # Joins the warm-up started after the login page was shown (or starts it)
+    startup.warm_up().join()
+
+
+def _fetch_patients(connection):
+    from pages.patient_model import FIRST_PAGE_SIZE, fetch_patient_page
+    return fetch_patient_page(connection, None, FIRST_PAGE_SIZE)
+
+
+def _fetch_disease_stats(connection):
+    from pages.disease_stats import DiseaseStats, fetch_disease_stats
+    return DiseaseStats(fetch_disease_stats(connection))
+
+
+# (label, work, needs_connection, name the result is parked under or None)
+STEPS = (
+    ("Connecting to the database", _warm_pool, True, None),
+    ("Loading workspaces", _import_workspaces, False, None),
+    ("Loading patients", _fetch_patients, True, "patients"),
+    ("Loading statistics", _fetch_disease_stats, True, "disease_stats"),
+)
+
+
+class Preloader(QtCore.QObject):
+    """Runs STEPS in the background; emits ``progress(done, label)`` and ``finished``."""
+    progress = QtCore.pyqtSignal(int, str)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, steps=STEPS, parent=None):
+        super().__init__(parent)
+        self.steps = steps
+        self.done = 0
+        self.timings = {}  # label -> seconds from start to completion
+        self._pending = []
+        self._started = None
+
+    def __len__(self):
+        return len(self.steps)
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._pending = [label for label, *_ in self.steps]
+        for label, work, needs_connection, name in self.steps:
+            executor().submit(
+                work,
+                lambda result, label=label, name=name: self._step_done(label, name, result),
+                lambda error, label=label: self._step_failed(label, error),
+                busy=False, needs_connection=needs_connection,
+            )
+        self.progress.emit(0, self._pending[0] if self._pending else "")
+
+    def _step_done(self, label, name, result):
+        if name is not None:
+            _prefetched[name] = (time.monotonic(), result)
+        self._advance(label)
+
+    def _step_failed(self, label, error):
+        print(f"Preload step '{label}' failed: {describe_error(error)}")
+        self._advance(label)
+
+    def _advance(self, label):
+        self.timings[label] = time.perf_counter() - self._started
+        self._pending.remove(label)
+        self.done += 1
+        self.progress.emit(self.done, self._pending[0] if self._pending else "Ready")
+        if not self._pending:
+            self.finished.emit()
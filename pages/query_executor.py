@@ -0,0 +1,240 @@
+"""Background query execution for the pages.
+
+Database work runs on a ``QThreadPool`` and its results come back to the GUI
+thread through Qt signals, so a slow round trip no longer freezes the window.
+Tasks are tied to an owner page: while the page has work in flight it shows a
+busy indicator, and its pending work is dropped when the user navigates away
+from it in the main ``QStackedWidget``.
+"""
+import threading
+
+from PyQt5 import QtCore, QtWidgets
+
+from pages import database
+from pages.database import describe_error  # re-exported for the pages
+
+
+class QuerySignals(QtCore.QObject):
+    """Signals a QueryTask uses to report back to the GUI thread."""
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object)
+    done = QtCore.pyqtSignal()
+
+
+class QueryTask(QtCore.QRunnable):
+    """Runs ``work(connection)`` on a pooled session in a worker thread."""
+    def __init__(self, work, owner_key=None, needs_connection=True):
+        super().__init__()
+        self.setAutoDelete(False)  # QueryExecutor._running holds it until done is delivered
+        self.work = work
+        self.owner_key = owner_key
+        self.needs_connection = needs_connection
+        self.signals = QuerySignals()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._connection = None
+        self.on_cancel = None  # set by QueryExecutor.submit
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Drop the result and interrupt the statement if one is running."""
+        self._cancelled.set()
+        with self._lock:
+            connection = self._connection
+        if connection is not None:
+            try:
+                connection.cancel()
+            except Exception:
+                pass
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            if self.needs_connection:
+                result = self._run_with_connection()
+            else:
+                result = self.work()
+            if not self.cancelled:
+                self.signals.finished.emit(result)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(e)
+        finally:
+            self.signals.done.emit()
+
+    def _run_with_connection(self):
+        connection = database.acquire()
+        with self._lock:
+            self._connection = connection
+        try:
+            return self.work(connection)
+        finally:
+            with self._lock:
+                self._connection = None
+            connection.close()
+
+
+class BusyOverlay(QtWidgets.QWidget):
+    """Translucent 'Loading...' overlay covering a page while it waits."""
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_StyledBackground, True)
+        self.setStyleSheet("background-color: rgba(255, 255, 255, 0.6);")
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setAlignment(QtCore.Qt.AlignCenter)
+
+        label = QtWidgets.QLabel("Loading...")
+        label.setAlignment(QtCore.Qt.AlignCenter)
+        label.setStyleSheet("background: transparent; color: #2c3e50; font-size: 16px; font-weight: bold;")
+        layout.addWidget(label)
+
+        progress = QtWidgets.QProgressBar()
+        progress.setRange(0, 0)  # indeterminate
+        progress.setFixedSize(220, 12)
+        progress.setTextVisible(False)
+        layout.addWidget(progress, alignment=QtCore.Qt.AlignCenter)
+
+        parent.installEventFilter(self)
+        self.setGeometry(parent.rect())
+        self.hide()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QtCore.QEvent.Resize:
+            self.setGeometry(obj.rect())
+        return super().eventFilter(obj, event)
+
+    def show_busy(self):
+        self.setGeometry(self.parent().rect())
+        self.raise_()
+        self.show()
+
+
+class QueryExecutor(QtCore.QObject):
+    """Schedules QueryTasks and routes their results to owner pages."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QtCore.QThreadPool(self)
+        # One worker per pooled session so threads never queue on the pool.
+        self.thread_pool.setMaxThreadCount(database.POOL_MAX)
+        self._tasks = {}      # owner key -> set of in-flight tasks
+        self._running = set()  # every submitted task, owned or not, until its done signal
+        self._owners = {}     # owner key -> owner widget
+        self._overlays = {}   # owner key -> BusyOverlay
+
+    def submit(self, work, on_result=None, on_error=None, owner=None, busy=True, needs_connection=True,
+               on_cancel=None):
+        """Run ``work`` in the background and deliver its result to ``on_result``.
+
+        ``work`` receives a pooled connection unless ``needs_connection`` is
+        False.  Callbacks run on the GUI thread and are skipped if the task
+        was cancelled in the meantime; ``on_cancel`` is called instead when
+        navigation cancels it, so the caller can clear in-flight state.
+        """
+        key = id(owner) if owner is not None else None
+        task = QueryTask(work, key, needs_connection)
+        task.on_cancel = on_cancel
+
+        if on_result is not None:
+            task.signals.finished.connect(lambda result, t=task: None if t.cancelled else on_result(result))
+        if on_error is not None:
+            task.signals.failed.connect(lambda error, t=task: None if t.cancelled else on_error(error))
+        task.signals.done.connect(lambda t=task: self._task_finished(t))
+        # Neither the pool nor anything else owns the task; without this reference
+        # the task/signals/lambda cycle can be collected while it still runs.
+        self._running.add(task)
+
+        if owner is not None:
+            if key not in self._owners:
+                self._owners[key] = owner
+                owner.destroyed.connect(lambda *_, k=key: self._forget_owner(k))
+            self._tasks.setdefault(key, set()).add(task)
+            if busy and isinstance(owner, QtWidgets.QWidget):
+                self._show_busy(key, owner)
+
+        self.thread_pool.start(task)
+        return task
+
+    def pending(self, owner):
+        """Number of unfinished tasks belonging to ``owner``."""
+        return len(self._tasks.get(id(owner), ()))
+
+    def cancel(self, owner):
+        """Cancel every task belonging to ``owner``."""
+        self._cancel_key(id(owner))
+
+    def cancel_all(self):
+        for key in list(self._tasks):
+            self._cancel_key(key)
+
+    def shutdown(self, timeout_ms=3000):
+        """Cancel everything and wait for running tasks to return their sessions."""
+        self.cancel_all()
+        self.thread_pool.waitForDone(timeout_ms)
+
+    def watch_stack(self, stacked_widget):
+        """Cancel a page's queries when the stacked widget navigates away from it."""
+        stacked_widget.currentChanged.connect(
+            lambda index: self._cancel_hidden(stacked_widget.widget(index))
+        )
+
+    def _cancel_hidden(self, current):
+        for key, owner in list(self._owners.items()):
+            if owner is current:
+                continue
+            # Keep work owned by widgets living inside the page now shown.
+            if current is not None and isinstance(owner, QtWidgets.QWidget) and current.isAncestorOf(owner):
+                continue
+            self._cancel_key(key)
+
+    def _cancel_key(self, key):
+        for task in list(self._tasks.get(key, ())):
+            task.cancel()
+            if self.thread_pool.tryTake(task):
+                self._running.discard(task)  # never started, so done will not come
+            self._task_done(task)
+            if task.on_cancel is not None:
+                task.on_cancel()
+
+    def _task_finished(self, task):
+        self._running.discard(task)
+        self._task_done(task)
+
+    def _task_done(self, task):
+        tasks = self._tasks.get(task.owner_key)
+        if tasks is None or task not in tasks:
+            return
+        tasks.discard(task)
+        if not tasks:
+            del self._tasks[task.owner_key]
+            overlay = self._overlays.get(task.owner_key)
+            if overlay is not None:
+                overlay.hide()
+
+    def _show_busy(self, key, owner):
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = BusyOverlay(owner)
+            self._overlays[key] = overlay
+        overlay.show_busy()
+
+    def _forget_owner(self, key):
+        for task in self._tasks.pop(key, ()):
+            task.cancel()
+        self._owners.pop(key, None)
+        self._overlays.pop(key, None)
+
+
+_executor = None
+
+
+def executor():
+    """Return the process-wide QueryExecutor (created on first use)."""
+    global _executor
+    if _executor is None:
+        _executor = QueryExecutor(QtWidgets.QApplication.instance())
+    return _executor
@@ -0,0 +1,264 @@
+"""Structured shift schedule for the Worker Timing pages.
+
+Shifts live in the normalized SHIFTS table, one row per (worker, day) with
+start/end in minutes after midnight.  Overnight shifts end after 1440.
+``EMPLOYEES.SCHEDULED_DAYS`` ("M:8a-4p;T:8a-4p;...") is only parsed to
+fill that table (``python -m pages.shift_schedule --migrate``), or as a
+fallback while the table does not exist yet; either way it is parsed once
+per load, not once per render.
+
+``ShiftSchedule`` holds the shifts of one load in compact typed arrays and
+indexes them by (department, day) sorted by start time.  From that it
+answers:
+- ``week_grid()``: pre-formatted cells for the schedule table;
+- ``on_duty(day, minute)``: who is working at a moment such as "3 a.m.
+  Thursday", in O(log n + k) per day, including shifts that started the
+  evening before.
+"""
+import argparse
+import bisect
+from array import array
+
+from pages import database
+
+DAY_CODES = ('M', 'T', 'W', 'Th', 'F', 'Sa', 'Su')  # SCHEDULED_DAYS codes, Monday = 0
+MINUTES_PER_DAY = 24 * 60
+
+# Shift kinds by start time, matching the schedule legend
+MORNING, AFTERNOON, NIGHT, OFF = "Morning", "Afternoon", "Night", "Day Off"
+
+SHIFTS_DDL = (
+    """CREATE TABLE SHIFTS (
+        WORKER_ID    VARCHAR2(50) NOT NULL,
+        DAY_OF_WEEK  NUMBER(1)    NOT NULL,
+        START_MINUTE NUMBER(4)    NOT NULL,
+        END_MINUTE   NUMBER(4)    NOT NULL,
+        CONSTRAINT SHIFTS_PK PRIMARY KEY (WORKER_ID, DAY_OF_WEEK, START_MINUTE)
+    )""",
+    "CREATE INDEX SHIFTS_DAY_IDX ON SHIFTS (DAY_OF_WEEK, START_MINUTE)",
+)
+
+SHIFTS_QUERY = """
+    SELECT e.WORKER_ID, e.FULL_NAME, e.DEPARTEMENT, s.DAY_OF_WEEK, s.START_MINUTE, s.END_MINUTE
+    FROM EMPLOYEES e
+    LEFT JOIN SHIFTS s ON s.WORKER_ID = e.WORKER_ID
+    {where_clause}
+    ORDER BY e.FULL_NAME, e.WORKER_ID, s.DAY_OF_WEEK, s.START_MINUTE
+"""
+LEGACY_QUERY = """
+    SELECT WORKER_ID, FULL_NAME, DEPARTEMENT, SCHEDULED_DAYS
+    FROM EMPLOYEES
+    {where_clause}
+    ORDER BY FULL_NAME, WORKER_ID
+"""
+INSERT_SHIFT = """
+    INSERT INTO SHIFTS (WORKER_ID, DAY_OF_WEEK, START_MINUTE, END_MINUTE)
+    VALUES (:worker_id, :day, :start_minute, :end_minute)
+"""
+
+
+def parse_time(text):
+    """'8a' -> 480, '12p' -> 720, '8:30p' -> 1230, '14:00' -> 840; None if unreadable."""
+    text = text.strip().lower()
+    suffix = text[-1:] if text[-1:] in ('a', 'p') else ''
+    hours, _, minutes = text.rstrip('ap').partition(':')
+    try:
+        hours, minutes = int(hours), int(minutes or 0)
+    except ValueError:
+        return None
+    if suffix:
+        if not 1 <= hours <= 12:
+            return None
+        hours = hours % 12 + (12 if suffix == 'p' else 0)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def format_time(minute):
+    """480 -> '8a', 1230 -> '8:30p' (the SCHEDULED_DAYS style)."""
+    hours, minutes = divmod(minute % MINUTES_PER_DAY, 60)
+    suffix = 'a' if hours < 12 else 'p'
+    hours = hours % 12 or 12
+    return f"{hours}{suffix}" if not minutes else f"{hours}:{minutes:02d}{suffix}"
+
+
+def parse_scheduled_days(text):
+    """[(day, start, end)] from a SCHEDULED_DAYS string; unreadable entries are skipped."""
+    shifts = []
+    for entry in (text or '').split(';'):
+        code, _, hours = entry.partition(':')
+        code = code.strip()
+        if code not in DAY_CODES or '-' not in hours:
+            continue
+        start_text, _, end_text = hours.partition('-')
+        start, end = parse_time(start_text), parse_time(end_text)
+        if start is None or end is None:
+            continue
+        if end <= start:
+            end += MINUTES_PER_DAY  # overnight
+        shifts.append((DAY_CODES.index(code), start, end))
+    return shifts
+
+
+def shift_kind(start):
+    if 5 * 60 <= start < 12 * 60:
+        return MORNING
+    if 12 * 60 <= start < 18 * 60:
+        return AFTERNOON
+    return NIGHT
+
+
+class ShiftSchedule:
+    """Shifts of a set of workers in typed arrays, indexed by (department, day)."""
+    def __init__(self):
+        self.workers = []              # (worker_id, full_name, department), in display order
+        self._worker_rows = {}         # worker_id -> index into self.workers
+        self.worker = array('i')       # one entry per shift
+        self.day = array('b')
+        self.start = array('h')
+        self.end = array('h')
+        self._index = {}               # (department or None, day) -> (starts, shift rows)
+        self._longest = 0
+        self._grid = None
+
+    def __len__(self):
+        return len(self.worker)
+
+    def add_worker(self, worker_id, full_name, department):
+        row = self._worker_rows.get(worker_id)
+        if row is None:
+            row = self._worker_rows[worker_id] = len(self.workers)
+            self.workers.append((worker_id, full_name, department))
+        return row
+
+    def add_shift(self, worker_row, day, start, end):
+        self.worker.append(worker_row)
+        self.day.append(day)
+        self.start.append(start)
+        self.end.append(end)
+
+    def build_index(self):
+        """Sort each (department, day) bucket by start; call once after adding shifts."""
+        buckets = {}
+        for shift in range(len(self.worker)):
+            department = self.workers[self.worker[shift]][2]
+            buckets.setdefault((None, self.day[shift]), []).append(shift)
+            if department is not None:  # NULL-department shifts are only in the all-departments bucket
+                buckets.setdefault((department, self.day[shift]), []).append(shift)
+            self._longest = max(self._longest, self.end[shift] - self.start[shift])
+        for key, shifts in buckets.items():
+            shifts.sort(key=self.start.__getitem__)
+            self._index[key] = (array('h', (self.start[s] for s in shifts)), array('i', shifts))
+        self._grid = self._build_grid()
+        return self
+
+    def _build_grid(self):
+        cells = [[None] * len(DAY_CODES) for _ in self.workers]
+        for shift in range(len(self.worker)):
+            label = f"{format_time(self.start[shift])}-{format_time(self.end[shift])}"
+            row, day = cells[self.worker[shift]], self.day[shift]
+            # Two shifts on one day share the cell; the first one colours it
+            row[day] = (label, shift_kind(self.start[shift])) if row[day] is None \
+                else (f"{row[day][0]}, {label}", row[day][1])
+        return [(worker_id, name, [cell or ("OFF", OFF) for cell in row])
+                for (worker_id, name, _), row in zip(self.workers, cells)]
+
+    def week_grid(self):
+        """[(worker_id, full_name, [(label, kind)] * 7)] in display order."""
+        return self._grid
+
+    def shifts_on(self, day, department=None):
+        """Shift rows starting on ``day`` (0 = Monday), sorted by start."""
+        return self._index.get((department, day), (array('h'), array('i')))[1]
+
+    def on_duty(self, day, minute, department=None):
+        """Worker IDs on shift at ``minute`` after midnight on ``day``."""
+        on = []
+        # Shifts starting today, plus last night's overnight shifts (shifted back a day)
+        for shift_day, at in ((day, minute), ((day - 1) % 7, minute + MINUTES_PER_DAY)):
+            starts, shifts = self._index.get((department, shift_day), (array('h'), array('i')))
+            # Only shifts that started within the longest shift length can still be running
+            low = bisect.bisect_left(starts, at - self._longest)
+            high = bisect.bisect_right(starts, at)
+            for i in range(low, high):
+                if self.end[shifts[i]] > at:
+                    on.append(self.workers[self.worker[shifts[i]]][0])
+        return on
+
+
+def _dept_params(dept, column):
+    if not dept:
+        return "", {}
+    return f"WHERE {column} = :dept", {'dept': dept}
+
+
+def fetch_shift_schedule(connection, dept):
+    """ShiftSchedule for one department (or everyone), built on the worker thread."""
+    schedule = ShiftSchedule()
+    cursor = connection.cursor()
+    try:
+        where_clause, params = _dept_params(dept, "e.DEPARTEMENT")
+        try:
+            cursor.execute(SHIFTS_QUERY.format(where_clause=where_clause), params)
+        except database.DatabaseError as error:
+            # SHIFTS not created yet: read the packed strings (parsed once for this load)
+            print(f"SHIFTS table unavailable ({error}); reading EMPLOYEES.SCHEDULED_DAYS")
+            where_clause, params = _dept_params(dept, "DEPARTEMENT")
+            cursor.execute(LEGACY_QUERY.format(where_clause=where_clause), params)
+            for worker_id, full_name, department, scheduled_days in cursor:
+                row = schedule.add_worker(worker_id, full_name, department)
+                for day, start, end in parse_scheduled_days(scheduled_days):
+                    schedule.add_shift(row, day, start, end)
+            return schedule.build_index()
+
+        for worker_id, full_name, department, day, start, end in cursor:
+            row = schedule.add_worker(worker_id, full_name, department)
+            if day is not None:
+                schedule.add_shift(row, int(day), int(start), int(end))
+    finally:
+        cursor.close()
+    return schedule.build_index()
+
+
+def migrate_scheduled_days(connection):
+    """Fill SHIFTS from EMPLOYEES.SCHEDULED_DAYS in one array insert; returns the row count."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT WORKER_ID, SCHEDULED_DAYS FROM EMPLOYEES WHERE SCHEDULED_DAYS IS NOT NULL")
+        rows = [
+            {'worker_id': worker_id, 'day': day, 'start_minute': start, 'end_minute': end}
+            for worker_id, scheduled_days in cursor.fetchall()
+            for day, start, end in parse_scheduled_days(scheduled_days)
+        ]
+        cursor.execute("DELETE FROM SHIFTS")
+        if rows:
+            cursor.executemany(INSERT_SHIFT, rows)
+        connection.commit()
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shift schedule maintenance")
+    parser.add_argument("--create", action="store_true", help="create the SHIFTS table and index")
+    parser.add_argument("--migrate", action="store_true", help="fill SHIFTS from EMPLOYEES.SCHEDULED_DAYS")
+    args = parser.parse_args()
+
+    with database.connection() as connection:
+        if args.create:
+            cursor = connection.cursor()
+            try:
+                for statement in SHIFTS_DDL:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+            print("SHIFTS table created")
+        if args.migrate:
+            print(f"{migrate_scheduled_days(connection)} shift(s) written to SHIFTS")
+    database.close_pool()
+
+
+if __name__ == "__main__":
+    main()
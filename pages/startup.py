@@ -0,0 +1,61 @@
+"""Deferred loading of the heavy workspace modules.
+
+The login page only needs PyQt5, so the analytics stacks (numpy,
+pyqtgraph, QtChart, matplotlib/seaborn) and the workspace pages built on
+them are not imported at startup.  ``warm_up`` imports them on a daemon
+thread once the login page has been shown, so that by the time the user
+has signed in they are usually already in ``sys.modules``; if not, the
+first ``load_workspace`` simply waits on Python's import lock.
+"""
+import importlib
+import threading
+import time
+
+# Workspace card title -> (module, widget class)
+WORKSPACES = {
+    "Patients Space": ("pages.patient", "PatientWidget"),
+    "Data Dashboard": ("pages.dashboard", "DiseaseStatsDashboard"),
+    "Worker Timing": ("pages.workerTiming", "WorkerTimingSpace"),
+}
+
+# Imported by warm_up, in order: what the main window needs first, then the workspaces
+WARM_MODULES = (
+    "numpy",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_qt5agg",
+    "seaborn",
+    "pages.patient",
+    "pyqtgraph",
+    "pages.dashboard",
+    "PyQt5.QtChart",
+    "pages.workerTiming",
+)
+
+_thread = None
+timings = {}  # module -> seconds spent importing it in warm_up
+
+
+def load_workspace(name):
+    """Widget class for a workspace card, importing its module on first use."""
+    module_name, class_name = WORKSPACES[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _warm(modules):
+    for module_name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            # The real import on the GUI thread will report it
+            print(f"Warm-up import of {module_name} failed: {e}")
+        timings[module_name] = time.perf_counter() - start
+
+
+def warm_up(modules=WARM_MODULES):
+    """Import ``modules`` on a background thread (once per process)."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=_warm, args=(modules,), name="module-warm-up", daemon=True)
+        _thread.start()
+    return _thread
@@ -0,0 +1,127 @@
+"""Approve/Deny buttons painted into the time-off table's action column.
+
+One delegate paints the two buttons on every pending row and handles their
+clicks, instead of a QWidget with two QPushButtons per row, so the table
+costs no widgets or layouts however many requests are pending.
+
+Keyboard: in the action cell, Left/Right move between the two buttons and
+Space/Enter presses the focused one.  Anywhere in the table, A approves
+and D denies every selected pending row at once.
+"""
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from pages.time_off_model import ACTION_COLUMN
+
+# (label, status it sets, colour)
+ACTIONS = (
+    ("Approve", "Approved", QtGui.QColor("#2ecc71")),
+    ("Deny", "Denied", QtGui.QColor("#e74c3c")),
+)
+SHORTCUTS = {QtCore.Qt.Key_A: "Approved", QtCore.Qt.Key_D: "Denied"}
+BUTTON_MARGIN = 3
+BUTTON_WIDTH = 70
+
+
+class ActionButtonDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints the action buttons of a view over a TimeOffTableModel.
+
+    ``decided(rows, status)`` is emitted with model rows when a button is
+    clicked or pressed from the keyboard.
+    """
+    decided = QtCore.pyqtSignal(object, str)
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.focused_button = 0
+        self._pressed = None  # (row, button) under a mouse press
+        view.installEventFilter(self)
+
+    def _button_rects(self, rect):
+        width = min(BUTTON_WIDTH, (rect.width() - 3 * BUTTON_MARGIN) // len(ACTIONS))
+        height = rect.height() - 2 * BUTTON_MARGIN
+        return [
+            QtCore.QRect(rect.left() + BUTTON_MARGIN + i * (width + BUTTON_MARGIN),
+                         rect.top() + BUTTON_MARGIN, width, height)
+            for i in range(len(ACTIONS))
+        ]
+
+    def _actionable(self, index):
+        return index.column() == ACTION_COLUMN and index.model().is_actionable(index.row())
+
+    def paint(self, painter, option, index):
+        if not self._actionable(index):
+            super().paint(painter, option, index)
+            return
+
+        has_focus = bool(option.state & QtWidgets.QStyle.State_HasFocus)
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        for button, (rect, (label, _, color)) in enumerate(zip(self._button_rects(option.rect), ACTIONS)):
+            pressed = self._pressed == (index.row(), button)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(color.darker(130) if pressed else color)
+            painter.drawRoundedRect(rect, 3, 3)
+            painter.setPen(QtCore.Qt.white)
+            painter.drawText(rect, QtCore.Qt.AlignCenter, label)
+            if has_focus and button == self.focused_button:
+                painter.setPen(QtGui.QPen(QtCore.Qt.white, 1, QtCore.Qt.DotLine))
+                painter.setBrush(QtCore.Qt.NoBrush)
+                painter.drawRoundedRect(rect.adjusted(2, 2, -2, -2), 2, 2)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        hint = super().sizeHint(option, index)
+        if index.column() == ACTION_COLUMN:
+            hint.setWidth(max(hint.width(), len(ACTIONS) * (BUTTON_WIDTH + BUTTON_MARGIN) + BUTTON_MARGIN))
+        return hint
+
+    def editorEvent(self, event, model, option, index):
+        if not self._actionable(index):
+            return False
+        if event.type() not in (QtCore.QEvent.MouseButtonPress, QtCore.QEvent.MouseButtonRelease):
+            return False
+
+        button = next((i for i, rect in enumerate(self._button_rects(option.rect))
+                       if rect.contains(event.pos())), None)
+        if event.type() == QtCore.QEvent.MouseButtonPress:
+            self._pressed = (index.row(), button) if button is not None else None
+            self.view.viewport().update(option.rect)
+            return button is not None
+
+        pressed, self._pressed = self._pressed, None
+        self.view.viewport().update(option.rect)
+        if button is not None and pressed == (index.row(), button):
+            self.focused_button = button
+            self.decided.emit([index.row()], ACTIONS[button][1])
+            return True
+        return False
+
+    def eventFilter(self, obj, event):
+        if obj is self.view and event.type() == QtCore.QEvent.KeyPress:
+            return self._key_pressed(event)
+        return super().eventFilter(obj, event)
+
+    def _key_pressed(self, event):
+        key = event.key()
+        if key in SHORTCUTS and not event.modifiers() & ~QtCore.Qt.ShiftModifier:
+            rows = sorted({index.row() for index in self.view.selectionModel().selectedRows()})
+            if not rows and self.view.currentIndex().isValid():
+                rows = [self.view.currentIndex().row()]
+            if rows:
+                self.decided.emit(rows, SHORTCUTS[key])
+            return True
+
+        current = self.view.currentIndex()
+        if not current.isValid() or not self._actionable(current):
+            return False
+        if key == QtCore.Qt.Key_Left and self.focused_button > 0:
+            self.focused_button -= 1
+        elif key == QtCore.Qt.Key_Right and self.focused_button < len(ACTIONS) - 1:
+            self.focused_button += 1
+        elif key in (QtCore.Qt.Key_Space, QtCore.Qt.Key_Return, QtCore.Qt.Key_Enter):
+            self.decided.emit([current.row()], ACTIONS[self.focused_button][1])
+        else:
+            return False
+        self.view.viewport().update(self.view.visualRect(current))
+        return True
@@ -0,0 +1,110 @@
+"""Table model behind the Worker Timing time-off list.
+
+Rows are the request tuples returned by ``timing_data.fetch_time_off``
+(name, type, start, end, duration, status, worker_id).  Approving,
+denying or submitting a request changes one row in place and repaints only
+that row, so the list never has to be re-queried for a write the page
+made itself.
+"""
+from PyQt5 import QtCore
+
+from pages import timing_data
+
+HEADERS = ["Employee", "Request Type", "Start Date", "End Date", "Duration", "Status", "Action"]
+NAME, TYPE, START, END, DURATION, STATUS, WORKER_ID = range(7)
+ACTION_COLUMN = 6
+
+
+class TimeOffTableModel(QtCore.QAbstractTableModel):
+    """Read-only model over time-off requests; ``can_decide`` enables the actions."""
+    def __init__(self, can_decide=False, parent=None):
+        super().__init__(parent)
+        self.can_decide = can_decide
+        self._rows = []
+        self._staff = 0
+
+    def set_requests(self, result):
+        """Replace the contents with a ``fetch_time_off`` result."""
+        requests, counts = result
+        self.beginResetModel()
+        self._rows = [list(request) for request in requests]
+        self._staff = counts[3]
+        self.endResetModel()
+
+    def snapshot(self):
+        """The current contents as a ``fetch_time_off`` result (for the cache)."""
+        requests = [tuple(row) for row in self._rows]
+        return requests, timing_data.status_counts(requests, self._staff)
+
+    def counts(self):
+        return timing_data.status_counts(self._rows, self._staff)
+
+    def row_of(self, worker_id):
+        for row, request in enumerate(self._rows):
+            if request[WORKER_ID] == worker_id:
+                return row
+        return None
+
+    def request_at(self, row):
+        return tuple(self._rows[row])
+
+    def set_status(self, worker_id, status):
+        """Change one request's status; returns the previous status (None if not listed)."""
+        row = self.row_of(worker_id)
+        if row is None:
+            return None
+        previous, self._rows[row][STATUS] = self._rows[row][STATUS], status
+        self.dataChanged.emit(self.index(row, STATUS), self.index(row, ACTION_COLUMN))
+        return previous
+
+    def put_request(self, request):
+        """Insert or replace a worker's request, keeping the start-date order; returns the
+        request it replaced (None if it was new)."""
+        row = self.row_of(request[WORKER_ID])
+        previous = None
+        if row is not None:
+            previous = tuple(self._rows[row])
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        position = next((i for i, other in enumerate(self._rows)
+                         if (other[START] or "") > (request[START] or "")), len(self._rows))
+        self.beginInsertRows(QtCore.QModelIndex(), position, position)
+        self._rows.insert(position, list(request))
+        self.endInsertRows()
+        return previous
+
+    def remove_request(self, worker_id):
+        row = self.row_of(worker_id)
+        if row is not None:
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+
+    def is_actionable(self, row):
+        return self.can_decide and self._rows[row][STATUS] == "Pending"
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        request, column = self._rows[index.row()], index.column()
+        if role == QtCore.Qt.DisplayRole:
+            if column == DURATION:
+                return f"{request[DURATION]} days"
+            if column == ACTION_COLUMN:
+                if request[STATUS] != "Pending":
+                    return "No action"
+                return "" if self.can_decide else "Permission denied"
+            return "" if request[column] is None else str(request[column])
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
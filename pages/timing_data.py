@@ -0,0 +1,148 @@
+"""Data behind the Worker Timing tabs.
+
+Each tab's data comes back in a single statement (one round trip), with
+any aggregates folded in as extra rows tagged by a leading ``kind``
+column, so a tab costs one round trip instead of two or three.  The
+widget loads the visible tab first and the others concurrently on their
+own pooled sessions.
+
+Results are kept per (view, department) in ``TimingCache`` until a write
+invalidates the view or MAX_AGE passes, so switching tabs or re-applying a
+filter already seen does not touch the database.  The schedule view is a
+``shift_schedule.ShiftSchedule``.
+"""
+import threading
+import time
+
+from pages.shift_schedule import fetch_shift_schedule
+
+VIEWS = ("schedule", "performance", "time_off")
+MAX_AGE = 60  # seconds a cached view is shown without reloading
+
+
+def _dept_filter(dept, prefix="WHERE"):
+    return f"{prefix} DEPARTEMENT = :dept" if dept else ""
+
+
+PERFORMANCE_QUERY = """
+    SELECT 'E', FULL_NAME, HOURS_WORKED, OVERTIME_HOURS, PUNCTUALITY_SCORE, PERFORMANCE_SCORE
+    FROM EMPLOYEES
+    {where_clause}
+    UNION ALL
+    SELECT 'S', NULL, ROUND(AVG(HOURS_WORKED), 2), ROUND(AVG(OVERTIME_HOURS), 2),
+           ROUND(AVG(PUNCTUALITY_SCORE), 1), COUNT(*)
+    FROM EMPLOYEES
+    {where_clause}
+    UNION ALL
+    SELECT 'D', DEPARTEMENT, ROUND(AVG(HOURS_WORKED), 2), NULL, ROUND(AVG(PUNCTUALITY_SCORE), 1), NULL
+    FROM EMPLOYEES
+    WHERE DEPARTEMENT IS NOT NULL
+    GROUP BY DEPARTEMENT
+    ORDER BY 1, 6 DESC, 2
+"""
+
+
+def fetch_performance(connection, dept):
+    """(employee rows, (avg hours, avg overtime, avg punctuality, staff), per-department rows)."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(PERFORMANCE_QUERY.format(where_clause=_dept_filter(dept)),
+                       {'dept': dept} if dept else {})
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    employees = [row[1:] for row in rows if row[0] == 'E']
+    stats = next(row[2:] for row in rows if row[0] == 'S')
+    departments = [(row[1], row[2], row[4]) for row in rows if row[0] == 'D']
+    return employees, stats, departments
+
+
+TIME_OFF_QUERY = """
+    SELECT 'R', FULL_NAME, TIME_OFF_TYPE,
+           TO_CHAR(TIME_OFF_START_DATE, 'YYYY-MM-DD'), TO_CHAR(TIME_OFF_END_DATE, 'YYYY-MM-DD'),
+           TIME_OFF_DURATION, TIME_OFF_STATUS, WORKER_ID
+    FROM EMPLOYEES
+    WHERE TIME_OFF_STATUS IS NOT NULL
+    {dept_filter}
+    UNION ALL
+    SELECT 'C', NULL, NULL, NULL, NULL, COUNT(*), NULL, NULL
+    FROM EMPLOYEES
+    {where_clause}
+    ORDER BY 1, 4
+"""
+
+
+def fetch_time_off(connection, dept):
+    """(request rows, (pending, approved, denied, staff)) ordered by start date."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(TIME_OFF_QUERY.format(dept_filter=_dept_filter(dept, "AND"),
+                                             where_clause=_dept_filter(dept)),
+                       {'dept': dept} if dept else {})
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    requests = [row[1:] for row in rows if row[0] == 'R']
+    staff = next(row[5] for row in rows if row[0] == 'C')
+    return requests, status_counts(requests, staff)
+
+
+def status_counts(requests, staff):
+    """(pending, approved, denied, staff) for time-off request rows."""
+    statuses = [row[5] for row in requests]
+    return statuses.count('Pending'), statuses.count('Approved'), statuses.count('Denied'), staff
+
+
+FETCHERS = {
+    "schedule": fetch_shift_schedule,
+    "performance": fetch_performance,
+    "time_off": fetch_time_off,
+}
+
+
+class TimingCache:
+    """Fetched views per (view, department), dropped on write or after ``max_age``.
+
+    ``generation(view)`` is taken before a load starts and handed back to
+    ``put``; a load that overlapped a write is then discarded instead of
+    caching pre-write data.
+    """
+    def __init__(self, max_age=MAX_AGE):
+        self.max_age = max_age
+        self._entries = {}                         # (view, dept) -> (monotonic time, value)
+        self._generations = dict.fromkeys(VIEWS, 0)
+        self._lock = threading.Lock()
+
+    def generation(self, view):
+        with self._lock:
+            return self._generations[view]
+
+    def get(self, view, dept):
+        with self._lock:
+            entry = self._entries.get((view, dept))
+        if entry is None or time.monotonic() - entry[0] > self.max_age:
+            return None
+        return entry[1]
+
+    def put(self, view, dept, value, generation):
+        with self._lock:
+            if self._generations[view] != generation:
+                return False
+            self._entries[(view, dept)] = (time.monotonic(), value)
+            return True
+
+    def replace(self, view, dept, value):
+        """Store a locally edited ``value`` for ``dept``; other departments and loads in
+        flight for ``view`` are dropped, as after a write."""
+        self.invalidate(view)
+        with self._lock:
+            self._entries[(view, dept)] = (time.monotonic(), value)
+
+    def invalidate(self, *views):
+        """Forget ``views`` (every view if none given) for all departments."""
+        views = views or VIEWS
+        with self._lock:
+            for view in views:
+                self._generations[view] += 1
+            for key in [key for key in self._entries if key[0] in views]:
+                del self._entries[key]
@@ -1,25 +1,25 @@
 import sys
-import oracledb
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QPushButton, QTableWidget, QTableWidgetItem, QComboBox,
-                             QDateEdit, QTabWidget, QFrame, QHeaderView, QScrollArea, QMessageBox)
+                             QDateEdit, QTabWidget, QFrame, QHeaderView, QScrollArea, QMessageBox,
+                             QSpinBox, QTableView)
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QColor, QPainter, QBrush, QPen
 from PyQt5.QtChart import QChart, QChartView, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
 from datetime import date, timedelta
 
-# Database Configuration
-DB_USERNAME = "system"
-DB_PASSWORD = "s2004b22"
-DB_DSN = "192.168.21.1:1521/FREE"
+from pages import coverage, database, shift_schedule, timing_data
+from pages.query_executor import describe_error, executor
+from pages.time_off_delegate import ActionButtonDelegate
+from pages.time_off_model import ACTION_COLUMN, WORKER_ID, TimeOffTableModel
 
 def connect_db():
-    """Establishes a connection to the Oracle database."""
+    """Returns the shared connection pool, creating it if needed."""
     try:
-        connection = oracledb.connect(user=DB_USERNAME, password=DB_PASSWORD, dsn=DB_DSN)
-        print("Database connection successful!")
-        return connection
-    except oracledb.Error as error:
+        pool = database.get_pool()
+        print("Database pool ready!")
+        return pool
+    except database.DatabaseError as error:
         print(f"Error connecting to Oracle Database: {error}")
         QMessageBox.critical(None, "Database Connection Error",
                            f"Could not connect to the Oracle database.\nError: {error}")
@@ -29,17 +29,34 @@ def connect_db():
         QMessageBox.critical(None, "Connection Error", f"An unexpected error occurred.\nError: {e}")
         return None
 
+SHIFT_COLORS = {
+    shift_schedule.MORNING: QColor(217, 234, 255),
+    shift_schedule.AFTERNOON: QColor(255, 252, 214),
+    shift_schedule.NIGHT: QColor(234, 216, 255),
+    shift_schedule.OFF: QColor(240, 240, 240),
+}
+
+# Views each tab needs, in tab order; the coverage tab is computed from two of them
+TAB_VIEWS = (("schedule",), ("performance",), ("time_off",), ("schedule", "time_off"))
+UNDERSTAFFED_COLOR = QColor(250, 210, 210)
+
 class WorkerTimingSpace(QWidget):
     def __init__(self, worker_id=None, full_name=None, role=None, main_window=None, parent=None):
         super().__init__(parent)
-        self.db_connection = connect_db()
+        self.db_pool = connect_db()
         # Store user role for permission checks
         self.worker_id = worker_id
         self.worker_name = full_name
         self.worker_role = role
         self.main_window = main_window
+        self.cache = timing_data.TimingCache()
+        self._loading = set()  # (view, dept) loads in flight
+        self._departments_loaded = False
+        self._interrupted = False  # a load was cancelled by leaving the page
+        self._coverage_key = None
+        self.coverage = None
         self.init_ui()
-        if self.db_connection:
+        if self.db_pool:
             self.populate_department_combo()
             self.load_initial_data()
     def go_back_to_workspaces(self):
@@ -54,11 +71,65 @@ class WorkerTimingSpace(QWidget):
                     break        
 
     def load_initial_data(self):
-        """Loads data into all views when the app starts or filters change."""
+        """Loads the visible tab first, then the others concurrently (cached per department)."""
         print("Loading initial data...")
-        self.load_schedule_data()
-        self.load_performance_data()
-        self.load_time_off_data()
+        self.update_week_label()
+        active = self.active_views()
+        for view in active:
+            self.load_view(view)
+        for view in timing_data.VIEWS:
+            if view not in active:
+                self.load_view(view, busy=False)
+
+    def refresh_workspace(self):
+        """Called by workspace_cache when a stale workspace is reopened."""
+        if self.db_pool:
+            self._interrupted = False
+            if not self._departments_loaded:
+                self.populate_department_combo()
+            self.cache.invalidate()
+            self.load_initial_data()
+
+    def needs_refresh(self):
+        return self._interrupted
+
+    def active_views(self):
+        return TAB_VIEWS[max(self.tabs.currentIndex(), 0)]
+
+    def load_view(self, view, busy=True):
+        """Show ``view`` for the selected department from the cache, or fetch it."""
+        if not self.db_pool:
+            print("DB connection lost.")
+            return
+        dept = self.selected_department()
+        cached = self.cache.get(view, dept)
+        if cached is not None:
+            self._views[view](cached)
+            return
+        if (view, dept) in self._loading:
+            return
+
+        self._loading.add((view, dept))
+        generation = self.cache.generation(view)
+        fetch = timing_data.FETCHERS[view]
+
+        def done(result):
+            self._loading.discard((view, dept))
+            self.cache.put(view, dept, result, generation)
+            if dept == self.selected_department():
+                self._views[view](result)
+
+        def failed(error):
+            self._loading.discard((view, dept))
+            self._show_load_error(error, view.replace("_", " "))
+
+        def cancelled():
+            # Left the page mid-load: let the next load_view fetch it again
+            self._loading.discard((view, dept))
+            self._interrupted = True
+
+        executor().submit(lambda connection: fetch(connection, dept), done, failed, owner=self, busy=busy,
+                          on_cancel=cancelled)
 
     def init_ui(self):
         """Sets up the user interface widgets and layouts."""
@@ -136,6 +207,18 @@ class WorkerTimingSpace(QWidget):
         self.time_off_widget = self.create_time_off_view()
         self.tabs.addTab(self.time_off_widget, "Time Off Management")
 
+        self.coverage_widget = self.create_coverage_view()
+        self.tabs.addTab(self.coverage_widget, "Staff Coverage")
+
+        # View name -> how to show its data
+        self._views = {
+            "schedule": self._show_schedule,
+            "performance": self._show_performance,
+            "time_off": self._show_time_off,
+        }
+        self.tabs.currentChanged.connect(
+            lambda _: [self.load_view(view) for view in self.active_views()])
+
         # Bottom Action Buttons (now empty since we removed the back button)
         action_layout = QHBoxLayout()
         action_layout.addStretch()  # Just keeps the layout balanced
@@ -168,35 +251,55 @@ class WorkerTimingSpace(QWidget):
     def apply_filters(self):
         """Reloads data based on the current filter settings."""
         print("Applying filters...")
-        if not self.db_connection:
+        if not self.db_pool:
             QMessageBox.warning(self, "No Connection", "Database is not connected. Cannot apply filters.")
             return
         self.load_initial_data()
 
+    def selected_department(self):
+        """Department picked in the filter, or None for all departments."""
+        # Index 0 is "All Departments" (or the loading/error placeholder).
+        if self.department_combo.currentIndex() <= 0:
+            return None
+        return self.department_combo.currentText()
+
     def populate_department_combo(self):
-        if not self.db_connection: 
+        if not self.db_pool: 
             return
-        
-        cursor = None
+        executor().submit(self._fetch_departments, self._show_departments,
+                          self._department_error, owner=self, busy=False,
+                          on_cancel=self._departments_cancelled)
+
+    @staticmethod
+    def _fetch_departments(connection):
+        cursor = connection.cursor()
         try:
-            cursor = self.db_connection.cursor()
             query = "SELECT DISTINCT DEPARTEMENT FROM EMPLOYEES WHERE DEPARTEMENT IS NOT NULL ORDER BY DEPARTEMENT"
             cursor.execute(query)
-            departments = cursor.fetchall()
-            self.department_combo.clear()
-            self.department_combo.addItem("All Departments")
-            for dept in departments: 
-                self.department_combo.addItem(dept[0])
-        except oracledb.Error as error:
-            print(f"Error populating departments: {error}")
-            QMessageBox.warning(self, "DB Error", f"Could not load departments.\nError: {error}")
-            self.department_combo.clear()
-            self.department_combo.addItem("Error loading")
-        except Exception as e: 
-            print(f"Unexpected error populating departments: {e}")
+            return cursor.fetchall()
         finally:
-            if cursor: 
-                cursor.close()
+            cursor.close()
+
+    def _departments_cancelled(self):
+        # Retried by refresh_workspace when the page is shown again
+        self._interrupted = True
+        self.department_combo.clear()
+        self.department_combo.addItem("All Departments")
+
+    def _show_departments(self, departments):
+        self._departments_loaded = True
+        self.department_combo.blockSignals(True)
+        self.department_combo.clear()
+        self.department_combo.addItem("All Departments")
+        for dept in departments: 
+            self.department_combo.addItem(dept[0])
+        self.department_combo.blockSignals(False)
+
+    def _department_error(self, error):
+        print(f"Error populating departments: {error}")
+        QMessageBox.warning(self, "DB Error", f"Could not load departments.\nError: {describe_error(error)}")
+        self.department_combo.clear()
+        self.department_combo.addItem("Error loading")
 
     def create_schedule_view(self):
         widget = QWidget()
@@ -246,14 +349,7 @@ class WorkerTimingSpace(QWidget):
         legend_label = QLabel("Legend:")
         legend_layout.addWidget(legend_label)
         
-        legend_items = [
-            ("Morning", QColor(217, 234, 255)),
-            ("Afternoon", QColor(255, 252, 214)),
-            ("Night", QColor(234, 216, 255)),
-            ("Day Off", QColor(240, 240, 240))
-        ]
-        
-        for text, color in legend_items:
+        for text, color in SHIFT_COLORS.items():
             frame = QFrame()
             frame.setFixedSize(18, 18)
             frame.setStyleSheet(f"background-color: {color.name()}; border: 1px solid #B0B0B0; border-radius: 3px;")
@@ -394,16 +490,20 @@ class WorkerTimingSpace(QWidget):
             status_layout.addWidget(card)
             self.status_cards[title] = value_label
         
-        self.time_off_table = QTableWidget()
-        self.time_off_table.setColumnCount(7)
-        self.time_off_table.setHorizontalHeaderLabels([
-            "Employee", "Request Type", "Start Date", "End Date", "Duration", "Status", "Action"
-        ])
+        self.time_off_model = TimeOffTableModel(can_decide=self.worker_role == "Doctor", parent=self)
+        self.time_off_table = QTableView()
+        self.time_off_table.setModel(self.time_off_model)
         self.time_off_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.time_off_table.verticalHeader().setVisible(False)
-        self.time_off_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.time_off_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.time_off_table.setSelectionBehavior(QTableView.SelectRows)
+        self.time_off_table.setSelectionMode(QTableView.ExtendedSelection)
+        # Approve/Deny are painted by the delegate; no widgets per row
+        self.action_delegate = ActionButtonDelegate(self.time_off_table)
+        self.action_delegate.decided.connect(self.decide_time_off_rows)
+        self.time_off_table.setItemDelegateForColumn(ACTION_COLUMN, self.action_delegate)
         self.time_off_table.setStyleSheet("""
-            QTableWidget { 
+            QTableView { 
                 border: 1px solid #D0D0D0; 
                 gridline-color: #E0E0E0; 
             } 
@@ -413,11 +513,11 @@ class WorkerTimingSpace(QWidget):
                 border: 1px solid #D0D0D0; 
                 font-weight: bold; 
             } 
-            QTableWidget::item { 
+            QTableView::item { 
                 padding: 3px; 
             }
         """)
-        self.time_off_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeToContents)
+        self.time_off_table.horizontalHeader().setSectionResizeMode(ACTION_COLUMN, QHeaderView.ResizeToContents)
         
         form_frame = QFrame()
         form_frame.setFrameShape(QFrame.StyledPanel)
@@ -480,304 +580,250 @@ class WorkerTimingSpace(QWidget):
         form_layout.addLayout(form_inputs)
         
         layout.addLayout(status_layout)
-        layout.addWidget(QLabel("Time Off Requests:"))
+        requests_header = QHBoxLayout()
+        requests_header.addWidget(QLabel("Time Off Requests:"))
+        requests_header.addStretch()
+        if self.time_off_model.can_decide:
+            for text, status, color in (("Approve Selected (A)", "Approved", "#2ecc71"),
+                                        ("Deny Selected (D)", "Denied", "#e74c3c")):
+                batch_btn = QPushButton(text)
+                batch_btn.setStyleSheet(f"background-color: {color}; color: white; padding: 5px 12px; border-radius: 4px;")
+                batch_btn.clicked.connect(lambda _, status=status: self.decide_selected_time_off(status))
+                requests_header.addWidget(batch_btn)
+        layout.addLayout(requests_header)
         layout.addWidget(self.time_off_table)
         layout.addWidget(form_frame)
         
         return widget
 
-    def load_schedule_data(self):
-        if not self.db_connection: 
-            print("DB connection lost.")
-            self.schedule_table.setRowCount(0)
-            return
-        
-        cursor = None
-        try:
-            self.schedule_table.setRowCount(0)
-            self.update_week_label()
-            
-            cursor = self.db_connection.cursor()
-            selected_dept = self.department_combo.currentText()
-            
-            query = """
-                SELECT 
-                    WORKER_ID, 
-                    FULL_NAME, 
-                    SCHEDULED_DAYS
-                FROM EMPLOYEES
-                {where_clause}
-                ORDER BY FULL_NAME
-            """.format(
-                where_clause="WHERE DEPARTEMENT = :dept" if selected_dept != "All Departments" else ""
-            )
-            
-            params = {}
-            if selected_dept != "All Departments":
-                params['dept'] = selected_dept
-                
-            cursor.execute(query, params)
-            employees = cursor.fetchall()
-            
-            if not employees:
-                print("No employees found.")
-                return
+    def create_coverage_view(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(10)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Minimum staff per department:"))
+        self.min_staff_spin = QSpinBox()
+        self.min_staff_spin.setRange(0, 500)
+        self.min_staff_spin.setValue(coverage.MIN_STAFF)
+        self.min_staff_spin.valueChanged.connect(self.show_coverage)
+        controls.addWidget(self.min_staff_spin)
+        controls.addStretch()
+        self.coverage_label = QLabel("Loading coverage...")
+        self.coverage_label.setStyleSheet("font-weight: bold;")
+        controls.addWidget(self.coverage_label)
+
+        table_style = """
+            QTableWidget { border: 1px solid #D0D0D0; gridline-color: #E0E0E0; }
+            QHeaderView::section { background-color: #F0F0F0; padding: 3px; border: 1px solid #D0D0D0; font-weight: bold; }
+        """
+        # One row per department and day, one column per hour: staff on duty
+        self.coverage_table = QTableWidget(0, 24)
+        self.coverage_table.setHorizontalHeaderLabels([f"{hour:02d}" for hour in range(24)])
+        self.coverage_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.coverage_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.coverage_table.setStyleSheet(table_style)
+
+        self.understaffed_table = QTableWidget(0, 4)
+        self.understaffed_table.setHorizontalHeaderLabels(["Department", "From", "To", "Lowest Headcount"])
+        self.understaffed_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.understaffed_table.verticalHeader().setVisible(False)
+        self.understaffed_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.understaffed_table.setStyleSheet(table_style)
+        self.understaffed_table.setMaximumHeight(200)
+
+        layout.addLayout(controls)
+        layout.addWidget(QLabel("Staff on duty per hour (after approved time off):"))
+        layout.addWidget(self.coverage_table)
+        layout.addWidget(QLabel("Understaffed windows:"))
+        layout.addWidget(self.understaffed_table)
+        return widget
 
-            self.schedule_table.setRowCount(len(employees))
-            
-            for row, (worker_id, full_name, scheduled_days) in enumerate(employees):
-                self.schedule_table.setItem(row, 0, QTableWidgetItem(str(worker_id)))
-                self.schedule_table.setItem(row, 1, QTableWidgetItem(full_name))
-                
-                # Parse the scheduled_days string (format: "M:8a-4p;T:8a-4p;...")
-                schedule_map = {}
-                if scheduled_days:
-                    for day_schedule in scheduled_days.split(';'):
-                        if ':' in day_schedule:
-                            day, schedule = day_schedule.split(':')
-                            schedule_map[day] = schedule
-                
-                # Populate each day's schedule
-                days = ['M', 'T', 'W', 'Th', 'F', 'Sa', 'Su']
-                for col_day_idx, day in enumerate(days, start=2):
-                    schedule = schedule_map.get(day, "OFF")
-                    item = QTableWidgetItem(schedule)
+    def update_coverage(self):
+        """Recompute coverage once both the schedule and the time off of the filter are loaded."""
+        dept = self.selected_department()
+        schedule = self.cache.get("schedule", dept)
+        time_off = self.cache.get("time_off", dept)
+        if schedule is None or time_off is None:
+            return
+        first_day, last_day = self.start_date.date().toPyDate(), self.end_date.date().toPyDate()
+        # Keyed on the objects themselves (held here), so a freed one's id cannot be reused
+        key = (schedule, time_off, first_day, last_day)
+        previous = self._coverage_key
+        if previous is None or previous[0] is not schedule or previous[1] is not time_off \
+                or previous[2:] != key[2:]:
+            approved = [(worker_id, start, end)
+                        for _, _, start, end, _, status, worker_id in time_off[0] if status == "Approved"]
+            self.coverage = coverage.compute_coverage(schedule, approved, first_day, last_day)
+            self._coverage_key = key
+        self.status_cards["Available Coverage"].setText(f"{self.coverage.lowest()}")
+        self.status_cards["Available Coverage"].setToolTip(
+            "Fewest staff on duty in any hour of the selected dates, after approved time off")
+        if self.tabs.currentWidget() is self.coverage_widget:
+            self.show_coverage()
+
+    def show_coverage(self):
+        result = self.coverage
+        if result is None:
+            return
+        min_staff = self.min_staff_spin.value()
+        departments = result.departments
+        days = len(result) // 24
+
+        self.coverage_table.setRowCount(len(departments) * days)
+        labels = []
+        for dept_index, dept in enumerate(departments):
+            counts = result.headcount[dept]
+            for day in range(days):
+                row = dept_index * days + day
+                labels.append(f"{dept} {result.hour_start(day * 24).strftime('%a %d')}")
+                for hour in range(24):
+                    count = counts[day * 24 + hour]
+                    item = QTableWidgetItem(str(count))
                     item.setTextAlignment(Qt.AlignCenter)
-                    
-                    # Color coding based on shift type
-                    if "OFF" in schedule:
-                        item.setBackground(QColor(240, 240, 240))
-                    elif "7a" in schedule or "8a" in schedule:
-                        item.setBackground(QColor(217, 234, 255))
-                    elif "12p" in schedule:
-                        item.setBackground(QColor(255, 252, 214))
-                    elif "7p" in schedule:
-                        item.setBackground(QColor(234, 216, 255))
-                        
-                    self.schedule_table.setItem(row, col_day_idx, item)
-                    
-            print(f"Schedule table populated with {len(employees)} employees.")
-            
-        except oracledb.Error as error:
-            print(f"Oracle Error fetching schedule data: {error}")
-            QMessageBox.warning(self, "DB Query Error", 
-                              f"Could not fetch schedule data.\nError: {error}")
-        except Exception as e:
-            print(f"Unexpected error loading schedule data: {e}")
-            QMessageBox.critical(self, "Error", f"Error loading schedule: {e}")
-        finally:
-            if cursor: 
-                cursor.close()
+                    if count < min_staff:
+                        item.setBackground(UNDERSTAFFED_COLOR)
+                    self.coverage_table.setItem(row, hour, item)
+        self.coverage_table.setVerticalHeaderLabels(labels)
+
+        windows = result.understaffed(min_staff)
+        self.understaffed_table.setRowCount(len(windows))
+        for row, (dept, first_hour, end_hour, lowest) in enumerate(windows):
+            self.understaffed_table.setItem(row, 0, QTableWidgetItem(dept))
+            self.understaffed_table.setItem(row, 1, QTableWidgetItem(result.hour_start(first_hour).strftime("%a %d %H:%M")))
+            self.understaffed_table.setItem(row, 2, QTableWidgetItem(result.hour_start(end_hour).strftime("%a %d %H:%M")))
+            self.understaffed_table.setItem(row, 3, QTableWidgetItem(str(lowest)))
+        self.coverage_label.setText(
+            f"{len(windows)} understaffed window(s); lowest total on duty: {result.lowest()}")
+
+    def _show_schedule(self, schedule):
+        rows = schedule.week_grid()
+        self.schedule_table.setRowCount(len(rows))
+        if not rows:
+            print("No employees found.")
+            self.update_coverage()
+            return
 
-    def load_performance_data(self):
-        if not self.db_connection:
-            print("DB connection lost.")
+        for row, (worker_id, full_name, cells) in enumerate(rows):
+            self.schedule_table.setItem(row, 0, QTableWidgetItem(str(worker_id)))
+            self.schedule_table.setItem(row, 1, QTableWidgetItem(full_name))
+            for col, (label, kind) in enumerate(cells, start=2):
+                item = QTableWidgetItem(label)
+                item.setTextAlignment(Qt.AlignCenter)
+                item.setBackground(SHIFT_COLORS[kind])  # colour by shift start time
+                self.schedule_table.setItem(row, col, item)
+
+        print(f"Schedule table populated with {len(rows)} employees.")
+        self.update_coverage()
+
+    def _show_load_error(self, error, what):
+        print(f"Error loading {what} data: {error}")
+        QMessageBox.critical(self, "Error", f"Error loading {what} data: {describe_error(error)}")
+
+    def _show_performance(self, result):
+        performance_data, (avg_hours, avg_overtime, avg_punctuality, staff_count), dept_data = result
+
+        self.stats_cards["Total Hours Worked"].setText(f"{avg_hours}")
+        self.stats_cards["Overtime Hours"].setText(f"{avg_overtime}")
+        self.stats_cards["Avg Punctuality"].setText(f"{avg_punctuality}%")
+        self.stats_cards["Staff Coverage"].setText(f"{staff_count}")
+        
+        # Update charts with department data
+        hours_cats = [dept[0] for dept in dept_data]
+        hours_vals = [dept[1] for dept in dept_data]
+        punct_vals = [dept[2] for dept in dept_data]
+        
+        hours_qchart = self._generate_qchart("Hours by Department", hours_cats, hours_vals)
+        self.hours_chart_view.setChart(hours_qchart)
+        
+        punct_qchart = self._generate_qchart("Staff Punctuality (%)", hours_cats, punct_vals)
+        self.punctuality_chart_view.setChart(punct_qchart)
+        
+        # Populate performance table
+        self.performance_table.setRowCount(len(performance_data))
+        for row, (name, hours, overtime, punctuality, perf_score) in enumerate(performance_data):
+            self.performance_table.setItem(row, 0, QTableWidgetItem(name))
+            self.performance_table.setItem(row, 1, QTableWidgetItem(f"{hours}"))
+            self.performance_table.setItem(row, 2, QTableWidgetItem(f"{overtime}"))
+            self.performance_table.setItem(row, 3, QTableWidgetItem(f"{punctuality}%"))
+            self.performance_table.setItem(row, 4, QTableWidgetItem(f"{perf_score}%"))
+
+    def _show_time_off(self, result):
+        self.time_off_model.set_requests(result)
+        self._show_status_counts()
+
+    def _show_status_counts(self):
+        pending, approved, denied, _ = self.time_off_model.counts()
+        self.status_cards["Pending Requests"].setText(f"{pending}")
+        self.status_cards["Approved Time Off"].setText(f"{approved}")
+        self.status_cards["Denied Requests"].setText(f"{denied}")
+        # Filled in by update_coverage once the schedule is loaded too
+        self.status_cards["Available Coverage"].setText("...")
+        self.update_coverage()
+
+    def _time_off_changed(self):
+        """Refresh what depends on the list after a local edit; keep the cache in step."""
+        self.cache.replace("time_off", self.selected_department(), self.time_off_model.snapshot())
+        self._show_status_counts()
+
+    def update_time_off_status(self, worker_id, new_status):
+        """Approve or deny one request."""
+        self.decide_time_off([worker_id], new_status)
+
+    def decide_selected_time_off(self, new_status):
+        rows = sorted({index.row() for index in self.time_off_table.selectionModel().selectedRows()})
+        if not rows:
+            QMessageBox.information(self, "Time Off", "Select the requests to decide first.")
             return
-            
-        cursor = None
-        try:
-            selected_dept = self.department_combo.currentText()
-            
-            # Query performance data from EMPLOYEES table
-            query = """
-                SELECT 
-                    FULL_NAME,
-                    HOURS_WORKED,
-                    OVERTIME_HOURS,
-                    PUNCTUALITY_SCORE,
-                    PERFORMANCE_SCORE
-                FROM EMPLOYEES
-                {where_clause}
-                ORDER BY PERFORMANCE_SCORE DESC
-            """.format(
-                where_clause="WHERE DEPARTEMENT = :dept" if selected_dept != "All Departments" else ""
-            )
-            
-            params = {}
-            if selected_dept != "All Departments":
-                params['dept'] = selected_dept
-                
-            cursor = self.db_connection.cursor()
-            cursor.execute(query, params)
-            performance_data = cursor.fetchall()
-            
-            # Update stats cards with aggregated data
-            stats_query = """
-                SELECT 
-                    ROUND(AVG(HOURS_WORKED), 2),
-                    ROUND(AVG(OVERTIME_HOURS), 2),
-                    ROUND(AVG(PUNCTUALITY_SCORE), 1),
-                    COUNT(*) as staff_count
-                FROM EMPLOYEES
-                {where_clause}
-            """.format(
-                where_clause="WHERE DEPARTEMENT = :dept" if selected_dept != "All Departments" else ""
-            )
-            
-            cursor.execute(stats_query, params)
-            avg_hours, avg_overtime, avg_punctuality, staff_count = cursor.fetchone()
-            
-            self.stats_cards["Total Hours Worked"].setText(f"{avg_hours}")
-            self.stats_cards["Overtime Hours"].setText(f"{avg_overtime}")
-            self.stats_cards["Avg Punctuality"].setText(f"{avg_punctuality}%")
-            self.stats_cards["Staff Coverage"].setText(f"{staff_count}")
-            
-            # Update charts with department data
-            dept_query = """
-                SELECT 
-                    DEPARTEMENT,
-                    ROUND(AVG(HOURS_WORKED), 2),
-                    ROUND(AVG(PUNCTUALITY_SCORE), 1)
-                FROM EMPLOYEES
-                WHERE DEPARTEMENT IS NOT NULL
-                GROUP BY DEPARTEMENT
-            """
-            
-            cursor.execute(dept_query)
-            dept_data = cursor.fetchall()
-            
-            hours_cats = [dept[0] for dept in dept_data]
-            hours_vals = [dept[1] for dept in dept_data]
-            punct_vals = [dept[2] for dept in dept_data]
-            
-            hours_qchart = self._generate_qchart("Hours by Department", hours_cats, hours_vals)
-            self.hours_chart_view.setChart(hours_qchart)
-            
-            punct_qchart = self._generate_qchart("Staff Punctuality (%)", hours_cats, punct_vals)
-            self.punctuality_chart_view.setChart(punct_qchart)
-            
-            # Populate performance table
-            self.performance_table.setRowCount(len(performance_data))
-            for row, (name, hours, overtime, punctuality, perf_score) in enumerate(performance_data):
-                self.performance_table.setItem(row, 0, QTableWidgetItem(name))
-                self.performance_table.setItem(row, 1, QTableWidgetItem(f"{hours}"))
-                self.performance_table.setItem(row, 2, QTableWidgetItem(f"{overtime}"))
-                self.performance_table.setItem(row, 3, QTableWidgetItem(f"{punctuality}%"))
-                self.performance_table.setItem(row, 4, QTableWidgetItem(f"{perf_score}%"))
-                
-        except Exception as e:
-            print(f"Error loading performance data: {e}")
-            QMessageBox.critical(self, "Error", f"Error loading performance data: {e}")
-        finally:
-            if cursor:
-                cursor.close()
+        self.decide_time_off_rows(rows, new_status)
 
-    def load_time_off_data(self):
-        if not self.db_connection:
-            print("DB connection lost.")
+    def decide_time_off_rows(self, rows, new_status):
+        model = self.time_off_model
+        self.decide_time_off([model.request_at(row)[WORKER_ID] for row in rows if model.is_actionable(row)],
+                             new_status)
+
+    def decide_time_off(self, worker_ids, new_status):
+        """Approve or deny pending requests: shown at once, confirmed in one array-bound UPDATE."""
+        if not self.time_off_model.can_decide:
             return
-            
-        cursor = None
-        try:
-            selected_dept = self.department_combo.currentText()
-            
-            # Query time off data from EMPLOYEES table
-            query = """
-                SELECT 
-                    e.FULL_NAME,
-                    e.TIME_OFF_TYPE,
-                    TO_CHAR(e.TIME_OFF_START_DATE, 'YYYY-MM-DD'),
-                    TO_CHAR(e.TIME_OFF_END_DATE, 'YYYY-MM-DD'),
-                    e.TIME_OFF_DURATION,
-                    e.TIME_OFF_STATUS,
-                    e.WORKER_ID
-                FROM EMPLOYEES e
-                WHERE e.TIME_OFF_STATUS IS NOT NULL
-                {dept_filter}
-                ORDER BY e.TIME_OFF_START_DATE
-            """.format(
-                dept_filter="AND e.DEPARTEMENT = :dept" if selected_dept != "All Departments" else ""
-            )
-            
-            params = {}
-            if selected_dept != "All Departments":
-                params['dept'] = selected_dept
-                
-            cursor = self.db_connection.cursor()
-            cursor.execute(query, params)
-            time_off_data = cursor.fetchall()
-            
-            # Update status cards
-            status_query = """
-                SELECT 
-                    SUM(CASE WHEN TIME_OFF_STATUS = 'Pending' THEN 1 ELSE 0 END),
-                    SUM(CASE WHEN TIME_OFF_STATUS = 'Approved' THEN 1 ELSE 0 END),
-                    SUM(CASE WHEN TIME_OFF_STATUS = 'Denied' THEN 1 ELSE 0 END),
-                    COUNT(*) as total_employees
-                FROM EMPLOYEES
-                {where_clause}
-            """.format(
-                where_clause="WHERE DEPARTEMENT = :dept" if selected_dept != "All Departments" else ""
-            )
-            
-            cursor.execute(status_query, params)
-            pending, approved, denied, total_employees = cursor.fetchone()
-            
-            self.status_cards["Pending Requests"].setText(f"{pending}")
-            self.status_cards["Approved Time Off"].setText(f"{approved}")
-            self.status_cards["Denied Requests"].setText(f"{denied}")
-            self.status_cards["Available Coverage"].setText(f"{total_employees - approved}")
-            
-            # Populate time off table
-            self.time_off_table.setRowCount(len(time_off_data))
-            for row, (name, req_type, start_date, end_date, duration, status, worker_id) in enumerate(time_off_data):
-                self.time_off_table.setItem(row, 0, QTableWidgetItem(name))
-                self.time_off_table.setItem(row, 1, QTableWidgetItem(req_type))
-                self.time_off_table.setItem(row, 2, QTableWidgetItem(start_date))
-                self.time_off_table.setItem(row, 3, QTableWidgetItem(end_date))
-                self.time_off_table.setItem(row, 4, QTableWidgetItem(f"{duration} days"))
-                self.time_off_table.setItem(row, 5, QTableWidgetItem(status))
-                
-                # Add action buttons for pending requests - ONLY FOR DOCTORS
-                if status == "Pending" and self.worker_role == "Doctor":
-                    btn_widget = QWidget()
-                    btn_layout = QHBoxLayout(btn_widget)
-                    
-                    approve_btn = QPushButton("Approve")
-                    approve_btn.setStyleSheet("background-color: #2ecc71; color: white;")
-                    approve_btn.clicked.connect(lambda _, wid=worker_id: self.update_time_off_status(wid, "Approved"))
-                    
-                    deny_btn = QPushButton("Deny")
-                    deny_btn.setStyleSheet("background-color: #e74c3c; color: white;")
-                    deny_btn.clicked.connect(lambda _, wid=worker_id: self.update_time_off_status(wid, "Denied"))
-                    
-                    btn_layout.addWidget(approve_btn)
-                    btn_layout.addWidget(deny_btn)
-                    btn_layout.setContentsMargins(0, 0, 0, 0)
-                    
-                    self.time_off_table.setCellWidget(row, 6, btn_widget)
-                else:
-                    if status == "Pending" and self.worker_role != "Doctor":
-                        self.time_off_table.setItem(row, 6, QTableWidgetItem("Permission denied"))
-                    else:
-                        self.time_off_table.setItem(row, 6, QTableWidgetItem("No action"))
-                    
-        except Exception as e:
-            print(f"Error loading time off data: {e}")
-            QMessageBox.critical(self, "Error", f"Error loading time off data: {e}")
-        finally:
-            if cursor:
+        worker_ids = [wid for wid in worker_ids if self.time_off_model.set_status(wid, new_status) == "Pending"]
+        if not worker_ids:
+            return
+        self._time_off_changed()
+
+        def work(connection):
+            cursor = connection.cursor()
+            try:
+                # Only a request still pending can be decided (another doctor may have been first)
+                query = """
+                    UPDATE EMPLOYEES
+                    SET TIME_OFF_STATUS = :status
+                    WHERE WORKER_ID = :worker_id AND TIME_OFF_STATUS = 'Pending'
+                """
+                cursor.executemany(query, [{'status': new_status, 'worker_id': wid} for wid in worker_ids])
+                updated = cursor.rowcount
+                connection.commit()
+                return updated
+            finally:
                 cursor.close()
 
-    def update_time_off_status(self, worker_id, new_status):
-        """Update time off status in the database"""
-        cursor = None
-        try:
-            cursor = self.db_connection.cursor()
-            query = """
-                UPDATE EMPLOYEES
-                SET TIME_OFF_STATUS = :status
-                WHERE WORKER_ID = :worker_id
-            """
-            cursor.execute(query, {'status': new_status, 'worker_id': worker_id})
-            self.db_connection.commit()
-            QMessageBox.information(self, "Success", f"Time off request {new_status.lower()}!")
-            self.load_time_off_data()  # Refresh the view
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to update status: {e}")
-        finally:
-            if cursor:
-                cursor.close()
+        def done(updated):
+            if updated < len(worker_ids):
+                QMessageBox.warning(self, "Time Off", "Some requests were already decided elsewhere; "
+                                                      "the list has been refreshed.")
+                self.cache.invalidate("time_off")
+                self.load_view("time_off")
+
+        def failed(error):
+            # Roll the optimistic change back
+            for wid in worker_ids:
+                self.time_off_model.set_status(wid, "Pending")
+            self._time_off_changed()
+            QMessageBox.critical(self, "Error", f"Failed to update status: {describe_error(error)}")
+
+        # No owner: leaving the page must not cancel a write already shown as done
+        executor().submit(work, done, failed, busy=False)
 
     def submit_time_off_request(self):
         """Handle submission of new time off requests"""
@@ -795,49 +841,70 @@ class WorkerTimingSpace(QWidget):
             return
             
         duration = (end_date - start_date).days + 1  # Inclusive of both dates
-        
-        cursor = None
-        try:
-            cursor = self.db_connection.cursor()
-            query = """
-                UPDATE EMPLOYEES
-                SET 
-                    TIME_OFF_STATUS = 'Pending',
-                    TIME_OFF_TYPE = :req_type,
-                    TIME_OFF_START_DATE = :start_date,
-                    TIME_OFF_END_DATE = :end_date,
-                    TIME_OFF_DURATION = :duration,
-                    TIME_OFF_NOTES = :notes
-                WHERE WORKER_ID = :worker_id
-            """
-            
-            notes = f"{req_type} request submitted on {date.today()}"
-            
-            cursor.execute(query, {
-                'req_type': req_type,
-                'start_date': start_date,
-                'end_date': end_date,
-                'duration': duration,
-                'notes': notes,
-                'worker_id': worker_id
-            })
-            
-            self.db_connection.commit()
+
+        notes = f"{req_type} request submitted on {date.today()}"
+
+        # Show the request straight away when the list covers this worker; the
+        # worker's department is not known here, so a filtered list reloads instead
+        listed = self.time_off_model.row_of(worker_id) is not None or self.selected_department() is None
+        previous = None
+        if listed:
+            previous = self.time_off_model.put_request((
+                self.worker_name, req_type, start_date.isoformat(), end_date.isoformat(),
+                duration, "Pending", worker_id,
+            ))
+            self._time_off_changed()
+
+        def work(connection):
+            cursor = connection.cursor()
+            try:
+                query = """
+                    UPDATE EMPLOYEES
+                    SET 
+                        TIME_OFF_STATUS = 'Pending',
+                        TIME_OFF_TYPE = :req_type,
+                        TIME_OFF_START_DATE = :start_date,
+                        TIME_OFF_END_DATE = :end_date,
+                        TIME_OFF_DURATION = :duration,
+                        TIME_OFF_NOTES = :notes
+                    WHERE WORKER_ID = :worker_id
+                """
+                cursor.execute(query, {
+                    'req_type': req_type,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'duration': duration,
+                    'notes': notes,
+                    'worker_id': worker_id
+                })
+                connection.commit()
+            finally:
+                cursor.close()
+
+        def done(_):
             QMessageBox.information(self, "Success", "Time off request submitted!")
             
             # Reset form
             self.req_type_combo.setCurrentIndex(0)
             self.req_start_date.setDate(QDate.currentDate().addDays(1))
             self.req_end_date.setDate(QDate.currentDate().addDays(1))
-            
-            # Refresh data
-            self.load_time_off_data()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to submit request: {e}")
-        finally:
-            if cursor:
-                cursor.close()
+
+            if not listed:
+                self.cache.invalidate("time_off")
+                self.load_view("time_off")
+
+        def failed(error):
+            # Roll the optimistic change back
+            if listed:
+                if previous is None:
+                    self.time_off_model.remove_request(worker_id)
+                else:
+                    self.time_off_model.put_request(previous)
+                self._time_off_changed()
+            QMessageBox.critical(self, "Error", f"Failed to submit request: {describe_error(error)}")
+
+        # No owner: leaving the page must not cancel a write already shown as done
+        executor().submit(work, done, failed, busy=False)
 
     def update_week_label(self):
         if hasattr(self, 'week_label'):
@@ -902,17 +969,9 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         print("Close event triggered for MainWindow.")
-        connection = self.worker_timing_widget.db_connection
-        if connection:
-            try: 
-                connection.close()
-                print("Database connection closed successfully.")
-            except oracledb.Error as error: 
-                print(f"Error closing Oracle connection: {error}")
-                QMessageBox.warning(self, "DB Close Error", 
-                                  f"Could not close the database connection cleanly.\nError: {error}")
-            except Exception as e: 
-                print(f"Unexpected error closing DB connection: {e}")
+        if self.worker_timing_widget.db_pool:
+            database.close_pool()
+            print("Database pool closed successfully.")
         event.accept()
 
 if __name__ == "__main__":
@@ -921,7 +980,7 @@ if __name__ == "__main__":
     # In a real application, this would come from a login system
     test_role = "Doctor"  # or "Nurse" or any other role
     window = MainWindow(role=test_role)
-    if window.worker_timing_widget.db_connection:
+    if window.worker_timing_widget.db_pool:
         window.show()
         sys.exit(app.exec_())
     else:
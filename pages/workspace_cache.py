@@ -0,0 +1,115 @@
+"""Live workspace widgets, one per workspace per signed-in worker.
+
+Opening a workspace card used to build a new PatientWidget /
+DiseaseStatsDashboard / WorkerTimingSpace every time, reloading everything
+and leaving the old one in the stacked widget.  The cache hands back the
+existing instance instead.  If it has not been shown for ``STALE_AFTER``
+seconds, the instance's ``refresh_workspace()`` fetches only what changed.
+It is also called right away when the instance's ``needs_refresh()``
+reports a load that was cancelled by leaving it.
+
+Instances are closed (pending queries cancelled, removed from the stack,
+deleted) when their worker logs out.  To keep memory bounded over a long
+shift, the cache also closes its least recently used instance above
+``MAX_LIVE`` and any instance left unused for ``IDLE_EVICT_AFTER`` seconds.
+"""
+import time
+from collections import OrderedDict
+
+from PyQt5 import QtCore
+
+from pages.query_executor import executor
+from pages.startup import load_workspace
+
+STALE_AFTER = 60            # seconds before a re-opened workspace refreshes
+MAX_LIVE = 3                # live workspace widgets across all workers
+IDLE_EVICT_AFTER = 30 * 60  # seconds a hidden workspace may stay alive
+SWEEP_INTERVAL_MS = 60 * 1000
+
+
+class WorkspaceCache:
+    """LRU of workspace widgets keyed by (worker_id, workspace name)."""
+    def __init__(self, max_live=MAX_LIVE, idle_evict_after=IDLE_EVICT_AFTER):
+        self.max_live = max_live
+        self.idle_evict_after = idle_evict_after
+        self._entries = OrderedDict()  # (worker_id, name) -> [widget, stacked, last_shown]
+        self._sweep_timer = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def open(self, name, stacked, worker_id, full_name, role):
+        """The worker's widget for ``name``, created on first use; shown in ``stacked``."""
+        key = (worker_id, name)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None:
+            widget = load_workspace(name)(worker_id, full_name, role, main_window=stacked)
+            stacked.addWidget(widget)
+            entry = self._entries[key] = [widget, stacked, now]
+        else:
+            widget = entry[0]
+            self._entries.move_to_end(key)
+            if hasattr(widget, "refresh_workspace") and (now - entry[2] > STALE_AFTER or _needs_refresh(widget)):
+                widget.refresh_workspace()
+            entry[2] = now
+        stacked.setCurrentWidget(widget)
+        self._trim(keep=key)
+        self._start_sweep()
+        return widget
+
+    def evict(self, worker_id, name):
+        entry = self._entries.pop((worker_id, name), None)
+        if entry is not None:
+            self._close(*entry[:2])
+
+    def evict_worker(self, worker_id):
+        """Close every workspace of a worker (on logout)."""
+        for key in [k for k in self._entries if k[0] == worker_id]:
+            self.evict(*key)
+
+    def clear(self):
+        for key in list(self._entries):
+            self.evict(*key)
+
+    def sweep(self):
+        """Close workspaces that are hidden and unused for ``idle_evict_after`` seconds."""
+        now = time.monotonic()
+        for key, (widget, stacked, last_shown) in list(self._entries.items()):
+            if stacked.currentWidget() is not widget and now - last_shown > self.idle_evict_after:
+                print(f"Closing idle workspace {key[1]} of worker {key[0]}")
+                self.evict(*key)
+
+    def _trim(self, keep):
+        while len(self._entries) > self.max_live:
+            key = next(k for k in self._entries if k != keep)
+            self.evict(*key)
+
+    def _start_sweep(self):
+        if self._sweep_timer is None:
+            self._sweep_timer = QtCore.QTimer()
+            self._sweep_timer.timeout.connect(self.sweep)
+            self._sweep_timer.start(SWEEP_INTERVAL_MS)
+
+    @staticmethod
+    def _close(widget, stacked):
+        # Drop its queries so no pooled session is held for a widget being deleted
+        executor().cancel(widget)
+        stacked.removeWidget(widget)
+        widget.deleteLater()
+
+
+def _needs_refresh(widget):
+    needs_refresh = getattr(widget, "needs_refresh", None)
+    return needs_refresh is not None and needs_refresh()
+
+
+_cache = None
+
+
+def workspace_cache():
+    """Return the process-wide workspace cache."""
+    global _cache
+    if _cache is None:
+        _cache = WorkspaceCache()
+    return _cache
@@ -6,6 +6,8 @@ from pages.support import SuportPage
 from pages.abtus import AbtusPage
 
 from pages.exit_page import ExitPage
+from pages import database, query_executor, startup
+from pages.page_registry import PageRegistry
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 
@@ -314,23 +316,19 @@ class Ui_MainWindow(object):
         # Content area (stacked widget)
         self.stackedWidget = QtWidgets.QStackedWidget()
         self.stackedWidget.setObjectName("stackedWidget")
+        # Drop a page's pending queries when the user navigates away from it
+        query_executor.executor().watch_stack(self.stackedWidget)
         
         # --- Loading pages from separate files ---
+        # Pages are registered in index order and built the first time they are shown.
         # IMPORTANT: Pass QStackedWidget reference to HomePage so it can add the main application page after login.
-        self.home_page = HomePage(main_window=self.stackedWidget)
-        self.developers_page = DevelopersPage()
-        self.contact_page = ContactPage()
-        self.support_page = SuportPage()
-        self.abtus_page = AbtusPage()
-        self.exit_page = ExitPage(self.stackedWidget)  # Correct instantiation
-        
-        # Add the pages to the stacked widget in the desired order
-        self.stackedWidget.addWidget(self.home_page)         # index 0
-        self.stackedWidget.addWidget(self.developers_page)     # index 1
-        self.stackedWidget.addWidget(self.contact_page)        # index 2
-        self.stackedWidget.addWidget(self.support_page)        # index 3
-        self.stackedWidget.addWidget(self.abtus_page)          # index 4
-        self.stackedWidget.addWidget(self.exit_page)           # index 5
+        self.pages = PageRegistry(self.stackedWidget)
+        self.pages.register("home", lambda: HomePage(main_window=self.stackedWidget))   # index 0
+        self.pages.register("developers", DevelopersPage)                                # index 1
+        self.pages.register("contact", ContactPage)                                      # index 2
+        self.pages.register("support", SuportPage)                                       # index 3
+        self.pages.register("abtus", AbtusPage)                                          # index 4
+        self.pages.register("exit", lambda: ExitPage(self.stackedWidget))                # index 5
         
         self.main_vertical_layout.addWidget(self.stackedWidget)
         
@@ -340,8 +338,8 @@ class Ui_MainWindow(object):
         # Set central widget
         MainWindow.setCentralWidget(self.centralwidget)
         
-        # Set default page (adjust index as needed)
-        self.stackedWidget.setCurrentIndex(0)
+        # Set default page; only the login page is built before first paint
+        self.pages.show("home")
         
         # --- Connect signals ---
         # Toggle sidebar between icon-only and full modes
@@ -363,29 +361,29 @@ class Ui_MainWindow(object):
         self.exit_btn2.toggled.connect(lambda checked: self.exit_btn.setChecked(checked) if checked else None)
         
         # --- Connect page navigation ---
-        # Home buttons -> Home Page (index 0)
-        self.home_btn.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(0) if checked else None)
-        self.home_btn2.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(0) if checked else None)
+        # Home buttons -> Home Page
+        self.home_btn.toggled.connect(lambda checked: self.pages.show("home") if checked else None)
+        self.home_btn2.toggled.connect(lambda checked: self.pages.show("home") if checked else None)
         
-        # Developers buttons -> Developers Page (index 1)
-        self.developers_btn.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(1) if checked else None)
-        self.developers_btn2.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(1) if checked else None)
+        # Developers buttons -> Developers Page
+        self.developers_btn.toggled.connect(lambda checked: self.pages.show("developers") if checked else None)
+        self.developers_btn2.toggled.connect(lambda checked: self.pages.show("developers") if checked else None)
         
-        # Contact buttons -> Contact Page (index 2)
-        self.contact_btn.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(2) if checked else None)
-        self.contact_btn2.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(2) if checked else None)
+        # Contact buttons -> Contact Page
+        self.contact_btn.toggled.connect(lambda checked: self.pages.show("contact") if checked else None)
+        self.contact_btn2.toggled.connect(lambda checked: self.pages.show("contact") if checked else None)
         
-        # Support buttons -> Support Page (index 3)
-        self.support_btn.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(3) if checked else None)
-        self.support_btn2.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(3) if checked else None)
+        # Support buttons -> Support Page
+        self.support_btn.toggled.connect(lambda checked: self.pages.show("support") if checked else None)
+        self.support_btn2.toggled.connect(lambda checked: self.pages.show("support") if checked else None)
         
-        # Abt us buttons -> About Us Page (index 4)
-        self.abtus_btn.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(4) if checked else None)
-        self.abtus_btn2.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(4) if checked else None)
+        # Abt us buttons -> About Us Page
+        self.abtus_btn.toggled.connect(lambda checked: self.pages.show("abtus") if checked else None)
+        self.abtus_btn2.toggled.connect(lambda checked: self.pages.show("abtus") if checked else None)
         
-        # Exit buttons -> Exit Page (index 5)
-        self.exit_btn.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(5) if checked else None)
-        self.exit_btn2.toggled.connect(lambda checked: self.stackedWidget.setCurrentIndex(5) if checked else None)
+        # Exit buttons -> Exit Page
+        self.exit_btn.toggled.connect(lambda checked: self.pages.show("exit") if checked else None)
+        self.exit_btn2.toggled.connect(lambda checked: self.pages.show("exit") if checked else None)
         
         # Set initial button state
         self.home_btn.setChecked(True)
@@ -472,8 +470,15 @@ if __name__ == "__main__":
     with open("style.qss", "r") as file:
         qss = file.read()
         app.setStyleSheet(qss)
+    # Give every pooled database session back when the application exits
+    app.aboutToQuit.connect(query_executor.executor().shutdown)
+    app.aboutToQuit.connect(database.close_pool)
     MainWindow = QtWidgets.QMainWindow()
     ui = Ui_MainWindow()
     ui.setupUi(MainWindow)
     MainWindow.show()
+    # Once the login page has painted: load the workspace stacks in the background
+    # and build the remaining sidebar pages while the event loop is idle
+    QtCore.QTimer.singleShot(0, startup.warm_up)
+    QtCore.QTimer.singleShot(0, ui.pages.prebuild_when_idle)
     sys.exit(app.exec_())
\ No newline at end of file